@@ -0,0 +1,27 @@
+"""add rsvp event status index
+
+Revision ID: a9d3e5f7b2c4
+Revises: f7c2d4e6a8b1
+Create Date: 2026-10-17 23:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d3e5f7b2c4"
+down_revision: Union[str, Sequence[str], None] = "f7c2d4e6a8b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Event stats count RSVPs per status; covering the pair keeps it an index-only scan
+    op.create_index("ix_rsvps_event_id_status", "rsvps", ["event_id", "status"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_rsvps_event_id_status", table_name="rsvps")
@@ -0,0 +1,39 @@
+"""location key C collation
+
+Revision ID: b7e2c4d6f8a1
+Revises: a9d3e5f7b2c4
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2c4d6f8a1"
+down_revision: Union[str, Sequence[str], None] = "a9d3e5f7b2c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Location prefix filters are code-point ranges (prefix_upper_bound). SQLite compares
+    # BINARY already; on Postgres the column (and so ix_events_location_key_start_time,
+    # which the type change rebuilds) moves off the database's linguistic collation.
+    if op.get_bind().dialect.name == "postgresql":
+        op.alter_column(
+            "events", "location_key",
+            existing_type=sa.String(length=200), type_=sa.String(length=200, collation="C"), existing_nullable=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.alter_column(
+            "events", "location_key",
+            existing_type=sa.String(length=200, collation="C"), type_=sa.String(length=200), existing_nullable=True,
+        )
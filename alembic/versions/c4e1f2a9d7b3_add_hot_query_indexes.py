@@ -0,0 +1,71 @@
+"""add hot query indexes
+
+Revision ID: c4e1f2a9d7b3
+Revises: b1f6d6cb5d7d
+Create Date: 2026-10-17 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e1f2a9d7b3"
+down_revision: Union[str, Sequence[str], None] = "b1f6d6cb5d7d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# An event sharing (source_id, source_record_id) with a lower id, i.e. a duplicate import
+# of the same upstream record. NULL never compares equal, so manual events are not matched.
+_HAS_KEEPER = (
+    "EXISTS (SELECT 1 FROM events keeper WHERE keeper.source_id = {e}.source_id"
+    " AND keeper.source_record_id = {e}.source_record_id AND keeper.id < {e}.id)"
+)
+
+
+def _merge_duplicate_source_records() -> None:
+    """Keep the lowest id per upstream record and move the duplicates' RSVPs onto it."""
+    # An attendee can only RSVP once per event: where they answered on several copies,
+    # keep the answer on the lowest event id and drop the others
+    op.execute(
+        "DELETE FROM rsvps WHERE id IN ("
+        " SELECT r.id FROM rsvps r"
+        " JOIN events e ON e.id = r.event_id"
+        " JOIN rsvps earlier ON earlier.attendee_id = r.attendee_id AND earlier.event_id < r.event_id"
+        " JOIN events e2 ON e2.id = earlier.event_id"
+        " WHERE e2.source_id = e.source_id AND e2.source_record_id = e.source_record_id)"
+    )
+    op.execute(
+        "UPDATE rsvps SET event_id = ("
+        " SELECT MIN(keeper.id) FROM events keeper JOIN events e"
+        " ON keeper.source_id = e.source_id AND keeper.source_record_id = e.source_record_id"
+        " WHERE e.id = rsvps.event_id)"
+        f" WHERE event_id IN (SELECT e.id FROM events e WHERE {_HAS_KEEPER.format(e='e')})"
+    )
+    op.execute(f"DELETE FROM events WHERE {_HAS_KEEPER.format(e='events')}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # list_events: start_time ordering and range filters
+    op.create_index("ix_events_start_time", "events", ["start_time"], unique=False)
+    # Importer lookup per row. Databases written by the old importer can hold duplicate
+    # upstream records, which would make the unique index fail, so merge them first
+    _merge_duplicate_source_records()
+    op.create_index("uq_events_source_record", "events", ["source_id", "source_record_id"], unique=True)
+    # list_rsvps_for_event / get_attendee_events
+    op.create_index("ix_rsvps_event_id_created_at", "rsvps", ["event_id", "created_at"], unique=False)
+    op.create_index("ix_rsvps_attendee_id", "rsvps", ["attendee_id"], unique=False)
+    # Latest import run per data source
+    op.create_index(
+        "ix_import_runs_data_source_id_started_at", "import_runs", ["data_source_id", "started_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_import_runs_data_source_id_started_at", table_name="import_runs")
+    op.drop_index("ix_rsvps_attendee_id", table_name="rsvps")
+    op.drop_index("ix_rsvps_event_id_created_at", table_name="rsvps")
+    op.drop_index("uq_events_source_record", table_name="events")
+    op.drop_index("ix_events_start_time", table_name="events")
@@ -0,0 +1,34 @@
+"""add event sort indexes
+
+Revision ID: d2a7b5c8e913
+Revises: c4e1f2a9d7b3
+Create Date: 2026-10-17 22:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a7b5c8e913"
+down_revision: Union[str, Sequence[str], None] = "c4e1f2a9d7b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # list_events keyset cursors seek on (sort column, id) for every allowed sort;
+    # start_time is already indexed. The id tiebreak rides on the implicit rowid.
+    op.create_index("ix_events_end_time", "events", ["end_time"], unique=False)
+    op.create_index("ix_events_created_at", "events", ["created_at"], unique=False)
+    op.create_index("ix_events_title", "events", ["title"], unique=False)
+    op.create_index("ix_events_capacity", "events", ["capacity"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_events_capacity", table_name="events")
+    op.drop_index("ix_events_title", table_name="events")
+    op.drop_index("ix_events_created_at", table_name="events")
+    op.drop_index("ix_events_end_time", table_name="events")
@@ -0,0 +1,55 @@
+"""add event location key
+
+Revision ID: f7c2d4e6a8b1
+Revises: e5b3c9d1f4a6
+Create Date: 2026-10-18 11:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f7c2d4e6a8b1"
+down_revision: Union[str, Sequence[str], None] = "e5b3c9d1f4a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _normalize(value):
+    # Same rule as app.core.locations.normalize_location (SQL lower() is not casefold)
+    return " ".join((value or "").split()).casefold()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("events", sa.Column("location_key", sa.String(length=200), nullable=True))
+
+    events = sa.table("events", sa.column("id", sa.Integer), sa.column("location", sa.String),
+                      sa.column("location_key", sa.String))
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(events.c.id, events.c.location).where(events.c.id > last_id).order_by(events.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            events.update().where(events.c.id == sa.bindparam("row_id")).values(location_key=sa.bindparam("key")),
+            [{"row_id": row.id, "key": _normalize(row.location)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    op.create_index("ix_events_location_key_start_time", "events", ["location_key", "start_time"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_events_location_key_start_time", table_name="events")
+    # Not batch mode: on SQLite that rebuilds the table and loses the events_fts triggers
+    op.drop_column("events", "location_key")
@@ -1,14 +1,21 @@
 import logging
-from typing import List
+from datetime import datetime
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from scripts.import_dataset import import_dataset
 
+from .. import crud
 from ..core import auth
-from ..core.db import get_db
-from ..models import DataSource, ImportRun, User
+from ..core.cache import caches
+from ..core.config import settings
+from ..core.db import get_db, get_read_db
+from ..core.export import EXPORT_FORMATS, export_chunks, export_headers
+from ..core.slow_queries import slow_query_log
+from ..models import DataSource, ImportRun
 from ..schemas import ImportQualityItem, ImportQualityResponse, ImportRunOut
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -23,7 +30,7 @@ def run_import(
         "https://opendata.leeds.gov.uk/downloads/Licences/temp-event-notice/temp-event-notice.xml"
     ),
     db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user),
+    current_user: auth.Principal = Depends(auth.get_current_admin_user),
 ):
     result = import_dataset(source_type, source_url, db)
 
@@ -42,11 +49,37 @@ def run_import(
     }
 
 
+@router.get("/events/export", response_class=StreamingResponse)
+def export_events(
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    location_match: Literal["contains", "exact", "prefix"] = "contains",
+    start_after: Optional[datetime] = None,
+    start_before: Optional[datetime] = None,
+    sort: Optional[str] = None,
+    min_capacity: Optional[int] = Query(None, ge=1),
+    status: Optional[str] = None,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    db: Session = Depends(get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_admin_user),
+):
+    """GET /events/export plus provenance columns (owner, data source, upstream record id, seeded flag)."""
+    batches = crud.export_events(
+        db, q=q, location=location, start_after=start_after, start_before=start_before, sort=sort,
+        min_capacity=min_capacity, status=status, location_match=location_match, provenance=True,
+    )
+    return StreamingResponse(
+        export_chunks(format, crud.export_columns(provenance=True), batches),
+        media_type=EXPORT_FORMATS[format],
+        headers=export_headers(format, "events-provenance"),
+    )
+
+
 @router.get("/imports", response_model=List[ImportRunOut])
 def list_imports(
     limit: int = 10,
     db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user),
+    current_user: auth.Principal = Depends(auth.get_current_admin_user),
 ):
     return db.query(ImportRun).order_by(ImportRun.started_at.desc()).limit(limit).all()
 
@@ -54,7 +87,7 @@ def list_imports(
 @router.get("/dataset/meta")
 def get_dataset_meta(
     db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user),
+    current_user: auth.Principal = Depends(auth.get_current_admin_user),
 ):
     source = db.query(DataSource).order_by(DataSource.retrieved_at.desc()).first()
     if not source:
@@ -80,7 +113,7 @@ def get_dataset_meta(
 def get_import_quality(
     limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user),
+    current_user: auth.Principal = Depends(auth.get_current_admin_user),
 ):
     """Import quality analytics: success/failure breakdown with per-run detail."""
     runs = db.query(ImportRun).order_by(ImportRun.started_at.desc()).limit(limit).all()
@@ -127,3 +160,33 @@ def get_import_quality(
         recent_failures_count=failed,
         runs=items,
     )
+
+
+@router.get("/cache/stats")
+def get_cache_stats(
+    current_user: auth.Principal = Depends(auth.get_current_admin_user),
+):
+    """Hit/miss/eviction counters for the in-process caches, for sizing them."""
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: auth.Principal = Depends(auth.get_current_admin_user),
+):
+    """Most recent statements over SLOW_QUERY_THRESHOLD_MS in this process, with their plans (newest first)."""
+    return {
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "capacity": slow_query_log.capacity,
+        "captured_total": slow_query_log.captured,
+        "entries": slow_query_log.entries(limit),
+    }
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(
+    current_user: auth.Principal = Depends(auth.get_current_admin_user),
+):
+    slow_query_log.clear()
+    return None
@@ -7,9 +7,9 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import desc, func, select
 from sqlalchemy.orm import Session
 
-from app.core.auth import get_current_user
-from app.core.db import get_db
-from app.models import RSVP, Attendee, Event, User
+from app.core.auth import Principal, get_current_user
+from app.core.db import get_read_db
+from app.models import RSVP, Attendee, Event
 from app.schemas import RecommendationItem, RecommendationResponse, SeasonalityItem, SeasonalityResponse, TrendingItem
 
 router = APIRouter()
@@ -23,7 +23,7 @@ def _month_expr(dialect_name: str, col: Any) -> Any:
 
 
 @router.get("/analytics/events/seasonality", response_model=SeasonalityResponse)
-def get_event_seasonality(db: Session = Depends(get_db)) -> SeasonalityResponse:
+def get_event_seasonality(db: Session = Depends(get_read_db)) -> SeasonalityResponse:
     """Get event aggregation by month using dialect-aware SQL GROUP BY."""
     month = _month_expr(db.get_bind().dialect.name, Event.start_time)
 
@@ -37,13 +37,15 @@ def get_event_seasonality(db: Session = Depends(get_db)) -> SeasonalityResponse:
     )
     rows = db.execute(stmt).all()
 
+    # Grouped on the normalized key so spellings of one venue count together;
+    # any one raw spelling labels the group
     loc_stmt = (
         select(
             month.label("month"),
-            Event.location,
+            func.min(Event.location).label("location"),
             func.count(Event.id).label("loc_count"),
         )
-        .group_by(month, Event.location)
+        .group_by(month, Event.location_key)
         .order_by(month, desc(func.count(Event.id)))
     )
     loc_rows = db.execute(loc_stmt).all()
@@ -71,7 +73,7 @@ def get_event_seasonality(db: Session = Depends(get_db)) -> SeasonalityResponse:
 def get_trending_events(
     window_days: int = 30,
     limit: int = 5,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[TrendingItem]:
     """Trending events by weighted RSVP activity, computed in SQL."""
     cutoff = datetime.utcnow() - timedelta(days=window_days)
@@ -126,8 +128,8 @@ def get_trending_events(
 
 @router.get("/events/recommendations", response_model=RecommendationResponse)
 def get_recommendations(
-    user: User = Depends(get_current_user),  # type: ignore[assignment]
-    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
 ) -> RecommendationResponse:
     """Personalised event recommendations based on RSVP history."""
     attendee = db.scalar(select(Attendee).where(Attendee.email == user.email))
@@ -153,18 +155,22 @@ def get_recommendations(
         ]
         return RecommendationResponse(recommendations=recs, user_id=user.id)
 
-    past_rsvps = attendee.rsvps
-    visited_locations = {r.event.location for r in past_rsvps}
+    # The attendee's events and their locations in one query, not one lazy load per RSVP
+    past_events = db.execute(
+        select(RSVP.event_id, Event.location_key).join(Event).where(RSVP.attendee_id == attendee.id)
+    ).all()
+    attended = {row.event_id for row in past_events}
+    visited_locations = {row.location_key for row in past_events}
 
     candidates = db.scalars(
         select(Event)
         .where(Event.start_time > datetime.utcnow())
-        .where(Event.location.in_(visited_locations))
+        .where(Event.location_key.in_(visited_locations))
     ).all()
 
     recs = []
     for event in candidates:
-        if any(r.event_id == event.id for r in past_rsvps):
+        if event.id in attended:
             continue
 
         recs.append(
@@ -0,0 +1,94 @@
+"""
+AsyncSession versions of the hot read routes.
+
+Included ahead of ``routes.router`` when ``DATABASE_ASYNC`` is enabled, so these
+handlers win the match for the same paths and run on the event loop instead of
+the threadpool (which caps concurrent sync routes at 40). Everything else keeps
+using the sync handlers.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import crud
+from ..core.db import get_async_db
+from ..core.export import EXPORT_FORMATS, export_chunks_async, export_headers
+from ..core.pagination import InvalidCursor
+from ..schemas import EventOut, PaginatedResponse, event_fields_adapter, parse_event_fields
+
+router = APIRouter()
+
+@router.get("/events", response_model=PaginatedResponse[EventOut])
+async def list_events(
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    location_match: Literal["contains", "exact", "prefix"] = "contains",
+    start_after: Optional[datetime] = None,
+    start_before: Optional[datetime] = None,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, max_length=512),
+    total: Literal["exact", "estimated", "none"] = "exact",
+    sort: Optional[str] = None,
+    min_capacity: Optional[int] = Query(None, ge=1),
+    status: Optional[str] = None,
+    fields: Optional[str] = Query(None, max_length=200),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    List events with pagination, filtering, and sorting.
+    Pass ``next_cursor`` back as ``cursor`` for keyset paging (same filters and sort, no offset).
+    ``total=estimated`` or ``total=none`` skip the exact COUNT (e.g. for infinite scroll).
+    ``fields=title,start_time`` returns (and loads) only those fields, plus ``id``.
+    """
+    try:
+        selected = parse_event_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    try:
+        result = await crud.list_events_async(db, q=q, location=location, start_after=start_after, start_before=start_before, limit=limit, offset=offset, sort=sort, min_capacity=min_capacity, status=status, cursor=cursor, total_mode=total, location_match=location_match, fields=selected)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    if selected is None:
+        return result
+    adapter = event_fields_adapter(selected, page=True)
+    return Response(adapter.dump_json(adapter.validate_python(result)), media_type="application/json")
+
+@router.get("/events/export", response_class=StreamingResponse)
+async def export_events(
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    location_match: Literal["contains", "exact", "prefix"] = "contains",
+    start_after: Optional[datetime] = None,
+    start_before: Optional[datetime] = None,
+    sort: Optional[str] = None,
+    min_capacity: Optional[int] = Query(None, ge=1),
+    status: Optional[str] = None,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Stream every event matching the ``GET /events`` filters as NDJSON or CSV, in one response.
+    Declared before ``/events/{event_id}``, which would otherwise match ``export``.
+    """
+    batches = crud.export_events_async(db, q=q, location=location, start_after=start_after, start_before=start_before, sort=sort, min_capacity=min_capacity, status=status, location_match=location_match)
+    return StreamingResponse(
+        export_chunks_async(format, crud.export_columns(), batches),
+        media_type=EXPORT_FORMATS[format],
+        headers=export_headers(format, "events"),
+    )
+
+@router.get("/events/{event_id}", response_model=EventOut)
+async def get_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve specific event details.
+    """
+    event = await crud.get_event_async(db, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="event not found")
+    return event
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
@@ -13,8 +14,13 @@ from sqlalchemy.orm import Session
 from .. import crud
 from ..core import auth
 from ..core.config import settings
-from ..core.db import get_db
-from ..models import RSVP, ImportRun, User
+from ..core.db import get_db, get_read_db, get_versioned_read_db
+from ..core.export import EXPORT_FORMATS, export_chunks, export_headers
+from ..core.hashing import HashingUnavailable
+from ..core.locations import location_index, normalize_location
+from ..core.metrics import registry
+from ..core.pagination import InvalidCursor
+from ..models import RSVP, Event, ImportRun
 from ..schemas import (
     AttendeeCreate,
     AttendeeOut,
@@ -23,18 +29,31 @@ from ..schemas import (
     EventProvenanceOut,
     EventStatsOut,
     EventUpdate,
+    LocationOut,
     PaginatedResponse,
     RSVPCreate,
     RSVPOut,
     Token,
     UserCreate,
     UserOut,
+    event_fields_adapter,
+    parse_event_fields,
 )
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+
+def _hashing_unavailable(exc: HashingUnavailable) -> HTTPException:
+    logger.warning(f"Password hashing unavailable: {exc.reason}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is temporarily overloaded, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/auth/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 def register(payload: UserCreate, db: Session = Depends(get_db)):
     """
@@ -44,7 +63,10 @@ def register(payload: UserCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Username already registered")
     if crud.get_user_by_email(db, payload.email):
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_pw = auth.get_password_hash(payload.password.get_secret_value())
+    try:
+        hashed_pw = auth.get_password_hash(payload.password.get_secret_value())
+    except HashingUnavailable as exc:
+        raise _hashing_unavailable(exc) from None
     user = crud.create_user(db, payload, hashed_pw)
     logger.info(f"New user registered: {user.username}")
     return user
@@ -55,7 +77,11 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     Authenticate a user and return an access token.
     """
     user = crud.get_user_by_username(db, form_data.username)
-    if not user or not auth.verify_password(form_data.password, user.hashed_password):
+    try:
+        password_ok = user is not None and auth.verify_password(form_data.password, user.hashed_password)
+    except HashingUnavailable as exc:
+        raise _hashing_unavailable(exc) from None
+    if not user or not password_ok:
         logger.warning(f"Failed login attempt for user: {form_data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -63,7 +89,8 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
             headers={"WWW-Authenticate": "Bearer"},
         )
     logger.info(f"User logged in: {user.username}")
-    access_token = auth.create_access_token(data={"sub": user.username})
+    # The role claim only selects rate-limit quotas; authorization always re-checks the user
+    access_token = auth.create_access_token(data={"sub": user.username, "role": "admin" if user.is_admin else "user"})
     return {"access_token": access_token, "token_type": "bearer"}  # nosec B105
 
 @router.get("/health", tags=["system"])
@@ -87,30 +114,90 @@ def health_check(db: Session = Depends(get_db)):
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@router.get("/metrics", tags=["system"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus text exposition of request, database and rate-limit metrics.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @router.post("/events", response_model=EventOut, status_code=status.HTTP_201_CREATED)
-def create_event(payload: EventCreate, db: Session = Depends(get_db), current_user: User = Depends(auth.get_current_user)):
+def create_event(payload: EventCreate, db: Session = Depends(get_db), current_user: auth.Principal = Depends(auth.get_current_user)):
     return crud.create_event(db, payload, user_id=current_user.id)
 
 @router.get("/events", response_model=PaginatedResponse[EventOut])
 def list_events(
     q: Optional[str] = None,
     location: Optional[str] = None,
+    location_match: Literal["contains", "exact", "prefix"] = "contains",
     start_after: Optional[datetime] = None,
     start_before: Optional[datetime] = None,
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, max_length=512),
+    total: Literal["exact", "estimated", "none"] = "exact",
     sort: Optional[str] = None,
     min_capacity: Optional[int] = Query(None, ge=1),
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, max_length=200),
+    db: Session = Depends(get_versioned_read_db)
 ):
     """
     List events with pagination, filtering, and sorting.
+    Pass ``next_cursor`` back as ``cursor`` for keyset paging (same filters and sort, no offset).
+    ``total=estimated`` or ``total=none`` skip the exact COUNT (e.g. for infinite scroll).
+    ``fields=title,start_time`` returns (and loads) only those fields, plus ``id``.
+    """
+    try:
+        selected = parse_event_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    try:
+        result = crud.list_events(db, q=q, location=location, start_after=start_after, start_before=start_before, limit=limit, offset=offset, sort=sort, min_capacity=min_capacity, status=status, cursor=cursor, total_mode=total, location_match=location_match, fields=selected)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    if selected is None:
+        return result
+    adapter = event_fields_adapter(selected, page=True)
+    return Response(adapter.dump_json(adapter.validate_python(result)), media_type="application/json")
+
+@router.get("/locations", response_model=List[LocationOut])
+def autocomplete_locations(
+    prefix: str = Query("", max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Event locations whose normalized form starts with ``prefix``, with their event counts.
+    """
+    location_index.ensure_loaded(db, Event)
+    return location_index.search(normalize_location(prefix), limit)
+
+@router.get("/events/export", response_class=StreamingResponse)
+def export_events(
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    location_match: Literal["contains", "exact", "prefix"] = "contains",
+    start_after: Optional[datetime] = None,
+    start_before: Optional[datetime] = None,
+    sort: Optional[str] = None,
+    min_capacity: Optional[int] = Query(None, ge=1),
+    status: Optional[str] = None,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    db: Session = Depends(get_read_db),
+):
+    """
+    Stream every event matching the ``GET /events`` filters as NDJSON or CSV, in one response.
     """
-    return crud.list_events(db, q=q, location=location, start_after=start_after, start_before=start_before, limit=limit, offset=offset, sort=sort, min_capacity=min_capacity, status=status)
+    batches = crud.export_events(db, q=q, location=location, start_after=start_after, start_before=start_before, sort=sort, min_capacity=min_capacity, status=status, location_match=location_match)
+    return StreamingResponse(
+        export_chunks(format, crud.export_columns(), batches),
+        media_type=EXPORT_FORMATS[format],
+        headers=export_headers(format, "events"),
+    )
 
 @router.get("/events/{event_id}", response_model=EventOut)
-def get_event(event_id: int, db: Session = Depends(get_db)):
+def get_event(event_id: int, db: Session = Depends(get_read_db)):
     """
     Retrieve specific event details.
     """
@@ -121,7 +208,7 @@ def get_event(event_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/events/{event_id}/provenance", response_model=EventProvenanceOut)
-def get_event_provenance(event_id: int, db: Session = Depends(get_db)):
+def get_event_provenance(event_id: int, db: Session = Depends(get_read_db)):
     event = crud.get_event(db, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="event not found")
@@ -152,7 +239,7 @@ def get_event_provenance(event_id: int, db: Session = Depends(get_db)):
 
 
 @router.patch("/events/{event_id}", response_model=EventOut)
-def patch_event(event_id: int, payload: EventUpdate, db: Session = Depends(get_db), current_user: User = Depends(auth.get_current_user)):
+def patch_event(event_id: int, payload: EventUpdate, db: Session = Depends(get_db), current_user: auth.Principal = Depends(auth.get_current_user)):
     event = crud.get_event(db, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="event not found")
@@ -161,7 +248,7 @@ def patch_event(event_id: int, payload: EventUpdate, db: Session = Depends(get_d
     return crud.update_event(db, event, payload)
 
 @router.delete("/events/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_event(event_id: int, db: Session = Depends(get_db), current_user: User = Depends(auth.get_current_user)):
+def delete_event(event_id: int, db: Session = Depends(get_db), current_user: auth.Principal = Depends(auth.get_current_user)):
     event = crud.get_event(db, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="event not found")
@@ -171,7 +258,7 @@ def delete_event(event_id: int, db: Session = Depends(get_db), current_user: Use
     return None
 
 @router.post("/attendees", response_model=AttendeeOut, status_code=status.HTTP_201_CREATED)
-def create_attendee(payload: AttendeeCreate, db: Session = Depends(get_db), current_user: User = Depends(auth.get_current_user)):
+def create_attendee(payload: AttendeeCreate, db: Session = Depends(get_db), current_user: auth.Principal = Depends(auth.get_current_user)):
     """
     Register a new attendee (Authenticated users only).
     """
@@ -181,7 +268,7 @@ def create_attendee(payload: AttendeeCreate, db: Session = Depends(get_db), curr
         raise HTTPException(status_code=409, detail="email already exists")
 
 @router.get("/attendees/{attendee_id}", response_model=AttendeeOut)
-def get_attendee(attendee_id: int, db: Session = Depends(get_db)):
+def get_attendee(attendee_id: int, db: Session = Depends(get_read_db)):
     """
     Get details of a specific attendee.
     """
@@ -191,22 +278,33 @@ def get_attendee(attendee_id: int, db: Session = Depends(get_db)):
     return attendee
 
 @router.get("/attendees/{attendee_id}/events", response_model=List[EventOut])
-def get_attendee_events(attendee_id: int, db: Session = Depends(get_db)):
+def get_attendee_events(
+    attendee_id: int,
+    fields: Optional[str] = Query(None, max_length=200),
+    db: Session = Depends(get_read_db),
+):
     """
-    Get all events for a specific attendee.
+    Get all events for a specific attendee; ``fields`` as for ``GET /events``.
     """
+    try:
+        selected = parse_event_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
     attendee = crud.get_attendee(db, attendee_id)
     if not attendee:
         raise HTTPException(status_code=404, detail="attendee not found")
-    return crud.get_attendee_events(db, attendee_id)
+    events = crud.get_attendee_events(db, attendee_id, fields=selected)
+    if selected is None:
+        return events
+    adapter = event_fields_adapter(selected, page=False)
+    return Response(adapter.dump_json(adapter.validate_python(events)), media_type="application/json")
 
 @router.post("/events/{event_id}/rsvps", response_model=RSVPOut, status_code=status.HTTP_201_CREATED)
-def create_rsvp(event_id: int, payload: RSVPCreate, db: Session = Depends(get_db), current_user: User = Depends(auth.get_current_user)):
+def create_rsvp(event_id: int, payload: RSVPCreate, db: Session = Depends(get_db), current_user: auth.Principal = Depends(auth.get_current_user)):
     """
     RSVP an attendee to an event (Authenticated users only).
     """
-    event = crud.get_event(db, event_id)
-    if not event:
+    if not crud.get_event_ref(db, event_id):
         raise HTTPException(status_code=404, detail="event not found")
     attendee = crud.get_attendee(db, payload.attendee_id)
     if not attendee:
@@ -219,21 +317,20 @@ def create_rsvp(event_id: int, payload: RSVPCreate, db: Session = Depends(get_db
         raise HTTPException(status_code=409, detail="duplicate RSVP for this attendee/event")
 
 @router.get("/events/{event_id}/rsvps", response_model=List[RSVPOut])
-def list_event_rsvps(event_id: int, db: Session = Depends(get_db)):
+def list_event_rsvps(event_id: int, db: Session = Depends(get_read_db)):
     """
     List all RSVPs for a specific event.
     """
-    event = crud.get_event(db, event_id)
-    if not event:
+    if not crud.get_event_ref(db, event_id):
         raise HTTPException(status_code=404, detail="event not found")
     return crud.list_rsvps_for_event(db, event_id)
 
 @router.delete("/events/{event_id}/rsvps/{rsvp_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_event_rsvp(event_id: int, rsvp_id: int, db: Session = Depends(get_db), current_user: User = Depends(auth.get_current_user)):
+def delete_event_rsvp(event_id: int, rsvp_id: int, db: Session = Depends(get_db), current_user: auth.Principal = Depends(auth.get_current_user)):
     """
     Remove an RSVP (Authenticated users only).
     """
-    event = crud.get_event(db, event_id)
+    event = crud.get_event_ref(db, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="event not found")
     rsvp = db.get(RSVP, rsvp_id)
@@ -248,7 +345,7 @@ def delete_event_rsvp(event_id: int, rsvp_id: int, db: Session = Depends(get_db)
     return None
 
 @router.get("/events/{event_id}/stats", response_model=EventStatsOut)
-def event_stats(event_id: int, db: Session = Depends(get_db)):
+def event_stats(event_id: int, db: Session = Depends(get_read_db)):
     """
     Get detailed statistics for an event (e.g., total attendees).
     """
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from ..core.cache import named_cache
 from ..core.config import settings
 from ..core.db import get_db
+from ..core.hashing import password_hasher, pwd_context  # noqa: F401 (pwd_context re-exported)
 from ..models import User
 from ..schemas import TokenData
 
@@ -18,18 +21,57 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
+@dataclass(frozen=True)
+class Principal:
+    """Detached snapshot of the authenticated user (safe to share across requests)."""
+    id: int
+    username: str
+    email: str
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, username=user.username, email=user.email, is_admin=bool(user.is_admin))
+
+
+# Principals keyed by username. The token itself is still verified on every
+# request; the cache only replaces the user SELECT.
+principal_cache = named_cache(
+    "principals",
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(username: str) -> None:
+    """Drop a cached principal after the user record changes."""
+    principal_cache.delete(username)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User) -> None:
+    # An ORM update evicts the snapshot in the process that made it; other processes
+    # (e.g. the API after scripts/make_admin.py) pick the change up within PRINCIPAL_CACHE_TTL_SECONDS
+    invalidate_principal(target.username)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
-    return bool(pwd_context.verify(plain_password, hashed_password))
+    """
+    Verify a plain password against a hashed password (in the hashing pool).
+    Raises HashingUnavailable if the pool is saturated or times out.
+    """
+    return password_hasher.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using pbkdf2_sha256."""
-    return str(pwd_context.hash(password))
+    """
+    Hash a password using pbkdf2_sha256 (in the hashing pool).
+    Raises HashingUnavailable if the pool is saturated or times out.
+    """
+    return password_hasher.hash(password)
 
 
 def create_access_token(data: dict[str, object], expires_delta: Optional[timedelta] = None) -> str:
@@ -43,13 +85,35 @@ def create_access_token(data: dict[str, object], expires_delta: Optional[timedel
     return str(jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM))
 
 
+def token_principal(authorization: Optional[str]) -> Optional[tuple[str, str]]:
+    """
+    Return (subject, role) from a valid "Bearer" Authorization header, or None.
+    Only verifies the signature/expiry; no database lookup (used for rate-limit keys).
+    """
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    subject = payload.get("sub")
+    if not subject:
+        return None
+    role = payload.get("role")
+    return str(subject), role if role in ("user", "admin") else "user"
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     Dependency that extracts and validates the current user from the JWT token.
     Raises 401 if token is invalid or user not found.
+    Returns a cached Principal snapshot when one is available.
     """
     # Import here to avoid circular dependency
     from ..crud import get_user_by_username
@@ -70,15 +134,20 @@ async def get_current_user(
 
     if token_data.username is None:
         raise credentials_exception
+    cached: Optional[Principal] = principal_cache.get(token_data.username)
+    if cached is not None:
+        return cached
     user = get_user_by_username(db, username=token_data.username)
     if user is None:
         raise credentials_exception
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(token_data.username, principal)
+    return principal
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     Dependency that ensures the authenticated user has admin privileges.
     """
@@ -0,0 +1,156 @@
+"""
+Negotiated response compression (gzip, plus brotli when the ``brotli`` package is
+installed) with a cache of compressed bodies for ETag-identified responses.
+
+Compressed representations get their own ETag (``"<etag>-gzip"``), as required
+for a strong validator that differs per content-coding.
+"""
+from __future__ import annotations
+
+import gzip
+from typing import Any, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import Message, Send
+
+from .cache import named_cache
+from .config import settings
+
+try:  # Optional dependency
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+# Compressed bodies keyed by (etag, encoding)
+compressed_cache = named_cache(
+    "compressed_responses",
+    maxsize=settings.COMPRESSION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.COMPRESSION_CACHE_TTL_SECONDS,
+)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Supported content-codings, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header (q=0 excluded)."""
+    if not accept_encoding:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return bytes(brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY))
+    # mtime=0 keeps output deterministic for identical bodies
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Derive the per-encoding ETag: '"abc"' -> '"abc-gzip"' (weak prefix preserved)."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def strip_encoding_suffix(etag: str) -> str:
+    """Map a per-encoding ETag back to the identity ETag it was derived from."""
+    for suffix in ENCODING_SUFFIXES:
+        if etag.endswith(f'{suffix}"'):
+            return f'{etag[: -len(suffix) - 1]}"'
+    return etag
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    if not content_type.startswith(COMPRESSIBLE_TYPES):
+        return False
+    length = headers.get("content-length")
+    # Unknown length means a streaming body; leave it alone rather than buffer it
+    return length is not None and int(length) >= settings.COMPRESSION_MIN_SIZE
+
+
+def compressing_send(send: Send, request_headers: Headers) -> Send:
+    """
+    Wrap ``send`` so eligible responses are compressed with the negotiated encoding.
+
+    The body is buffered as a chunk list until complete (the Content-Length has
+    to change), then compressed once, or taken from the cache when the response
+    carries an ETag.
+    """
+    if not settings.COMPRESSION_ENABLED:
+        return send
+    encoding = choose_encoding(request_headers.get("accept-encoding"))
+    if_none_match = request_headers.get("if-none-match") or ""
+
+    start_message: Optional[Message] = None
+    chunks: list[bytes] = []
+
+    async def send_compressed(message: Message) -> None:
+        nonlocal start_message
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(scope=message)
+            if headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES) or message["status"] == 304:
+                headers.add_vary_header("Accept-Encoding")
+            if encoding is None:
+                await send(message)
+                return
+            etag = headers.get("etag")
+            if message["status"] == 304 and etag and encoded_etag(etag, encoding) in if_none_match:
+                # The client validated its compressed copy; echo that representation's ETag
+                headers["ETag"] = encoded_etag(etag, encoding)
+                await send(message)
+                return
+            if message["status"] != 200 or not _compressible(headers):
+                await send(message)
+                return
+            start_message = message
+            return
+
+        if start_message is None or message["type"] != "http.response.body":
+            await send(message)
+            return
+
+        chunks.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+
+        assert encoding is not None
+        headers = MutableHeaders(scope=start_message)
+        etag = headers.get("etag")
+        body: Any = None
+        if etag:
+            body = compressed_cache.get((etag, encoding))
+        if body is None:
+            body = compress(b"".join(chunks), encoding)
+            if etag:
+                compressed_cache.set((etag, encoding), body)
+        chunks.clear()
+
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(body))
+        if etag:
+            headers["ETag"] = encoded_etag(etag, encoding)
+        await send(start_message)
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+
+    return send_compressed
@@ -16,15 +16,106 @@ class Settings:
 
     # Database
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+    # Serve the hot read routes (GET /events, GET /events/{id}) through an AsyncSession.
+    # Needs the optional async driver: aiosqlite for SQLite, asyncpg for Postgres.
+    DATABASE_ASYNC = str(os.getenv("DATABASE_ASYNC", "0")).lower() in ("true", "1", "yes")
+    # Applied to every new SQLite connection (see app/core/db.py); empty disables the profile.
+    # WAL lets readers run alongside the single writer; busy_timeout makes writers queue
+    # instead of failing with "database is locked".
+    SQLITE_PRAGMAS = os.getenv(
+        "SQLITE_PRAGMAS",
+        "journal_mode=WAL,synchronous=NORMAL,busy_timeout=5000,cache_size=-16000,"
+        "mmap_size=134217728,temp_store=MEMORY",
+    )
+    # Primary (write) pool for file-backed SQLite. There is a single writer, so the pool
+    # stays small: more connections would only queue on the write lock, and the pool
+    # queue (DB_POOL_TIMEOUT) is cheaper than busy_timeout retries. Reads use their own pool.
+    SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "4"))
+    SQLITE_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "0"))
+    # Primary pool for other databases (Postgres): unset keeps SQLAlchemy's defaults, 5 + 10 overflow
+    DB_POOL_SIZE = int(os.environ["DB_POOL_SIZE"]) if os.getenv("DB_POOL_SIZE") else None
+    DB_MAX_OVERFLOW = int(os.environ["DB_MAX_OVERFLOW"]) if os.getenv("DB_MAX_OVERFLOW") else None
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # Read-only routes (get_read_db): a replica DSN, or empty to read DATABASE_URL through
+    # query_only SQLite connections, or read-only transactions on the primary pool for
+    # Postgres (no extra connections). Replica reads may lag the primary by the replication delay.
+    DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", "")
+    # SQLite read pool: WAL readers run concurrently, so it covers the 40-thread request pool
+    SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "20"))
+    SQLITE_READ_MAX_OVERFLOW = int(os.getenv("SQLITE_READ_MAX_OVERFLOW", "20"))
+    # Replica pool for other databases: unset keeps SQLAlchemy's defaults, 5 + 10 overflow
+    DB_READ_POOL_SIZE = int(os.environ["DB_READ_POOL_SIZE"]) if os.getenv("DB_READ_POOL_SIZE") else None
+    DB_READ_MAX_OVERFLOW = int(os.environ["DB_READ_MAX_OVERFLOW"]) if os.getenv("DB_READ_MAX_OVERFLOW") else None
 
     # Security
     SECRET_KEY = os.getenv("SECRET_KEY", "comp3011-coursework-secret-key-change-me-in-prod")
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
+    # Authenticated-principal cache (saves the user SELECT per request; 0 entries disables it)
+    PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "1024"))
+    PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    # Password hashing (pbkdf2_sha256) runs in a process pool; 0 workers hashes inline.
+    # Rounds only apply to new hashes; existing hashes carry their own round count.
+    PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    # Hashes queued or running before login/register answer 503 instead of waiting
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+    PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "5"))
 
     # Advanced Security & Deployment
     RATE_LIMIT_ENABLED = str(os.getenv("RATE_LIMIT_ENABLED", "1")).lower() in ("true", "1", "yes")
+    # Hard cap on client:path keys tracked per limiter (least recently seen evicted first)
+    RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    # "memory" (per process) or "sqlite" (shared by all workers on the host via a WAL file)
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+    RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "./ratelimit.db")
+    # How long a hit waits on another worker's write lock before failing (and the request
+    # being let through); keep it short, a queued hit holds a thread for this long
+    RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS", "50"))
+    # Per-minute budgets keyed by route template ("/analytics/*" matches by prefix);
+    # routes without an entry use the caller's role budget (anonymous/user/admin)
+    RATE_LIMIT_ROUTE_QUOTAS = os.getenv("RATE_LIMIT_ROUTE_QUOTAS", "/analytics/*=30,/admin/imports/run=5")
+    RATE_LIMIT_ROLE_QUOTAS = os.getenv("RATE_LIMIT_ROLE_QUOTAS", "anonymous=120,user=240,admin=600")
     ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "")
     GIT_SHA = os.getenv("RENDER_GIT_COMMIT") or os.getenv("GIT_SHA", "unknown")
 
+    # Caching & Conditional GET
+    # How long a data-version ETag stays valid (bounds staleness from out-of-process
+    # writes and from time-based filters such as status=upcoming)
+    ETAG_VERSION_WINDOW_SECONDS = int(os.getenv("ETAG_VERSION_WINDOW_SECONDS", "60"))
+    # In-process result cache for crud.list_events (0 entries disables it)
+    LIST_CACHE_MAX_ENTRIES = int(os.getenv("LIST_CACHE_MAX_ENTRIES", "256"))
+    LIST_CACHE_TTL_SECONDS = float(os.getenv("LIST_CACHE_TTL_SECONDS", "30"))
+    # Exact list_events totals cached per filter signature (same TTL; 0 entries disables it)
+    LIST_COUNT_CACHE_MAX_ENTRIES = int(os.getenv("LIST_COUNT_CACHE_MAX_ENTRIES", "1024"))
+    # GET /locations index: full reload interval, for writes made by other processes
+    LOCATION_INDEX_REFRESH_SECONDS = float(os.getenv("LOCATION_INDEX_REFRESH_SECONDS", "300"))
+    # Rows fetched per round trip (and per streamed chunk) by the event exports
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Response compression (gzip; brotli too if the optional `brotli` package is installed)
+    COMPRESSION_ENABLED = str(os.getenv("COMPRESSION_ENABLED", "1")).lower() in ("true", "1", "yes")
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    COMPRESSION_CACHE_MAX_ENTRIES = int(os.getenv("COMPRESSION_CACHE_MAX_ENTRIES", "128"))
+    COMPRESSION_CACHE_TTL_SECONDS = float(os.getenv("COMPRESSION_CACHE_TTL_SECONDS", "300"))
+
+    # Logging (queue-backed; see app/core/logging_config.py)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json" if ENVIRONMENT == "prod" else "text")
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "256"))
+    # X-DB-Queries / X-DB-Time response headers (statement count, milliseconds)
+    DB_STATS_HEADERS = str(os.getenv("DB_STATS_HEADERS", "0" if ENVIRONMENT == "prod" else "1")).lower() in ("true", "1", "yes")
+    # Flag requests that run one statement shape more than this many times (0 disables):
+    # logged as a warning outside prod, always counted in /metrics
+    N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+    # Statements slower than this are kept, with their EXPLAIN plan, for GET /admin/slow-queries (0 disables)
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+    SLOW_QUERY_EXPLAIN = str(os.getenv("SLOW_QUERY_EXPLAIN", "1")).lower() in ("true", "1", "yes")
+    # Fraction of 2xx access records kept (errors and other statuses are always logged)
+    ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+
 settings = Settings()
@@ -1,12 +1,119 @@
-from sqlalchemy import create_engine
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Mapping, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, Connection, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from . import slow_queries
 from .config import settings
+from .metrics import DB_POOLS
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+# PRAGMA takes no bound parameters, so names are allow-listed and values must be a
+# bare word or integer before they are interpolated
+SQLITE_PRAGMA_NAMES = frozenset(
+    {"journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "temp_store", "wal_autocheckpoint"}
 )
+_PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+
+def parse_sqlite_pragmas(spec: str) -> list[tuple[str, str]]:
+    """Parse ``"name=value,name=value"`` into validated (name, value) pairs."""
+    pragmas: list[tuple[str, str]] = []
+    for item in spec.split(","):
+        name, sep, value = item.strip().partition("=")
+        name, value = name.strip().lower(), value.strip()
+        if not name:
+            continue
+        if not sep or name not in SQLITE_PRAGMA_NAMES or not _PRAGMA_VALUE.match(value):
+            raise ValueError(f"unsupported SQLite pragma: {item.strip()!r}")
+        pragmas.append((name, value))
+    return pragmas
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(
+    url: str, pool_size: Optional[int] = None, max_overflow: Optional[int] = None, read: bool = False
+) -> dict[str, Any]:
+    """
+    create_engine/create_async_engine keyword arguments for ``url``, with the read or
+    write pool sizing. ``pool_size`` and ``max_overflow`` override the configured
+    sizes; a size left at None keeps SQLAlchemy's default.
+    """
+    parsed = make_url(url)
+    options: dict[str, Any] = {}
+    default_size: Optional[int]
+    default_overflow: Optional[int]
+    if _is_memory_sqlite(parsed):
+        # A singleton/static pool, which takes no sizing
+        return {"connect_args": {"check_same_thread": False}}
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if read:
+            default_size, default_overflow = settings.SQLITE_READ_POOL_SIZE, settings.SQLITE_READ_MAX_OVERFLOW
+        else:
+            default_size, default_overflow = settings.SQLITE_POOL_SIZE, settings.SQLITE_MAX_OVERFLOW
+    elif read:
+        default_size, default_overflow = settings.DB_READ_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW
+    else:
+        default_size, default_overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    sizes = {
+        "pool_size": default_size if pool_size is None else pool_size,
+        "max_overflow": default_overflow if max_overflow is None else max_overflow,
+    }
+    options.update({name: value for name, value in sizes.items() if value is not None})
+    options["pool_timeout"] = settings.DB_POOL_TIMEOUT
+    return options
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: list[tuple[str, str]]) -> None:
+    """Run the pragma profile on each new DBAPI connection of a SQLite engine."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def build_engine(
+    url: str, read_only: bool = False, pool_size: Optional[int] = None, max_overflow: Optional[int] = None
+) -> Engine:
+    engine = create_engine(url, **engine_options(url, pool_size, max_overflow, read=read_only))
+    pragmas = parse_sqlite_pragmas(settings.SQLITE_PRAGMAS)
+    if read_only:
+        # SQLite refuses writes on these connections ("attempt to write a readonly database")
+        pragmas.append(("query_only", "1"))
+    apply_sqlite_pragmas(engine, pragmas)
+    return read_only_engine(engine) if read_only else engine
+
+
+def read_only_engine(engine: Engine) -> Engine:
+    """
+    ``engine`` sharing its pool, with writes refused by PostgreSQL: each checkout sets
+    the session READ ONLY, which is reset when the connection returns to the pool.
+    SQLite read-only is per connection (query_only, set by build_engine), so other
+    dialects get ``engine`` back unchanged.
+    """
+    if engine.dialect.name == "postgresql":
+        return engine.execution_options(postgresql_readonly=True)
+    return engine
+
+
+engine = build_engine(settings.DATABASE_URL)
+
+DB_POOLS.add("primary", engine)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 
@@ -16,3 +123,166 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Read-only routes: a replica when DATABASE_READ_URL is set. Otherwise, for a SQLite
+# file, query_only connections in a pool of their own, so WAL readers never queue
+# behind writers for a connection; for Postgres, read-only transactions on the primary
+# pool, so a process holds no extra connections. An in-memory SQLite database exists
+# only inside its one connection, so there the primary engine is shared.
+if settings.DATABASE_READ_URL:
+    read_engine = build_engine(settings.DATABASE_READ_URL, read_only=True)
+    DB_POOLS.add("read", read_engine)
+elif engine.dialect.name == "sqlite" and not _is_memory_sqlite(engine.url):
+    read_engine = build_engine(settings.DATABASE_URL, read_only=True)
+    DB_POOLS.add("read", read_engine)
+else:
+    read_engine = read_only_engine(engine)
+
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False, future=True)
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Reads cached and ETagged under the in-process data version (GET /events). A write bumps
+# the version as soon as it commits, so a lagging replica's pre-write rows would be cached,
+# and confirmed by 304s, under the new version. With DATABASE_READ_URL these reads go to
+# the primary instead, read-only where the dialect allows it (read_only_engine).
+PrimaryReadSessionLocal = sessionmaker(bind=read_only_engine(engine), autocommit=False, autoflush=False, future=True)
+
+def get_versioned_read_db():
+    db = PrimaryReadSessionLocal() if settings.DATABASE_READ_URL else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Async drivers for the sync URLs this app is configured with
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto the matching async driver (sqlite -> aiosqlite, postgresql -> asyncpg)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"no async driver configured for {backend!r} databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+
+if settings.DATABASE_ASYNC:
+    # Fails here (at startup) if the optional driver is missing, not on the first request
+    # It only serves read routes, so it takes the read pool's sizing
+    async_engine = create_async_engine(
+        async_database_url(settings.DATABASE_URL), **engine_options(settings.DATABASE_URL, read=True)
+    )
+    apply_sqlite_pragmas(async_engine.sync_engine, parse_sqlite_pragmas(settings.SQLITE_PRAGMAS))
+    DB_POOLS.add("async", async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("async database access is disabled (set DATABASE_ASYNC=1)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+def estimate_row_count(connection: Connection, table: str) -> Optional[int]:
+    """
+    Rows in ``table`` according to the database's statistics, without scanning it:
+    pg_class.reltuples, information_schema TABLE_ROWS, or sqlite_stat1 (written by
+    ANALYZE / PRAGMA optimize). None when there are no statistics for the table yet.
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        value = connection.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+        ).scalar()
+    elif dialect == "mysql":
+        value = connection.execute(
+            text("SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = :table"),
+            {"table": table},
+        ).scalar()
+    elif dialect == "sqlite":
+        if not connection.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")).scalar():
+            return None
+        # Each row's first figure is the row count of the table (idx NULL) or of one of its indexes
+        stat = connection.execute(
+            text("SELECT stat FROM sqlite_stat1 WHERE tbl = :table ORDER BY idx IS NOT NULL LIMIT 1"), {"table": table}
+        ).scalar()
+        value = int(stat.split()[0]) if stat else None
+    else:
+        return None
+    # reltuples is -1 until the table is first vacuumed or analyzed
+    if value is None or value < 0:
+        return None
+    return int(value)
+
+
+# Expanded IN lists ("IN (?, ?, ?)") differ only in arity; fold them to one shape
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)")
+
+
+class QueryStats:
+    """Statements issued and time spent in the database during one request."""
+    __slots__ = ("count", "total_time", "statements", "scope")
+
+    def __init__(self, scope: Optional[Mapping[str, Any]] = None) -> None:
+        self.count = 0
+        self.total_time = 0.0
+        # The request's ASGI scope (route, method, request id) for slow-query records
+        self.scope = scope
+        # Executions per SQL string; bind parameters keep the text stable across values
+        self.statements: dict[str, int] = {}
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed more than ``threshold`` times (N+1 candidates), most frequent first."""
+        shapes: dict[str, int] = {}
+        for statement, n in self.statements.items():
+            shape = _IN_LIST.sub("(...)", statement)
+            shapes[shape] = shapes.get(shape, 0) + n
+        return sorted(((s, n) for s, n in shapes.items() if n > threshold), key=lambda item: -item[1])
+
+
+# Set by RequestLoggingMiddleware; sync routes run in a threadpool that copies the
+# context, and async sessions run statements in greenlets that share the task's
+# context, so either way they mutate the same QueryStats object.
+request_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_start_time", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = request_query_stats.get()
+    threshold_ms = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold_ms > 0 and elapsed * 1000 >= threshold_ms:
+        slow_queries.capture(conn, statement, parameters, executemany, elapsed, stats.scope if stats else None)
+    if stats is None:
+        return
+    stats.count += 1
+    stats.total_time += elapsed
+    stats.statements[statement] = stats.statements.get(statement, 0) + 1
@@ -0,0 +1,125 @@
+"""
+Password hashing off the request threads.
+
+pbkdf2_sha256 is pure CPU work that holds the GIL, so running it inline in
+/auth/login and /auth/register stalls every other request served by the same
+process. ``PasswordHasher`` runs it in a small process pool instead:
+
+- at most ``PASSWORD_HASH_MAX_PENDING`` hashes are queued or running; beyond
+  that callers get ``HashingUnavailable`` straight away instead of piling up
+  behind the pool;
+- each caller waits at most ``PASSWORD_HASH_TIMEOUT_SECONDS`` for its result.
+
+``PASSWORD_HASH_WORKERS=0`` hashes inline (useful for scripts and debugging).
+"""
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional
+
+from passlib.context import CryptContext
+
+from .config import settings
+from .metrics import Counter, Gauge, registry
+
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__rounds=settings.PASSWORD_HASH_ROUNDS,
+)
+
+HASH_REJECTIONS = registry.register(
+    Counter("password_hash_rejections_total", "Password hashes refused (pool busy) or abandoned (timeout).", ("reason",))
+)
+
+
+class HashingUnavailable(Exception):
+    """The hashing pool is saturated or did not answer within the timeout."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"password hashing unavailable ({reason})")
+        self.reason = reason
+
+
+# Module-level so they can be pickled into the worker processes
+def _hash(password: str) -> str:
+    return str(pwd_context.hash(password))
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return bool(pwd_context.verify(password, hashed))
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int, timeout_seconds: float):
+        self.workers = workers
+        self.timeout_seconds = timeout_seconds
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: the parent runs threads (log writer, DB pool), which fork does not copy safely
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _release(self, _future: Optional[Future] = None) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            HASH_REJECTIONS.inc("busy")
+            raise HashingUnavailable("busy")
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        # The slot is freed when the worker finishes, not when the caller gives up,
+        # so abandoned hashes still count against the bound
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            future.cancel()
+            HASH_REJECTIONS.inc("timeout")
+            raise HashingUnavailable("timeout") from None
+
+    def hash(self, password: str) -> str:
+        return str(self._run(_hash, password))
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return bool(self._run(_verify, password, hashed))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout_seconds=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
+
+registry.register(Gauge("password_hash_pending", "Password hashes queued or running in the pool.", lambda: password_hasher.pending))
@@ -0,0 +1,152 @@
+"""
+Normalized event locations.
+
+``Event.location_key`` holds the case-folded, whitespace-collapsed location. It is
+set by a validator on every ORM write, including the importer, and indexed, so
+exact and prefix filters are index lookups instead of an ``ILIKE '%...%'`` scan.
+
+``location_index`` backs ``GET /locations`` autocomplete: a sorted list of keys,
+searched with bisect, plus the spellings seen for each key. It is loaded once from
+the database. After that, committed ORM writes in this process are applied as
+deltas (``track_location_changes``). A full reload every
+``LOCATION_INDEX_REFRESH_SECONDS`` picks up writes from other processes, such as
+the CLI importer.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Any, Optional
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from .config import settings
+
+_MAX_CHAR = 0x10FFFF
+
+
+def normalize_location(value: Optional[str]) -> str:
+    """Case-folded with runs of whitespace collapsed: ``"  Leeds   Town Hall"`` -> ``"leeds town hall"``."""
+    return " ".join((value or "").split()).casefold()
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Smallest string sorting after every string that starts with ``prefix``, so a prefix
+    match is the index range ``prefix <= key < bound``. None if there is no upper bound.
+    Only valid under code-point ordering, hence ``Event.location_key``'s "C" collation on Postgres.
+    """
+    stripped = prefix.rstrip(chr(_MAX_CHAR))
+    if not stripped:
+        return None
+    return stripped[:-1] + chr(ord(stripped[-1]) + 1)
+
+
+class LocationIndex:
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._keys: list[str] = []  # sorted
+        self._spellings: dict[str, Counter[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self, db: Session, entity: Any) -> None:
+        """Rebuild from the database (one GROUP BY over the location columns)."""
+        rows = db.execute(
+            select(entity.location_key, entity.location, func.count())
+            .where(entity.location_key.is_not(None))
+            .group_by(entity.location_key, entity.location)
+        ).all()
+        spellings: dict[str, Counter[str]] = {}
+        for key, location, count in rows:
+            spellings.setdefault(key, Counter())[location] += count
+        with self._lock:
+            self._spellings = spellings
+            self._keys = sorted(spellings)
+            self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self, db: Session, entity: Any) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= self.refresh_seconds:
+            self.load(db, entity)
+
+    def apply(self, deltas: list[tuple[str, str, int]]) -> None:
+        """Apply committed (key, spelling, +1/-1) changes; a no-op until the index is loaded."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            for key, location, change in deltas:
+                spellings = self._spellings.get(key)
+                if spellings is None:
+                    if change < 0:
+                        continue
+                    spellings = self._spellings[key] = Counter()
+                    insort(self._keys, key)
+                spellings[location] += change
+                if spellings[location] <= 0:
+                    del spellings[location]
+                if not spellings:
+                    del self._spellings[key]
+                    self._keys.pop(bisect_left(self._keys, key))
+
+    def search(self, prefix: str, limit: int) -> list[dict[str, Any]]:
+        """Up to ``limit`` locations whose key starts with ``prefix``, in key order."""
+        results: list[dict[str, Any]] = []
+        with self._lock:
+            for i in range(bisect_left(self._keys, prefix), len(self._keys)):
+                key = self._keys[i]
+                if not key.startswith(prefix) or len(results) >= limit:
+                    break
+                spellings = self._spellings[key]
+                results.append({
+                    "location": spellings.most_common(1)[0][0],
+                    "key": key,
+                    "count": sum(spellings.values()),
+                })
+        return results
+
+    def clear(self) -> None:
+        """Drop the contents; the next lookup reloads from the database."""
+        with self._lock:
+            self._keys = []
+            self._spellings = {}
+            self._loaded_at = None
+
+
+location_index = LocationIndex(settings.LOCATION_INDEX_REFRESH_SECONDS)
+
+_DELTAS = "location_index_deltas"
+
+
+def track_location_changes(entity: Any) -> None:
+    """Feed committed inserts, location edits and deletes of ``entity`` to ``location_index``."""
+
+    @event.listens_for(Session, "after_flush")
+    def _collect(session, flush_context):
+        deltas = session.info.setdefault(_DELTAS, [])
+        for obj in session.new:
+            if isinstance(obj, entity) and obj.location is not None:
+                deltas.append((normalize_location(obj.location), obj.location, 1))
+        for obj in session.dirty:
+            if isinstance(obj, entity):
+                history = inspect(obj).attrs.location.history
+                deltas += [(normalize_location(old), old, -1) for old in history.deleted if old is not None]
+                deltas += [(normalize_location(new), new, 1) for new in history.added if new is not None]
+        for obj in session.deleted:
+            # Only an already-loaded value: the row is gone, so it cannot be loaded now
+            location = inspect(obj).dict.get("location") if isinstance(obj, entity) else None
+            if location is not None:
+                deltas.append((normalize_location(location), location, -1))
+
+    @event.listens_for(Session, "after_commit")
+    def _apply(session):
+        deltas = session.info.pop(_DELTAS, None)
+        if deltas:
+            location_index.apply(deltas)
+
+    @event.listens_for(Session, "after_rollback")
+    def _discard(session):
+        session.info.pop(_DELTAS, None)
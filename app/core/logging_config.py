@@ -0,0 +1,176 @@
+"""
+Queue-backed logging pipeline.
+
+Request handlers only build a LogRecord and ``put_nowait`` it on a bounded
+queue; a background thread formats and writes records in batches. When the
+queue is full the record is dropped and counted, so logging can never
+backpressure request handling.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import IO, Optional
+
+from .config import settings
+from .metrics import Gauge, registry
+
+ACCESS_LOGGER_NAME = "app.access"
+
+
+class DroppingQueueHandler(logging.Handler):
+    """Enqueue records without blocking; count the ones that do not fit."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__()
+        self.queue = log_queue
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Formatting is deferred to the writer thread; only freeze exception text here
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; access records carry their fields in ``record.access``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, object] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        access = getattr(record, "access", None)
+        if access is not None:
+            payload.update(access)
+        else:
+            payload["message"] = record.getMessage()
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines; access records keep the historical ReqID= layout."""
+
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        access = getattr(record, "access", None)
+        if access is not None:
+            record.message = (
+                f"ReqID={access['request_id']} {access['method']} {access['path']} - "
+                f"{access['status']} - {access['duration_ms'] / 1000:.4f}s "
+                f"db={access['db_time_ms']:.1f}ms bytes={access['bytes_out']}"
+            )
+        return super().formatMessage(record)
+
+
+class BatchWriter(threading.Thread):
+    """Drain the queue in batches and write each batch with a single write/flush."""
+
+    def __init__(
+        self,
+        log_queue: "queue.Queue[logging.LogRecord]",
+        formatter: logging.Formatter,
+        stream: IO[str],
+        handler: DroppingQueueHandler,
+        batch_size: int,
+    ):
+        super().__init__(name="log-writer", daemon=True)
+        self.queue = log_queue
+        self.formatter = formatter
+        self.stream = stream
+        self.handler = handler
+        self.batch_size = batch_size
+        self._reported_drops = 0
+        self._stopping = threading.Event()
+
+    def run(self) -> None:
+        while not (self._stopping.is_set() and self.queue.empty()):
+            try:
+                batch = [self.queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: list[logging.LogRecord]) -> None:
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:  # nosec B112 - a bad record must not kill the writer
+                continue
+        dropped = self.handler.dropped
+        if dropped > self._reported_drops:
+            lines.append(f"log pipeline dropped {dropped - self._reported_drops} records (queue full)")
+            self._reported_drops = dropped
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:  # nosec B110 - nowhere left to report a failed log write
+            pass
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self.join(timeout=5)
+
+
+_writer: Optional[BatchWriter] = None
+_handler: Optional[DroppingQueueHandler] = None
+
+
+def setup_logging(stream: Optional[IO[str]] = None) -> None:
+    """Route the root logger through the queue and start the writer thread."""
+    global _writer, _handler
+    if _writer is not None:
+        return
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _handler = DroppingQueueHandler(log_queue)
+    formatter: logging.Formatter = JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter()
+    _writer = BatchWriter(log_queue, formatter, stream or sys.stderr, _handler, settings.LOG_BATCH_SIZE)
+    _writer.start()
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and restore a plain stderr handler."""
+    global _writer, _handler
+    if _writer is None:
+        return
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+    _writer.stop()
+    _writer = None
+    _handler = None
+    root.addHandler(logging.StreamHandler())
+
+
+def dropped_records() -> int:
+    return _handler.dropped if _handler is not None else 0
+
+
+registry.register(Gauge("log_records_dropped", "Log records dropped because the queue was full.", dropped_records))
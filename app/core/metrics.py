@@ -0,0 +1,190 @@
+"""
+Minimal Prometheus-style metrics registry rendered by ``GET /metrics``.
+
+Request metrics are updated from RequestLoggingMiddleware, which runs on the
+event loop thread, so the hot path is a dict lookup plus integer/float
+increments into preallocated bucket arrays. A lock is only taken the first
+time a label set is seen.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+# Request latencies in seconds (upper bounds; +Inf is implicit)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        for key, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labels, key)} {value:g}"
+
+
+class Gauge:
+    """A settable gauge, or a callback sampled at scrape time."""
+
+    def __init__(self, name: str, help_text: str, callback: Callable[[], float] | None = None):
+        self.name = name
+        self.help_text = help_text
+        self.callback = callback
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._value -= amount
+
+    def value(self) -> float:
+        return float(self.callback()) if self.callback is not None else self._value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} gauge"
+        yield f"{self.name} {self.value():g}"
+
+
+class _HistogramChild:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, n_buckets: int):
+        # Non-cumulative; the final slot counts observations above the last bound
+        self.counts = [0] * (n_buckets + 1)
+        self.sum = 0.0
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._children: dict[tuple[str, ...], _HistogramChild] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        child = self._children.get(label_values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(label_values, _HistogramChild(len(self.buckets)))
+        child.counts[bisect_left(self.buckets, value)] += 1
+        child.sum += value
+
+    def count(self, *label_values: str) -> int:
+        child = self._children.get(label_values)
+        return sum(child.counts) if child else 0
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for key, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, child.counts):
+                cumulative += count
+                le = 'le="%g"' % bound
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+            cumulative += child.counts[-1]
+            le = 'le="+Inf"'
+            yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {child.sum:g}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUESTS_TOTAL = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template, method and status.",
+    ("route", "method", "status"),
+))
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template, method and status.",
+    ("route", "method", "status"),
+))
+REQUEST_DB_TIME = registry.register(Histogram(
+    "http_request_db_seconds", "Time spent in database statements per request.",
+    ("route", "method"),
+))
+IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "Requests currently being handled."))
+REPEATED_STATEMENTS = registry.register(Counter(
+    "db_repeated_statement_requests_total",
+    "Requests in which one statement shape ran more than N_PLUS_ONE_THRESHOLD times (likely N+1).",
+    ("route",),
+))
+
+RATE_LIMIT_REJECTIONS = registry.register(Counter(
+    "rate_limit_rejections_total", "Requests rejected with 429 by limiter.", ("limiter",),
+))
+RATE_LIMIT_ERRORS = registry.register(Counter(
+    "rate_limit_errors_total", "Limiter backend failures; the request was let through.", ("limiter",),
+))
+
+
+class PoolCollector:
+    """SQLAlchemy QueuePool occupancy per engine, sampled at scrape time."""
+
+    STATS = (
+        ("db_pool_size", "size", "Configured connection pool size."),
+        ("db_pool_checked_out", "checkedout", "Connections currently checked out."),
+        ("db_pool_overflow", "overflow", "Connections opened beyond pool_size."),
+    )
+
+    def __init__(self) -> None:
+        self._engines: dict[str, object] = {}
+
+    def add(self, name: str, engine) -> None:
+        self._engines[name] = engine
+
+    def render(self) -> Iterable[str]:
+        for metric, method, help_text in self.STATS:
+            yield f"# HELP {metric} {help_text}"
+            yield f"# TYPE {metric} gauge"
+            for name, engine in self._engines.items():
+                # StaticPool / SingletonThreadPool (e.g. in-memory SQLite) have no such stats
+                stat = getattr(getattr(engine, "pool", None), method, None)
+                value = float(stat()) if callable(stat) else 0.0
+                yield f'{metric}{{engine="{_escape(name)}"}} {value:g}'
+
+
+DB_POOLS = registry.register(PoolCollector())
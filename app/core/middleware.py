@@ -1,100 +1,336 @@
 import hashlib
 import logging
+import random
 import time
 import uuid
+from urllib.parse import parse_qsl
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .auth import token_principal
+from .compression import compressing_send, strip_encoding_suffix
 from .config import settings
-from .rate_limit import auth_limiter, global_limiter
+from .db import QueryStats, request_query_stats
+from .logging_config import ACCESS_LOGGER_NAME
+from .metrics import (
+    IN_FLIGHT,
+    RATE_LIMIT_ERRORS,
+    RATE_LIMIT_REJECTIONS,
+    REPEATED_STATEMENTS,
+    REQUEST_DB_TIME,
+    REQUEST_LATENCY,
+    REQUESTS_TOTAL,
+)
+from .rate_limit import RateLimiter, auth_limiter, global_limiter, quotas
+from .versioning import versioned_etag
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # 1. Generate Request ID
+# Route label for requests answered before routing (429s, data-version 304s) or with no match
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Streamed responses: hashing the body for an ETag would buffer all of it
+UNHASHED_PATHS = frozenset({"/events/export"})
+
+# Raw path -> route template, insertion-ordered so the oldest entry is dropped first
+_ROUTE_TEMPLATE_CACHE_SIZE = 4096
+_route_template_cache: dict[str, str | None] = {}
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True if an If-None-Match header value matches the given ETag."""
+    if not if_none_match:
+        return False
+    # Per-encoding ETags ("<etag>-gzip") validate the identity representation too
+    candidates = [strip_encoding_suffix(c.strip()) for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+async def _rate_limit_allows(
+    name: str, limiter: RateLimiter, request_id: str, caller: str, path_key: str, limit: int | None = None
+) -> bool:
+    """Fail open: a backend error (e.g. SQLite "database is locked") is logged and counted, not a 500."""
+    try:
+        return await limiter.is_allowed_async(caller, path_key, limit)
+    except Exception as exc:
+        RATE_LIMIT_ERRORS.inc(name)
+        logger.warning(f"ReqID={request_id} Rate limiter '{name}' failed, allowing request: {exc}")
+        return True
+
+
+def _route_template(scope: Scope) -> str | None:
+    """Match the request against the app's routes ahead of routing; None if nothing matches."""
+    app = scope.get("app")
+    path = scope["path"]
+    cache = _route_template_cache
+    if path in cache:
+        return cache[path]
+    template = None
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            template = getattr(route, "path", None)
+            break
+    if len(cache) >= _ROUTE_TEMPLATE_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[path] = template
+    return template
+
+
+def _add_security_headers(headers: MutableHeaders, request_id: str) -> None:
+    headers["X-Request-ID"] = request_id
+    headers["X-Content-Type-Options"] = "nosniff"
+    headers["X-Frame-Options"] = "DENY"
+    # Extra Security Headers
+    headers["Referrer-Policy"] = "no-referrer"
+    headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+    headers["Cross-Origin-Resource-Policy"] = "same-site"
+
+    # Default to no-store for everything (Secure by default)
+    # Only if not already set (e.g. by ETag logic)
+    if "Cache-Control" not in headers:
+        headers["Cache-Control"] = "no-store"
+
+
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task/stream per request) providing
+    request IDs, security headers, rate limiting, ETags, compression and the access log.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # 1. Generate Request ID (exposed to handlers as request.state.request_id)
         request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
 
         start_time = time.time()
+        method: str = scope["method"]
+        path: str = scope["path"]
+        request_headers = Headers(scope=scope)
+        status_code = 500
+        response_started = False
+        bytes_out = 0
+        query_stats = QueryStats(scope)
+        stats_token = request_query_stats.set(query_stats)
+        IN_FLIGHT.inc()
+
+        # Ensure headers are always applied, whatever produced the response
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code, response_started, bytes_out
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                _add_security_headers(headers, request_id)
+                if settings.DB_STATS_HEADERS:
+                    # Statements issued before the response started (i.e. all of them
+                    # unless the body is streamed from the database)
+                    headers["X-DB-Queries"] = str(query_stats.count)
+                    headers["X-DB-Time"] = f"{query_stats.total_time * 1000:.2f}"
+            elif message["type"] == "http.response.body":
+                bytes_out += len(message.get("body", b""))
+            await send(message)
+
+        def log_access(route_hint: str | None = None) -> None:
+            IN_FLIGHT.dec()
+            request_query_stats.reset(stats_token)
+            self._log(scope, request_id, status_code, start_time, query_stats, bytes_out, route_hint)
 
-        # Helper to ensure headers are always applied
-        def add_headers(resp: Response) -> Response:
-            resp.headers["X-Request-ID"] = request_id
-            resp.headers["X-Content-Type-Options"] = "nosniff"
-            resp.headers["X-Frame-Options"] = "DENY"
-            # Extra Security Headers
-            resp.headers["Referrer-Policy"] = "no-referrer"
-            resp.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-            resp.headers["Cross-Origin-Resource-Policy"] = "same-site"
-
-            # Default to no-store for everything (Secure by default)
-            # Only if not already set (e.g. by ETag logic)
-            if "Cache-Control" not in resp.headers:
-                resp.headers["Cache-Control"] = "no-store"
-            return resp
+        # Compression sits between the ETag logic and the security headers
+        out_send = compressing_send(send_with_headers, request_headers)
 
         # 2. Rate Limiting (Early Return)
         if settings.RATE_LIMIT_ENABLED:
-            client_ip = request.client.host if request.client else "unknown"
-            path = request.url.path
+            client = scope.get("client")
+            client_ip = client[0] if client else "unknown"
 
-            limiter = auth_limiter if path.startswith("/auth/login") else global_limiter
+            is_auth = path.startswith("/auth/login")
+            if is_auth:
+                allowed = await _rate_limit_allows("auth", auth_limiter, request_id, client_ip, path)
+            else:
+                # Key on the route template (not /events/123) and, when a valid
+                # token is presented, on its subject rather than the IP
+                template = _route_template(scope) or UNMATCHED_ROUTE
+                principal = token_principal(request_headers.get("authorization"))
+                if principal is None:
+                    caller, role = f"ip:{client_ip}", "anonymous"
+                else:
+                    caller, role = f"user:{principal[0]}", principal[1]
+                allowed = await _rate_limit_allows(
+                    "global", global_limiter, request_id, caller, template, quotas.limit_for(template, role)
+                )
 
-            if not limiter.is_allowed(client_ip, path):
-                return add_headers(JSONResponse(
+            if not allowed:
+                RATE_LIMIT_REJECTIONS.inc("auth" if is_auth else "global")
+                response: Response = JSONResponse(
                     status_code=429,
                     content={"detail": "Too Many Requests", "request_id": request_id}
-                ))
+                )
+                await response(scope, receive, send_with_headers)
+                log_access()
+                return
+
+        # 3. Data-version ETag for the events list: computed from the in-process
+        # version counter *before* the handler runs, so a matching revalidation
+        # is answered without any SQL or serialization.
+        version_etag = None
+        if method == "GET" and path == "/events":
+            query_items = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+            version_etag = versioned_etag("events", path, query_items)
+            if _etag_matches(request_headers.get("If-None-Match"), version_etag):
+                response = Response(status_code=304, headers={"ETag": version_etag, "Cache-Control": "no-cache"})
+                await response(scope, receive, out_send)
+                log_access(route_hint=path)
+                return
+
+        # 4. ETag & Conditional GET (Outstanding Feature)
+        # Apply to successful GET requests on /events endpoints only
+        app_send: Send = out_send
+        if version_etag is not None:
+            etag_value = version_etag
+
+            async def send_version_etag(message: Message) -> None:
+                if message["type"] == "http.response.start" and message["status"] == 200:
+                    headers = MutableHeaders(scope=message)
+                    headers["ETag"] = etag_value
+                    headers["Cache-Control"] = "no-cache"
+                await out_send(message)
+
+            app_send = send_version_etag
+        elif method == "GET" and path.startswith("/events") and path not in UNHASHED_PATHS:
+            app_send = self._hashing_send(scope, receive, out_send, request_headers.get("If-None-Match"))
 
-        # 3. Process Request
+        # 5. Process Request
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, app_send)
         except Exception as exc:
             # Catch-all for unhandled exceptions (500s)
             logger.error(f"ReqID={request_id} Unhandled Exception: {exc}", exc_info=True)
-            return add_headers(JSONResponse(
+            if response_started:
+                log_access()
+                raise
+            response = JSONResponse(
                 status_code=500,
                 content={"detail": "Internal Server Error", "request_id": request_id},
-            ))
+            )
+            await response(scope, receive, send_with_headers)
 
-        # 4. ETag & Conditional GET (Outstanding Feature)
-        # Apply to successful GET requests on /events endpoints only
-        if request.method == "GET" and response.status_code == 200 and request.url.path.startswith("/events"):
-            # We need to capture the body to hash it.
-            # CAUTION: Consuming the iterator.
-            response_body = b""
-            async for chunk in response.body_iterator:
-                response_body += chunk
+        # 6. Logging
+        log_access()
+
+    @staticmethod
+    def _hashing_send(scope: Scope, receive: Receive, send: Send, if_none_match: str | None) -> Send:
+        """
+        Wrap ``send`` so a 200 body is fed chunk by chunk into an incremental SHA-256.
+        The ETag header has to go out before the body, so chunks are held in a
+        list (no copies) until the digest is known, then released one by one.
+        """
+        hasher = hashlib.sha256()
+        start_message: Message | None = None
+        chunks: list[bytes] = []
 
-            # Canonical JSON hashing (if it looks like JSON)
-            # But simple SHA256 of bytes is robust enough for binary text too.
-            etag = f'"{hashlib.sha256(response_body).hexdigest()}"'
+        async def hashing_send(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send(message)
+                    return
+                start_message = message
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
 
+            body = message.get("body", b"")
+            hasher.update(body)
+            chunks.append(body)
+            if message.get("more_body", False):
+                return
+
+            etag = f'"{hasher.hexdigest()}"'
             # Check If-None-Match
-            if request.headers.get("If-None-Match") == etag:
-                response = Response(status_code=304) # No body for 304
-                response.headers["ETag"] = etag
-                response.headers["Cache-Control"] = "no-cache" # Allow caching but validate
-            else:
-                # Reconstruct response with body
-                response = Response(
-                    content=response_body,
-                    status_code=200,
-                    headers=dict(response.headers),
-                    media_type=response.media_type
-                )
-                response.headers["ETag"] = etag
-                response.headers["Cache-Control"] = "no-cache" # Allow caching but validate
+            if _etag_matches(if_none_match, etag):
+                chunks.clear()
+                # No body for 304
+                response = Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+                await response(scope, receive, send)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            headers["ETag"] = etag
+            headers["Cache-Control"] = "no-cache" # Allow caching but validate
+            await send(start_message)
+            chunks.reverse()
+            while chunks:
+                chunk = chunks.pop()
+                await send({"type": "http.response.body", "body": chunk, "more_body": bool(chunks)})
+
+        return hashing_send
+
+    @staticmethod
+    def _log(
+        scope: Scope,
+        request_id: str,
+        status_code: int,
+        start_time: float,
+        query_stats: QueryStats,
+        bytes_out: int,
+        route_hint: str | None = None,
+    ) -> None:
+        """Record request metrics and emit one structured access record (2xx responses are sampled)."""
+        duration = time.time() - start_time
+        # Label by route template, never the raw path, to keep series bounded
+        route_template = getattr(scope.get("route"), "path", None) or route_hint
+        route_label = route_template or UNMATCHED_ROUTE
+        status_label = str(status_code)
+        REQUESTS_TOTAL.inc(route_label, scope["method"], status_label)
+        REQUEST_LATENCY.observe(duration, route_label, scope["method"], status_label)
+        REQUEST_DB_TIME.observe(query_stats.total_time, route_label, scope["method"])
 
-        # 5. Logging
-        process_time = time.time() - start_time
-        logger.info(f"ReqID={request_id} {request.method} {request.url.path} - {response.status_code} - {process_time:.4f}s")
+        threshold = settings.N_PLUS_ONE_THRESHOLD
+        if threshold > 0 and query_stats.count > threshold:
+            repeated = query_stats.repeated(threshold)
+            if repeated:
+                REPEATED_STATEMENTS.inc(route_label)
+                if settings.ENVIRONMENT != "prod":
+                    shape, times = repeated[0]
+                    logger.warning(
+                        f"ReqID={request_id} Possible N+1 in {scope['method']} {route_label}: "
+                        f"statement ran {times} times ({query_stats.count} total): {shape[:200]}"
+                    )
 
-        return add_headers(response)
+        if 200 <= status_code < 300 and settings.ACCESS_LOG_SAMPLE_RATE < 1.0:
+            if random.random() >= settings.ACCESS_LOG_SAMPLE_RATE:  # nosec B311 - sampling, not security
+                return
+        client = scope.get("client")
+        access_logger.info(
+            "access",
+            extra={"access": {
+                "request_id": request_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_template,
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 3),
+                "db_time_ms": round(query_stats.total_time * 1000, 3),
+                "db_queries": query_stats.count,
+                "bytes_out": bytes_out,
+                "client": client[0] if client else None,
+            }},
+        )
 
 from .exceptions import AuthException, DuplicateException, NotFoundException  # noqa: E402
 
@@ -104,11 +340,9 @@ async def global_exception_handler(request: Request, exc: Exception):
     request_id = getattr(request.state, "request_id", "unknown")
 
     # For these custom exceptions, we return simple JSON.
-    # The middleware validly wraps these if they bubble up, BUT exception handlers
-    # in FastAPI run inside the middleware stack usually.
-    # However, BaseHTTPMiddleware wraps the application.
-    # Exceptions handled by FastAPI's exception_handler are returned as responses *to* the middleware.
-    # So add_headers WILL apply to these.
+    # RequestLoggingMiddleware catches unhandled exceptions (and adds the
+    # security headers) before they reach this outermost handler, so this
+    # mainly acts as a fallback if the middleware is not installed.
 
     if isinstance(exc, NotFoundException):
         return JSONResponse(status_code=404, content={"detail": f"{exc.name} not found"})
@@ -0,0 +1,48 @@
+"""
+Opaque keyset cursors for list endpoints.
+
+A cursor is the sort key and id of the last row on a page, so the next page is
+``WHERE (sort_key, id) > (:value, :id)`` on an index instead of an OFFSET that
+has to walk every earlier row. It also carries the sort it was issued for; a
+cursor replayed against a different ``sort`` is rejected rather than silently
+returning the wrong page.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+
+class InvalidCursor(ValueError):
+    """The cursor is malformed or was issued for a different sort."""
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, value_type: type) -> tuple[Any, int]:
+    """(sort value, id) for ``cursor``, which must have been issued for ``sort``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, row_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor("malformed cursor") from None
+    if cursor_sort != sort:
+        raise InvalidCursor("cursor was issued for a different sort")
+    if not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise InvalidCursor("malformed cursor")
+    try:
+        if value_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, value_type) or isinstance(value, bool):
+            raise TypeError
+    except (TypeError, ValueError):
+        raise InvalidCursor("malformed cursor") from None
+    return value, row_id
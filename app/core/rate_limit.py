@@ -1,30 +1,273 @@
+"""
+Sliding-window-counter rate limiting with pluggable state backends.
+
+Each key keeps only the request counts for the current and previous fixed
+window; the previous window is weighted by how much of it still overlaps the
+sliding window. ``InMemoryBackend`` (the default) keeps that state per process;
+``SQLiteBackend`` keeps it in a shared WAL-mode SQLite file so every worker on
+a host enforces one combined budget. Blocking backends are called off the event
+loop (``RateLimiter.is_allowed_async``).
+"""
 import logging
+import os
+import sqlite3
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+import anyio
+
+from .config import settings
 
 logger = logging.getLogger(__name__)
 
+
+class RateLimitBackend(Protocol):
+    # Whether hit() can block on I/O, so the async path runs it in a worker thread
+    blocking: bool
+
+    def hit(self, key: str, limit: int, window_size: int, now: float) -> bool:
+        """Count one request for ``key`` if it fits within ``limit``; return whether it did."""
+        ...
+
+    def reset(self) -> None:
+        ...
+
+
+class InMemoryBackend:
+    """
+    Per-process state with O(1) time and memory per key.
+
+    Idle keys are evicted incrementally on each call and the number of tracked
+    keys is capped (least recently seen evicted first).
+    """
+
+    # Idle keys examined per call; keeps eviction amortized O(1)
+    EVICT_PER_CALL = 2
+    blocking = False
+
+    def __init__(self, max_keys: int = settings.RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        # Structure: { "ip:path_key": [window_start, previous_count, current_count] },
+        # ordered least recently seen first
+        self.history: OrderedDict[str, list[float]] = OrderedDict()
+
+    def hit(self, key: str, limit: int, window_size: int, now: float) -> bool:
+        window_start = now - (now % window_size)
+
+        self._evict_idle(now, window_size)
+
+        entry = self.history.get(key)
+        if entry is None:
+            entry = [window_start, 0, 0]
+            self.history[key] = entry
+            if len(self.history) > self.max_keys:
+                self.history.popitem(last=False)
+        else:
+            self.history.move_to_end(key)
+            if entry[0] != window_start:
+                # Roll forward: the old current window becomes the previous one only if adjacent
+                entry[1] = entry[2] if window_start - entry[0] == window_size else 0
+                entry[2] = 0
+                entry[0] = window_start
+
+        overlap = 1.0 - (now - window_start) / window_size
+        if entry[1] * overlap + entry[2] >= limit:
+            return False
+
+        entry[2] += 1
+        return True
+
+    def _evict_idle(self, now: float, window_size: int) -> None:
+        """Drop keys whose current and previous windows have both expired."""
+        for _ in range(self.EVICT_PER_CALL):
+            if not self.history:
+                return
+            key, entry = next(iter(self.history.items()))
+            if now - entry[0] < 2 * window_size:
+                return
+            del self.history[key]
+
+    def reset(self) -> None:
+        self.history.clear()
+
+
+class SQLiteBackend:
+    """
+    Cross-process state in a WAL-mode SQLite file shared by all workers on a host.
+
+    Each hit is a single autocommit UPSERT ... RETURNING statement, so the
+    check-and-increment is atomic across processes without an explicit
+    transaction. Idle rows are purged every ``purge_every`` hits. A hit waits at
+    most ``busy_timeout`` seconds for another worker's write lock, then raises
+    ``sqlite3.OperationalError``.
+    """
+
+    blocking = True
+
+    # Roll the windows forward and count the request only if it fits; every
+    # expression sees the row's old values.
+    _HIT_SQL = """
+        INSERT INTO rate_limits (key, window_start, prev_count, curr_count, allowed)
+        VALUES (:key, :ws, 0, 1, 1)
+        ON CONFLICT(key) DO UPDATE SET
+            prev_count = CASE WHEN window_start = :ws THEN prev_count
+                              WHEN window_start = :ws - :size THEN curr_count ELSE 0 END,
+            curr_count = CASE WHEN window_start = :ws THEN curr_count ELSE 0 END
+                + (CASE WHEN (CASE WHEN window_start = :ws THEN prev_count
+                                   WHEN window_start = :ws - :size THEN curr_count ELSE 0 END) * :overlap
+                             + (CASE WHEN window_start = :ws THEN curr_count ELSE 0 END) < :lim
+                        THEN 1 ELSE 0 END),
+            allowed = CASE WHEN (CASE WHEN window_start = :ws THEN prev_count
+                                      WHEN window_start = :ws - :size THEN curr_count ELSE 0 END) * :overlap
+                                + (CASE WHEN window_start = :ws THEN curr_count ELSE 0 END) < :lim
+                           THEN 1 ELSE 0 END,
+            window_start = :ws
+        RETURNING allowed
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        purge_every: int = 1000,
+        busy_timeout: float = settings.RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS / 1000,
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.purge_every = purge_every
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._hits = 0
+        self._connect()  # create the schema eagerly so misconfiguration fails at startup
+
+    def _connect(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Counters are disposable; skip fsync on commit
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " key TEXT PRIMARY KEY, window_start REAL NOT NULL,"
+                " prev_count INTEGER NOT NULL, curr_count INTEGER NOT NULL, allowed INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limits_window_start ON rate_limits (window_start)")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, limit: int, window_size: int, now: float) -> bool:
+        conn = self._connect()
+        window_start = now - (now % window_size)
+        row = conn.execute(
+            self._HIT_SQL,
+            {
+                "key": f"{self.namespace}:{key}",
+                "ws": window_start,
+                "size": window_size,
+                "overlap": 1.0 - (now - window_start) / window_size,
+                "lim": limit,
+            },
+        ).fetchone()
+
+        self._hits += 1
+        if self._hits % self.purge_every == 0:
+            conn.execute("DELETE FROM rate_limits WHERE window_start < ?", (now - 2 * window_size,))
+        return bool(row[0])
+
+    def reset(self) -> None:
+        self._connect().execute("DELETE FROM rate_limits WHERE key LIKE ?", (f"{self.namespace}:%",))
+
+
+def make_backend(namespace: str) -> RateLimitBackend:
+    """Build the backend selected by ``RATE_LIMIT_BACKEND`` (``memory`` or ``sqlite``)."""
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBackend(settings.RATE_LIMIT_SQLITE_PATH, namespace)
+    return InMemoryBackend()
+
+
 class RateLimiter:
-    def __init__(self, requests_per_minute: int = 120):
+    def __init__(
+        self,
+        requests_per_minute: int = 120,
+        max_keys: Optional[int] = None,
+        backend: Optional[RateLimitBackend] = None,
+    ):
         self.requests_per_minute = requests_per_minute
         self.window_size = 60  # seconds
-        # Dictionary to store request timestamps per IP + path key
-        # Structure: { "ip:path_key": [timestamp1, timestamp2, ...] }
-        self.history: dict[str, list[float]] = defaultdict(list)
+        if backend is None:
+            backend = InMemoryBackend(max_keys) if max_keys is not None else InMemoryBackend()
+        self.backend = backend
 
-    def is_allowed(self, client_ip: str, path_key: str) -> bool:
-        now = time.time()
-        key = f"{client_ip}:{path_key}"
+    @property
+    def history(self) -> OrderedDict[str, list[float]]:
+        """Per-key state of the in-memory backend."""
+        if not isinstance(self.backend, InMemoryBackend):
+            raise AttributeError("history is only available with the in-memory backend")
+        return self.backend.history
 
-        # Clean up old timestamps
-        self.history[key] = [t for t in self.history[key] if now - t < self.window_size]
+    def is_allowed(self, client_ip: str, path_key: str, limit: Optional[int] = None) -> bool:
+        """``limit`` overrides ``requests_per_minute`` for this key (e.g. from a quota table)."""
+        budget = self.requests_per_minute if limit is None else limit
+        return self.backend.hit(f"{client_ip}:{path_key}", budget, self.window_size, time.time())
 
-        if len(self.history[key]) >= self.requests_per_minute:
-            return False
+    async def is_allowed_async(self, client_ip: str, path_key: str, limit: Optional[int] = None) -> bool:
+        """``is_allowed`` for the event loop: a blocking backend runs in a worker thread."""
+        if not self.backend.blocking:
+            return self.is_allowed(client_ip, path_key, limit)
+        return await anyio.to_thread.run_sync(self.is_allowed, client_ip, path_key, limit)
+
+    def reset(self) -> None:
+        self.backend.reset()
+
+def parse_quota_table(spec: str) -> dict[str, int]:
+    """Parse ``"name=limit,other=limit"`` into a dict, ignoring blank entries."""
+    table: dict[str, int] = {}
+    for item in spec.split(","):
+        name, sep, limit = item.strip().rpartition("=")
+        if sep and name.strip():
+            table[name.strip()] = int(limit)
+    return table
+
+
+class QuotaTable:
+    """
+    Per-minute budgets by route template and by role.
+
+    A route entry ending in ``*`` matches any template with that prefix; the
+    most specific (longest) route entry wins over the role budget. Lookups are
+    memoized per (template, role), which is a bounded set.
+    """
+
+    def __init__(self, route_spec: str, role_spec: str, default_limit: int):
+        routes = parse_quota_table(route_spec)
+        self.exact = {k: v for k, v in routes.items() if not k.endswith("*")}
+        self.prefixes = sorted(
+            ((k[:-1], v) for k, v in routes.items() if k.endswith("*")), key=lambda kv: -len(kv[0])
+        )
+        self.roles = parse_quota_table(role_spec)
+        self.default_limit = default_limit
+        self._resolved: dict[tuple[str, str], int] = {}
+
+    def limit_for(self, route_template: str, role: str) -> int:
+        key = (route_template, role)
+        limit = self._resolved.get(key)
+        if limit is None:
+            limit = self.exact.get(route_template)
+            if limit is None:
+                limit = next((v for prefix, v in self.prefixes if route_template.startswith(prefix)), None)
+            if limit is None:
+                limit = self.roles.get(role, self.default_limit)
+            self._resolved[key] = limit
+        return limit
 
-        self.history[key].append(now)
-        return True
 
 # Global limiters
-global_limiter = RateLimiter(requests_per_minute=120)
-auth_limiter = RateLimiter(requests_per_minute=10) # Stricter for login
+global_limiter = RateLimiter(requests_per_minute=120, backend=make_backend("global"))
+auth_limiter = RateLimiter(requests_per_minute=10, backend=make_backend("auth")) # Stricter for login
+
+quotas = QuotaTable(settings.RATE_LIMIT_ROUTE_QUOTAS, settings.RATE_LIMIT_ROLE_QUOTAS, global_limiter.requests_per_minute)
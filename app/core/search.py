@@ -0,0 +1,131 @@
+"""
+Full-text search over events (title, description, location) for ``list_events(q=...)``.
+
+- SQLite: an external-content FTS5 table, ``events_fts``, kept in sync with ``events``
+  by triggers, and ranked with bm25.
+- PostgreSQL: a generated ``search_vector`` tsvector column with a GIN index, ranked
+  with ts_rank.
+
+Both are maintained by the database itself, so API writes, the importer and
+cascading deletes all stay in sync. They are created with the events table
+(``attach_search_ddl``, for ``create_all``) and by the matching migration. A
+database without them (not migrated yet, or another dialect) falls back to the
+old ``title ILIKE '%q%'`` filter.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from sqlalchemy import DDL, ColumnElement, FromClause, Select, column, event, func, literal_column, table, text
+from sqlalchemy.engine import Connection, Engine
+
+# Column weights: a title hit outranks a location hit, which outranks the description
+TITLE_WEIGHT, DESCRIPTION_WEIGHT, LOCATION_WEIGHT = 10.0, 1.0, 5.0
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+    "title, description, location, content='events', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN "
+    "INSERT INTO events_fts(rowid, title, description, location) "
+    "VALUES (new.id, new.title, new.description, new.location); END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN "
+    "INSERT INTO events_fts(events_fts, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location); END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title, description, location ON events BEGIN "
+    "INSERT INTO events_fts(events_fts, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location); "
+    "INSERT INTO events_fts(rowid, title, description, location) "
+    "VALUES (new.id, new.title, new.description, new.location); END",
+]
+SQLITE_DROP_DDL = ["DROP TABLE IF EXISTS events_fts"]  # its triggers go with the events table
+
+POSTGRES_DDL = [
+    "ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'D')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING gin (search_vector)",
+]
+
+# Schema objects that live outside the ORM models (autogenerate must leave them alone)
+SEARCH_TABLE_PREFIX = "events_fts"
+SEARCH_COLUMNS = frozenset({"search_vector"})
+SEARCH_INDEXES = frozenset({"ix_events_search_vector"})
+
+_fts = table("events_fts", column("rowid"))
+_TOKEN = re.compile(r"\w+")
+
+
+def attach_search_ddl(events: FromClause) -> None:
+    """Create/drop the search index together with ``events`` in ``metadata.create_all``/``drop_all``."""
+    for statement in SQLITE_DDL:
+        event.listen(events, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in SQLITE_DROP_DDL:
+        event.listen(events, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in POSTGRES_DDL:
+        event.listen(events, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Alembic ``include_object`` hook that hides the search index from autogenerate."""
+    if type_ == "table" and name and name.startswith(SEARCH_TABLE_PREFIX):
+        return False
+    if type_ == "column" and name in SEARCH_COLUMNS:
+        return False
+    return not (type_ == "index" and name in SEARCH_INDEXES)
+
+
+# Per-database answer to "is the search index there?", checked once per process
+_backends: dict[str, Optional[str]] = {}
+
+
+def search_backend(bind: Engine | Connection) -> Optional[str]:
+    """
+    The dialect name if this database has the full-text index, otherwise None (use ILIKE).
+    Looked up once per database URL; pass the session's bind (``Session.get_bind()``),
+    not ``Session.connection()``, so later calls do not check out a connection.
+    """
+    url = bind.engine.url.render_as_string(hide_password=True)
+    if url not in _backends:
+        if isinstance(bind, Engine):
+            with bind.connect() as connection:
+                _backends[url] = _detect_search_backend(connection)
+        else:
+            _backends[url] = _detect_search_backend(bind)
+    return _backends[url]
+
+
+def _detect_search_backend(connection: Connection) -> Optional[str]:
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        found = connection.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'events_fts'")).scalar()
+    elif dialect == "postgresql":
+        found = connection.execute(
+            text("SELECT 1 FROM information_schema.columns WHERE table_name = 'events' AND column_name = 'search_vector'")
+        ).scalar()
+    else:
+        found = None
+    return dialect if found else None
+
+
+def search_terms(q: str) -> list[str]:
+    """Word tokens of a search string; punctuation and query syntax are dropped."""
+    return _TOKEN.findall(q)
+
+
+def apply_search(stmt: Select, backend: str, terms: list[str], id_column) -> tuple[Select, ColumnElement]:
+    """
+    Restrict ``stmt`` to rows matching every term (as a prefix) and return it with a
+    relevance expression where lower is better (bm25 is negative; ts_rank is negated).
+    """
+    if backend == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        fts: ColumnElement = literal_column("events_fts")
+        stmt = stmt.join(_fts, _fts.c.rowid == id_column).where(fts.op("MATCH")(match))
+        return stmt, func.bm25(fts, TITLE_WEIGHT, DESCRIPTION_WEIGHT, LOCATION_WEIGHT)
+    if backend == "postgresql":
+        vector: ColumnElement = literal_column("events.search_vector")
+        query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        return stmt.where(vector.op("@@")(query)), -func.ts_rank(vector, query)
+    raise ValueError(f"no full-text search for {backend!r}")
@@ -0,0 +1,113 @@
+"""
+Slow-query log: statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are kept in
+a bounded in-process ring buffer together with the route that issued them and
+the database's plan for them, so a slow ``/analytics/*`` or ``list_events``
+COUNT can be diagnosed from ``GET /admin/slow-queries`` without reproducing it.
+
+Bound parameter *values* are never stored (they may hold personal data), only
+their shape: positional types, or name -> type for named parameters.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Mapping, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prefix that asks each dialect for a plan without executing the statement
+EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN ", "mysql": "EXPLAIN "}
+_STATEMENT_CHARS = 4000
+
+
+def parameter_shape(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {str(k): type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(v).__name__ for v in parameters]
+    return type(parameters).__name__
+
+
+def explain(connection, dialect_name: str, statement: str, parameters: Any) -> list[str]:
+    """
+    Plan for ``statement`` on a raw DBAPI cursor of the same connection (so it
+    sees the same transaction, and SQLAlchemy's execute events do not fire again).
+    """
+    prefix = EXPLAIN_PREFIX.get(dialect_name)
+    if prefix is None:
+        raise ValueError(f"EXPLAIN not supported for {dialect_name}")
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        # SQLite: (id, parent, notused, detail); Postgres/MySQL: plan text last
+        return [str(row[-1]) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    def __init__(self, maxlen: int):
+        self._entries: deque[dict[str, Any]] = deque(maxlen=max(1, maxlen))
+        self._lock = threading.Lock()
+        self.captured = 0
+
+    def record(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries.append(entry)
+            self.captured += 1
+
+    def entries(self, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """Newest first."""
+        with self._lock:
+            items = list(reversed(self._entries))
+        return items[:limit] if limit is not None else items
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def capacity(self) -> int:
+        return self._entries.maxlen or 0
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_LOG_SIZE)
+
+
+def capture(
+    connection,
+    statement: str,
+    parameters: Any,
+    executemany: bool,
+    duration: float,
+    scope: Optional[Mapping[str, Any]] = None,
+) -> None:
+    """Record one slow statement (called from the after_cursor_execute hook)."""
+    route = getattr(scope.get("route"), "path", None) if scope else None
+    entry: dict[str, Any] = {
+        "captured_at": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round(duration * 1000, 3),
+        "statement": statement[:_STATEMENT_CHARS],
+        "parameters": parameter_shape(parameters),
+        "executemany": executemany,
+        "route": route,
+        "method": scope.get("method") if scope else None,
+        "request_id": scope.get("state", {}).get("request_id") if scope else None,
+        "plan": None,
+        "explain_error": None,
+    }
+    # Only plan reads: EXPLAIN of a write is not portable, and executemany has no single parameter set
+    is_read = statement.lstrip()[:6].upper().startswith(("SELECT", "WITH"))
+    if settings.SLOW_QUERY_EXPLAIN and is_read and not executemany:
+        try:
+            entry["plan"] = explain(connection, connection.dialect.name, statement, parameters)
+        except Exception as exc:  # the slow query already succeeded; never fail it here
+            entry["explain_error"] = str(exc)
+    slow_query_log.record(entry)
+    logger.warning(
+        f"Slow query ({entry['duration_ms']}ms) on {entry['method'] or '-'} {route or '-'}: {statement[:200]}"
+    )
@@ -0,0 +1,58 @@
+"""
+Monotonic in-process data versions for conditional GETs.
+
+Every write to a tracked table bumps its counter, so a validator derived from
+the counter can be checked without running any SQL. Counters live in process
+memory; ``ETAG_VERSION_WINDOW_SECONDS`` bounds how long a validator stays
+valid, which covers writes made by other processes (e.g. the CLI importer).
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import uuid
+from urllib.parse import urlencode
+
+from .config import settings
+
+
+class DataVersions:
+    def __init__(self, tables: tuple[str, ...]):
+        # Distinguishes counters across restarts, which start again from zero
+        self.boot_id = uuid.uuid4().hex
+        self._versions: dict[str, int] = {t: 0 for t in tables}
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+
+    def get(self, table: str) -> int:
+        return self._versions[table]
+
+
+data_versions = DataVersions(("events", "rsvps"))
+
+
+# Comma-separated set parameters: order and repeats within the value do not change the response
+SET_PARAMS = frozenset({"fields"})
+
+
+def _canonical_value(name: str, value: str) -> str:
+    if name in SET_PARAMS:
+        return ",".join(sorted({part.strip() for part in value.split(",") if part.strip()}))
+    return value
+
+
+def normalize_query(items: list[tuple[str, str]]) -> str:
+    """Canonical query string: parameters sorted by name then value, set parameters sorted within."""
+    return urlencode(sorted((name, _canonical_value(name, value)) for name, value in items))
+
+
+def versioned_etag(table: str, path: str, query_items: list[tuple[str, str]]) -> str:
+    """Build a strong ETag from the table version, the request and the current time window."""
+    window = int(time.time() // max(settings.ETAG_VERSION_WINDOW_SECONDS, 1))
+    raw = f"{data_versions.boot_id}:{data_versions.get(table)}:{window}:{path}?{normalize_query(query_items)}"
+    return f'"v-{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
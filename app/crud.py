@@ -1,43 +1,159 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, Iterator, List, Optional, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, Select, delete, func, select, tuple_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 
-from .models import RSVP, Attendee, Event, User
-from .schemas import AttendeeCreate, EventCreate, EventUpdate, RSVPCreate, UserCreate
+from .core.cache import named_cache
+from .core.config import settings
+from .core.db import estimate_row_count
+from .core.locations import normalize_location, prefix_upper_bound
+from .core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from .core.search import apply_search, search_backend, search_terms
+from .core.versioning import data_versions
+from .models import RSVP, Attendee, DataSource, Event, User
+from .schemas import AttendeeCreate, EventCreate, EventOut, EventUpdate, RSVPCreate, UserCreate, event_fields_model
+
+# Results of list_events keyed by (events data version, canonical filters).
+# A write bumps the version, so stale entries are never read again; clearing
+# on write just releases their memory early.
+list_events_cache = named_cache(
+    "list_events",
+    maxsize=settings.LIST_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LIST_CACHE_TTL_SECONDS,
+)
+# Exact totals per filter signature (same keying and invalidation), so paging
+# through one result set counts it once rather than once per page
+list_counts_cache = named_cache(
+    "list_event_counts",
+    maxsize=settings.LIST_COUNT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LIST_CACHE_TTL_SECONDS,
+)
+
+# ``total`` modes for list_events: an exact COUNT, table statistics, or no total at all
+TOTAL_MODES = ("exact", "estimated", "none")
+# Dialects where an exact total rides on the page query as COUNT(*) OVER (). SQLite
+# supports the window too, but materializes every matching row for it, which is
+# several times slower than the separate index-only COUNT it replaces.
+WINDOW_COUNT_DIALECTS = frozenset({"postgresql"})
+
+
+def mark_events_changed() -> None:
+    """Record a committed write to the events table (invalidates list ETags and cached pages)."""
+    data_versions.bump("events")
+    list_events_cache.clear()
+    list_counts_cache.clear()
+
+def mark_rsvps_changed() -> None:
+    """Record a committed write to the rsvps table."""
+    data_versions.bump("rsvps")
 
 
 def create_event(db: Session, data: EventCreate, user_id: Optional[int] = None) -> Event:
     obj = Event(**data.model_dump(), created_by_user_id=user_id)
     db.add(obj)
     db.commit()
+    mark_events_changed()
     db.refresh(obj)
     return obj
 
-def list_events(
-    db: Session,
-    q: Optional[str] = None,
-    location: Optional[str] = None,
-    start_after: Optional[datetime] = None,
-    start_before: Optional[datetime] = None,
-    limit: int = 10,
-    offset: int = 0,
-    sort: Optional[str] = None,
-    min_capacity: Optional[int] = None,
-    status: Optional[str] = None
-) -> dict:
+def _clean_text(value: Optional[str]) -> Optional[str]:
+    """Text filter with surrounding whitespace removed; blank becomes None."""
+    return (value or "").strip() or None
+
+def _list_events_filters(
+    q: Optional[str],
+    location: Optional[str],
+    start_after: Optional[datetime],
+    start_before: Optional[datetime],
+    min_capacity: Optional[int],
+    status: Optional[str],
+    location_match: str = "contains",
+) -> tuple:
     """
-    List events with optional filters (text, location, date, capacity, status) and sorting files.
+    Canonical filter signature (events data version first): blank/ignored filters collapse
+    to None. ``q`` and ``location`` must already be ``_clean_text``-ed, the same values the
+    statement filters on, so one key never stands for two different queries.
+    """
+    return (
+        data_versions.get("events"),
+        q,
+        (location, location_match) if location else None,
+        start_after.isoformat() if start_after else None,
+        start_before.isoformat() if start_before else None,
+        min_capacity or None,
+        status if status in ("upcoming", "past") else None,
+    )
+
+# Sortable event columns and the Python type of their values (for decoding cursors)
+EVENT_SORT_FIELDS = {"start_time": datetime, "end_time": datetime, "created_at": datetime, "title": str, "capacity": int}
+# ``location`` filter modes: substring of the raw text (ILIKE), or the normalized key
+LOCATION_MATCH_MODES = ("contains", "exact", "prefix")
+# Full-text rank (lower is better); the default order when ``q`` runs on the search index
+RELEVANCE = "relevance"
+
+def _event_sort(sort: Optional[str], ranked: bool = False) -> tuple[str, bool]:
+    """
+    (field, descending) for a ``sort`` parameter. Unknown fields fall back to relevance
+    for a ranked search and to start_time otherwise.
+    """
+    sort = sort or ""
+    desc = sort.startswith("-")
+    field_name = sort[1:] if desc else sort
+    if field_name in EVENT_SORT_FIELDS:
+        return field_name, desc
+    return (RELEVANCE, False) if ranked else ("start_time", False)
+
+def _sort_key(field_name: str, desc: bool) -> str:
+    return f"-{field_name}" if desc else field_name
+
+def _ranked(q: Optional[str], search: Optional[str]) -> bool:
+    return bool(q and search and search_terms(q))
+
+def _sort_column(stmt: Select, field_name: str):
+    return stmt.selected_columns[RELEVANCE] if field_name == RELEVANCE else getattr(Event, field_name)
+
+def _list_events_stmt(
+    q: Optional[str],
+    location: Optional[str],
+    start_after: Optional[datetime],
+    start_before: Optional[datetime],
+    min_capacity: Optional[int],
+    status: Optional[str],
+    sort: Optional[str],
+    search: Optional[str] = None,
+    location_match: str = "contains",
+    fields: Optional[tuple[str, ...]] = None,
+) -> Select:
+    """
+    Filtered and ordered (but unpaginated) events query shared by the sync and async paths.
+    ``search`` is the full-text backend from ``search_backend``; with it, ``q`` matches
+    title, description and location on the index and adds a ``relevance`` column.
+    ``location_match`` is one of LOCATION_MATCH_MODES. ``fields`` (from
+    ``parse_event_fields``) limits the loaded columns to those plus the sort key.
     """
     stmt = select(Event)
-    if q:
+    if _ranked(q, search):
+        stmt, rank = apply_search(stmt, search, search_terms(q), Event.id)  # type: ignore[arg-type]
+        stmt = stmt.add_columns(rank.label(RELEVANCE))
+    elif q:
         stmt = stmt.where(Event.title.ilike(f"%{q}%"))
-    if location:
+    if location and location_match == "contains":
         stmt = stmt.where(Event.location.ilike(f"%{location}%"))
+    elif location and normalize_location(location):
+        # Range/equality on the indexed normalized key
+        key = normalize_location(location)
+        if location_match == "exact":
+            stmt = stmt.where(Event.location_key == key)
+        else:
+            stmt = stmt.where(Event.location_key >= key)
+            upper = prefix_upper_bound(key)
+            if upper is not None:
+                stmt = stmt.where(Event.location_key < upper)
     if start_after:
         stmt = stmt.where(Event.start_time >= start_after)
     if start_before:
@@ -51,41 +167,260 @@ def list_events(
         elif status == "past":
             stmt = stmt.where(Event.start_time < now)
 
-    # Sorting
-    if sort:
-        desc = sort.startswith("-")
-        field_name = sort[1:] if desc else sort
-        # Allow sorting only by safe fields
-        if field_name in ["start_time", "end_time", "created_at", "title", "capacity"]:
-            field = getattr(Event, field_name)
-            stmt = stmt.order_by(field.desc() if desc else field.asc())
+    # Sorting; id breaks ties so the order is total and keyset cursors are exact
+    field_name, desc = _event_sort(sort, ranked=_ranked(q, search))
+    field = _sort_column(stmt, field_name)
+    if fields:
+        # The sort column is loaded even if not requested: next_cursor is read from it
+        columns = {name: getattr(Event, name) for name in (*fields, field_name) if name in EventOut.model_fields}
+        stmt = stmt.options(load_only(*columns.values()))
+    if desc:
+        return stmt.order_by(field.desc(), Event.id.desc())
+    return stmt.order_by(field.asc(), Event.id.asc())
+
+def _paginate(stmt: Select, order: tuple[str, bool], limit: int, offset: int, cursor: Optional[str]) -> Select:
+    """
+    One page of ``stmt`` (ordered by ``order``, from ``_event_sort``) plus one extra row,
+    which tells us whether there is a next page. A cursor seeks past the previous page's
+    last (sort value, id) on the index, so every page costs the same; offset still walks
+    and discards the earlier rows.
+    """
+    if cursor:
+        if offset:
+            raise InvalidCursor("cursor and offset cannot be combined")
+        field_name, desc = order
+        value_type = float if field_name == RELEVANCE else EVENT_SORT_FIELDS[field_name]
+        value, last_id = decode_cursor(cursor, _sort_key(field_name, desc), value_type)
+        key = tuple_(_sort_column(stmt, field_name), Event.id)
+        stmt = stmt.where(key < (value, last_id) if desc else key > (value, last_id))
     else:
-        stmt = stmt.order_by(Event.start_time.asc())
+        stmt = stmt.offset(offset)
+    return stmt.limit(limit + 1)
 
-    # Total count (efficient count)
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = db.scalar(count_stmt) or 0
+def _page_result(
+    rows: list, order: tuple[str, bool], limit: int, offset: int, fields: Optional[tuple[str, ...]] = None
+) -> dict:
+    """Response page from result rows whose first column is the Event."""
+    model = event_fields_model(fields) if fields else EventOut
+    items = [model.model_validate(row[0]) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        field_name, desc = order
+        last = rows[limit - 1]
+        value = last._mapping[RELEVANCE] if field_name == RELEVANCE else getattr(last[0], field_name)
+        next_cursor = encode_cursor(_sort_key(field_name, desc), value, last[0].id)
+    return {"items": items, "limit": limit, "offset": offset, "next_cursor": next_cursor}
 
-    # Pagination
-    stmt = stmt.limit(limit).offset(offset)
-    items = list(db.execute(stmt).scalars().all())
+def _count_stmt(stmt: Select) -> Select:
+    """COUNT(*) under the list filters, without the entity columns or ordering, so it can count off an index."""
+    return stmt.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
 
-    return {"items": items, "total": total, "limit": limit, "offset": offset}
+def _use_window_count(dialect_name: str, total_mode: str, total: Optional[int], cursor: Optional[str]) -> bool:
+    # Past a cursor the window would only count the remaining rows
+    return total_mode == "exact" and total is None and not cursor and dialect_name in WINDOW_COUNT_DIALECTS
 
-def get_event(db: Session, event_id: int):
-    return db.query(Event).options(joinedload(Event.rsvps)).filter(Event.id == event_id).first()
+def list_events(
+    db: Session,
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    start_after: Optional[datetime] = None,
+    start_before: Optional[datetime] = None,
+    limit: int = 10,
+    offset: int = 0,
+    sort: Optional[str] = None,
+    min_capacity: Optional[int] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    total_mode: str = "exact",
+    location_match: str = "contains",
+    fields: Optional[tuple[str, ...]] = None,
+) -> dict:
+    """
+    List events with optional filters (text, location, date, capacity, status) and sorting files.
+    Pages are served from list_events_cache and totals from list_counts_cache when the
+    same filters were seen recently. ``q`` uses the full-text index (title, description,
+    location; ordered by relevance unless ``sort`` is given) when the database has one,
+    and a title ILIKE otherwise. ``location_match`` picks substring, exact or prefix
+    matching of ``location`` (the last two on the normalized key). ``fields`` (from
+    ``parse_event_fields``) loads and returns only those columns. ``total_mode`` is one of TOTAL_MODES; "estimated"
+    uses table statistics for an unfiltered list and the exact count otherwise, and
+    "none" returns ``total=None`` without counting.
+    Raises InvalidCursor for a cursor that is malformed or was issued for another sort.
+    """
+    q, location = _clean_text(q), _clean_text(location)
+    search = search_backend(db.get_bind()) if q else None
+    order = _event_sort(sort, ranked=_ranked(q, search))
+    filters = _list_events_filters(q, location, start_after, start_before, min_capacity, status, location_match)
+    key = filters + (_sort_key(*order), limit, offset, cursor or None, fields)
+    total = list_counts_cache.get(filters) if total_mode != "none" else None
+    stmt = _list_events_stmt(
+        q, location, start_after, start_before, min_capacity, status, sort, search, location_match, fields
+    )
+
+    page = list_events_cache.get(key)
+    if page is None:
+        # Detached snapshots so cached pages never touch a closed session
+        page_stmt = _paginate(stmt, order, limit, offset, cursor)
+        if _use_window_count(db.get_bind().dialect.name, total_mode, total, cursor):
+            rows = list(db.execute(page_stmt.add_columns(func.count().over())).all())
+            if rows:
+                total = rows[0][-1]
+                list_counts_cache.set(filters, total)
+        else:
+            rows = list(db.execute(page_stmt).all())
+        page = _page_result(rows, order, limit, offset, fields)
+        list_events_cache.set(key, page)
+
+    if total is None and total_mode == "estimated" and not any(filters[1:]):
+        total = estimate_row_count(db.connection(), Event.__tablename__)
+    if total is None and total_mode != "none":
+        total = db.scalar(_count_stmt(stmt)) or 0
+        list_counts_cache.set(filters, total)
+    return {**page, "items": list(page["items"]), "total": total}
+
+async def list_events_async(
+    db: AsyncSession,
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    start_after: Optional[datetime] = None,
+    start_before: Optional[datetime] = None,
+    limit: int = 10,
+    offset: int = 0,
+    sort: Optional[str] = None,
+    min_capacity: Optional[int] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    total_mode: str = "exact",
+    location_match: str = "contains",
+    fields: Optional[tuple[str, ...]] = None,
+) -> dict:
+    """AsyncSession counterpart of list_events (same statements, same caches)."""
+    q, location = _clean_text(q), _clean_text(location)
+    search = await db.run_sync(lambda session: search_backend(session.get_bind())) if q else None
+    order = _event_sort(sort, ranked=_ranked(q, search))
+    filters = _list_events_filters(q, location, start_after, start_before, min_capacity, status, location_match)
+    key = filters + (_sort_key(*order), limit, offset, cursor or None, fields)
+    total = list_counts_cache.get(filters) if total_mode != "none" else None
+    stmt = _list_events_stmt(
+        q, location, start_after, start_before, min_capacity, status, sort, search, location_match, fields
+    )
+
+    page = list_events_cache.get(key)
+    if page is None:
+        page_stmt = _paginate(stmt, order, limit, offset, cursor)
+        if _use_window_count(db.get_bind().dialect.name, total_mode, total, cursor):
+            rows = list((await db.execute(page_stmt.add_columns(func.count().over()))).all())
+            if rows:
+                total = rows[0][-1]
+                list_counts_cache.set(filters, total)
+        else:
+            rows = list((await db.execute(page_stmt)).all())
+        page = _page_result(rows, order, limit, offset, fields)
+        list_events_cache.set(key, page)
+
+    if total is None and total_mode == "estimated" and not any(filters[1:]):
+        total = await db.run_sync(lambda session: estimate_row_count(session.connection(), Event.__tablename__))
+    if total is None and total_mode != "none":
+        total = await db.scalar(_count_stmt(stmt)) or 0
+        list_counts_cache.set(filters, total)
+    return {**page, "items": list(page["items"]), "total": total}
+
+# Columns of the event exports: EventOut's, plus provenance for the admin export
+EXPORT_COLUMNS = tuple(EventOut.model_fields)
+EXPORT_PROVENANCE_COLUMNS = (
+    "created_by_user_id", "source_id", "source_name", "source_url", "source_record_id", "is_seeded",
+)
+
+def export_columns(provenance: bool = False) -> tuple[str, ...]:
+    return EXPORT_COLUMNS + EXPORT_PROVENANCE_COLUMNS if provenance else EXPORT_COLUMNS
+
+def _export_stmt(stmt: Select, provenance: bool) -> Select:
+    """Plain column rows (no ORM entities) for a list_events statement, in its order."""
+    columns = [getattr(Event, name) for name in EXPORT_COLUMNS]
+    if provenance:
+        columns += [
+            Event.created_by_user_id, Event.source_id, DataSource.name.label("source_name"),
+            DataSource.url.label("source_url"), Event.source_record_id, Event.is_seeded,
+        ]
+        stmt = stmt.outerjoin(DataSource, DataSource.id == Event.source_id)
+    stmt = stmt.with_only_columns(*columns, maintain_column_froms=True)
+    return stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+
+def export_events(
+    db: Session,
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    start_after: Optional[datetime] = None,
+    start_before: Optional[datetime] = None,
+    sort: Optional[str] = None,
+    min_capacity: Optional[int] = None,
+    status: Optional[str] = None,
+    location_match: str = "contains",
+    provenance: bool = False,
+) -> Iterator[Sequence[Row]]:
+    """
+    Every event matching the list_events filters, in list order, as batches of
+    EXPORT_BATCH_SIZE rows with ``export_columns(provenance)``. Rows are fetched
+    with yield_per (a server-side cursor where the driver has one) and never cached.
+    """
+    q, location = _clean_text(q), _clean_text(location)
+    search = search_backend(db.get_bind()) if q else None
+    stmt = _list_events_stmt(q, location, start_after, start_before, min_capacity, status, sort, search, location_match)
+    yield from db.execute(_export_stmt(stmt, provenance)).partitions()
+
+async def export_events_async(
+    db: AsyncSession,
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    start_after: Optional[datetime] = None,
+    start_before: Optional[datetime] = None,
+    sort: Optional[str] = None,
+    min_capacity: Optional[int] = None,
+    status: Optional[str] = None,
+    location_match: str = "contains",
+    provenance: bool = False,
+) -> AsyncIterator[Sequence[Row]]:
+    """AsyncSession counterpart of export_events (AsyncSession.stream)."""
+    q, location = _clean_text(q), _clean_text(location)
+    search = await db.run_sync(lambda session: search_backend(session.get_bind())) if q else None
+    stmt = _list_events_stmt(q, location, start_after, start_before, min_capacity, status, sort, search, location_match)
+    result = await db.stream(_export_stmt(stmt, provenance))
+    async for batch in result.partitions():
+        yield batch
+
+# Event lookups by what the caller needs. None of them load RSVPs, which can run
+# to tens of thousands of rows for a popular event.
+
+def get_event(db: Session, event_id: int) -> Optional[Event]:
+    """The event's own columns (detail, PATCH, DELETE, provenance); relationships load lazily."""
+    return db.get(Event, event_id)
+
+def get_event_ref(db: Session, event_id: int) -> Optional[Row]:
+    """(id, created_by_user_id) for existence and ownership checks; None if there is no such event."""
+    return db.execute(select(Event.id, Event.created_by_user_id).where(Event.id == event_id)).first()
+
+async def get_event_async(db: AsyncSession, event_id: int) -> Optional[Event]:
+    # Only the event's own columns are needed for EventOut; no RSVP join
+    return await db.get(Event, event_id)
 
 def update_event(db: Session, event: Event, data: EventUpdate) -> Event:
     patch = data.model_dump(exclude_unset=True)
     for k, v in patch.items():
         setattr(event, k, v)
     db.commit()
+    mark_events_changed()
     db.refresh(event)
     return event
 
 def delete_event(db: Session, event: Event) -> None:
+    # One bulk DELETE for the RSVPs, so the cascade finds an empty collection instead
+    # of loading and deleting every RSVP row one by one
+    db.execute(delete(RSVP).where(RSVP.event_id == event.id))
     db.delete(event)
     db.commit()
+    # RSVPs go with the event (cascade)
+    mark_events_changed()
+    mark_rsvps_changed()
 
 def create_attendee(db: Session, data: AttendeeCreate, owner_user_id: Optional[int] = None) -> Attendee:
     """
@@ -112,6 +447,7 @@ def create_rsvp(db: Session, event_id: int, data: RSVPCreate) -> RSVP:
     except IntegrityError:
         db.rollback()
         raise
+    mark_rsvps_changed()
     db.refresh(obj)
     return obj
 
@@ -122,18 +458,17 @@ def list_rsvps_for_event(db: Session, event_id: int) -> List[RSVP]:
 def delete_rsvp(db: Session, rsvp: RSVP) -> None:
     db.delete(rsvp)
     db.commit()
+    mark_rsvps_changed()
 
 def get_event_stats(db: Session, event: Event):
-    # Ensure relationships are loaded if not present
-    if 'rsvps' not in event.__dict__:
-        db.refresh(event, ['rsvps'])
-
-
-
+    # Counted in the database (one GROUP BY on the event's RSVP index range), not by loading RSVPs
     counts = {"going": 0, "maybe": 0, "not_going": 0}
-    for rsvp in event.rsvps:
-        if rsvp.status in counts:
-            counts[rsvp.status] += 1
+    rows = db.execute(
+        select(RSVP.status, func.count()).where(RSVP.event_id == event.id).group_by(RSVP.status)
+    ).all()
+    for rsvp_status, count in rows:
+        if rsvp_status in counts:
+            counts[rsvp_status] = count
 
     going = counts.get("going", 0)
     maybe = counts.get("maybe", 0)
@@ -144,8 +479,10 @@ def get_event_stats(db: Session, event: Event):
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.execute(select(User).where(User.username == username)).scalars().first()
 
-def get_attendee_events(db: Session, attendee_id: int) -> List[Event]:
+def get_attendee_events(db: Session, attendee_id: int, fields: Optional[tuple[str, ...]] = None) -> List[Event]:
     stmt = select(Event).join(RSVP).where(RSVP.attendee_id == attendee_id)
+    if fields:
+        stmt = stmt.options(load_only(*(getattr(Event, name) for name in fields)))
     return list(db.execute(stmt).scalars().all())
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -6,8 +6,12 @@ from fastapi.responses import RedirectResponse
 
 from .api.admin import router as admin_router
 from .api.analytics import router as analytics_router
+from .api.async_routes import router as async_router
 from .api.routes import router as api_router
 from .core.config import settings
+from .core.db import dispose_async_engine
+from .core.hashing import password_hasher
+from .core.logging_config import setup_logging, shutdown_logging
 from .core.middleware import RequestLoggingMiddleware, global_exception_handler
 
 logger = logging.getLogger(__name__)
@@ -25,9 +29,19 @@ app = FastAPI(
 
 @app.on_event("startup")
 async def startup_event() -> None:
+    # Move log I/O off the event loop onto the background writer thread
+    setup_logging()
     logger.info("Application starting up...")
 
 
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    logger.info("Application shutting down...")
+    password_hasher.shutdown()
+    await dispose_async_engine()
+    shutdown_logging()
+
+
 @app.get("/", include_in_schema=False)
 async def root() -> RedirectResponse:
     return RedirectResponse(url="/docs")
@@ -46,12 +60,15 @@ app.add_middleware(
     allow_credentials=allow_credentials,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Request-ID"],
+    expose_headers=["X-Request-ID", "X-DB-Queries", "X-DB-Time"],
 )
 
 app.add_middleware(RequestLoggingMiddleware)
 app.add_exception_handler(Exception, global_exception_handler)
 
 app.include_router(analytics_router)
+if settings.DATABASE_ASYNC:
+    # First match wins: the async handlers shadow their sync twins in routes.py
+    app.include_router(async_router)
 app.include_router(api_router)
 app.include_router(admin_router)
@@ -3,10 +3,13 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, validates
 from sqlalchemy.types import JSON
 
+from .core.locations import normalize_location, track_location_changes
+from .core.search import attach_search_ddl
+
 
 class Base(DeclarativeBase):
     pass
@@ -35,6 +38,8 @@ class ImportRun(Base):
     SQLAlchemy model tracking execution of data import jobs.
     """
     __tablename__ = "import_runs"
+    # Latest run per source (provenance, dataset metadata)
+    __table_args__ = (Index("ix_import_runs_data_source_id_started_at", "data_source_id", "started_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     data_source_id: Mapped[int] = mapped_column(ForeignKey("data_sources.id"))
@@ -61,15 +66,29 @@ class Event(Base):
     SQLAlchemy model representing an event.
     """
     __tablename__ = "events"
+    # One row per upstream record; also the importer's per-row lookup
+    __table_args__ = (
+        Index("uq_events_source_record", "source_id", "source_record_id", unique=True),
+        # Exact location filter in the default start_time order; prefix ranges use it too
+        Index("ix_events_location_key_start_time", "location_key", "start_time"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    title: Mapped[str] = mapped_column(String(200))
+    title: Mapped[str] = mapped_column(String(200), index=True)
     description: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
     location: Mapped[str] = mapped_column(String(200))
-    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
-    end_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
-    capacity: Mapped[int] = mapped_column(Integer)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    # normalize_location(location), maintained by _set_location_key; exact/prefix filters and /locations.
+    # Prefix ranges (prefix_upper_bound) need code-point order: SQLite's BINARY already is,
+    # Postgres would otherwise compare (and index) in the database's linguistic collation.
+    location_key: Mapped[Optional[str]] = mapped_column(
+        String(200).with_variant(String(200, collation="C"), "postgresql"), nullable=True
+    )
+    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    end_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    capacity: Mapped[int] = mapped_column(Integer, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+    )
 
     # Ownership
     created_by_user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True)
@@ -83,9 +102,19 @@ class Event(Base):
     data_source: Mapped[Optional["DataSource"]] = relationship("DataSource", back_populates="events")
     creator: Mapped[Optional["User"]] = relationship("User", foreign_keys=[created_by_user_id])
 
+    @validates("location")
+    def _set_location_key(self, key: str, value: str) -> str:
+        self.location_key = normalize_location(value)
+        return value
+
     def __repr__(self) -> str:
         return f"<Event(title={self.title}, location={self.location})>"
 
+# Full-text index over title/description/location, created and dropped with the table
+attach_search_ddl(Event.__table__)
+# Committed location changes update the /locations autocomplete index
+track_location_changes(Event)
+
 class Attendee(Base):
     """
     SQLAlchemy model representing an event attendee.
@@ -108,7 +137,14 @@ class RSVP(Base):
     SQLAlchemy model representing an RSVP (link between Event and Attendee).
     """
     __tablename__ = "rsvps"
-    __table_args__ = (UniqueConstraint("event_id", "attendee_id", name="uq_rsvp_event_attendee"),)
+    __table_args__ = (
+        UniqueConstraint("event_id", "attendee_id", name="uq_rsvp_event_attendee"),
+        # RSVPs for an event in creation order; an attendee's events
+        Index("ix_rsvps_event_id_created_at", "event_id", "created_at"),
+        Index("ix_rsvps_attendee_id", "attendee_id"),
+        # Per-status counts for /events/{id}/stats without reading the RSVP rows
+        Index("ix_rsvps_event_id_status", "event_id", "status"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     event_id: Mapped[int] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"))
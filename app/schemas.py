@@ -1,17 +1,30 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import lru_cache
 from typing import Generic, List, Literal, Optional, TypeVar
 
-from pydantic import BaseModel, ConfigDict, Field, SecretStr, field_validator, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    SecretStr,
+    TypeAdapter,
+    create_model,
+    field_validator,
+    model_validator,
+)
 
 T = TypeVar("T")
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
-    total: int
+    # None when the request asked for total=none
+    total: Optional[int]
     limit: int
     offset: int
+    # Opaque keyset cursor for the next page (pass back as ?cursor=); None on the last page
+    next_cursor: Optional[str] = None
 
 RSVPStatus = Literal["going", "maybe", "not_going"]
 
@@ -97,6 +110,43 @@ class EventOut(BaseModel):
     capacity: int
     created_at: datetime
 
+# Sparse fieldsets (?fields=): EventOut fields in declaration order
+EVENT_FIELDS = tuple(EventOut.model_fields)
+
+def parse_event_fields(fields: Optional[str]) -> Optional[tuple[str, ...]]:
+    """
+    Requested EventOut fields in declaration order, always including ``id``; None for
+    all fields. The order is canonical so equal sets serialize (and validate) identically.
+    Raises ValueError naming any unknown field.
+    """
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(EVENT_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(EVENT_FIELDS)})")
+    return tuple(name for name in EVENT_FIELDS if name in requested or name == "id")
+
+@lru_cache(maxsize=None)
+def event_fields_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """EventOut restricted to ``fields`` (at most one model per field set)."""
+    definitions: dict = {name: (EventOut.model_fields[name].annotation, ...) for name in fields}
+    return create_model("EventFieldsOut", __config__=ConfigDict(from_attributes=True), **definitions)
+
+@lru_cache(maxsize=None)
+def event_fields_adapter(fields: tuple[str, ...], page: bool) -> TypeAdapter:
+    """
+    Serializer for a sparse response (a PaginatedResponse page, or a list of events).
+    The route's response_model would demand every field, so these routes return bytes.
+    """
+    model = event_fields_model(fields)
+    return TypeAdapter(PaginatedResponse[model] if page else List[model])  # type: ignore[valid-type]
+
+class LocationOut(BaseModel):
+    location: str
+    key: str
+    count: int
+
 class AttendeeCreate(BaseModel):
     name: str = Field(min_length=1, max_length=120)
     email: str = Field(min_length=3, max_length=255)
@@ -0,0 +1,105 @@
+"""Sync (threadpool) vs async (AsyncSession) read routes under 500+ concurrent clients.
+
+Each mode runs in its own process with ``DATABASE_ASYNC`` set accordingly and
+the list cache disabled, then drives ``GET /events?limit=20`` and
+``GET /events/{id}`` in-process over ``httpx.ASGITransport``. Sync routes
+share the default 40-thread pool; async routes run on the event loop.
+
+Requests that take longer than ``--request-timeout`` are abandoned and counted
+as timeouts. With hundreds of clients the sync path can stall outright: every
+worker thread waits for a pooled connection while the sessions holding them
+wait for a free thread to run ``get_db``'s cleanup.
+
+Usage:
+    python scripts/bench_async.py                           # both modes
+    python scripts/bench_async.py --mode async --clients 1000 --seconds 5
+"""
+import argparse
+import asyncio
+import logging
+import os
+import subprocess  # nosec B404
+import sys
+import time
+
+from bench_common import create_schema, percentile, seed_events, use_temp_database
+
+
+async def _drive(app, clients: int, seconds: float, request_timeout: float) -> tuple[list[float], int, int]:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    errors = 0
+    timeouts = 0
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=60) as client:
+        await client.get("/events?limit=20")  # warm-up
+        deadline = time.perf_counter() + seconds
+
+        async def worker(n: int) -> None:
+            nonlocal errors, timeouts
+            i = 0
+            while time.perf_counter() < deadline:
+                path = "/events?limit=20" if (n + i) % 2 else f"/events/{1 + (n * 7 + i) % 500}"
+                i += 1
+                start = time.perf_counter()
+                try:
+                    r = await asyncio.wait_for(client.get(path), request_timeout)
+                except asyncio.TimeoutError:
+                    timeouts += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                if r.status_code != 200:
+                    errors += 1
+
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+    return latencies, errors, timeouts
+
+
+def run_mode(mode: str, clients: int, seconds: float, request_timeout: float) -> None:
+    use_temp_database(f"async-{mode}")
+    os.environ["DATABASE_ASYNC"] = "1" if mode == "async" else "0"
+    os.environ["LIST_CACHE_MAX_ENTRIES"] = "0"  # every request reaches the database
+    create_schema()
+    seed_events(500, description_len=200)
+
+    from app.main import app
+
+    logging.getLogger("app").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    latencies, errors, timeouts = asyncio.run(_drive(app, clients, seconds, request_timeout))
+    ms = [s * 1000 for s in latencies]
+    print(
+        f"{mode:<5} clients={clients:<5} {len(ms) / seconds:8.1f} req/s  p50={percentile(ms, 50):8.1f}ms "
+        f"p99={percentile(ms, 99):8.1f}ms  errors={errors} timeouts={timeouts}",
+        flush=True,
+    )
+    # Abandoned sync requests may still be parked in worker threads; don't wait for them
+    os._exit(0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["sync", "async"])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--request-timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.clients, args.seconds, args.request_timeout)
+        return
+
+    for mode in ("sync", "async"):
+        subprocess.run(  # nosec B603
+            [sys.executable, __file__, "--mode", mode, "--clients", str(args.clients), "--seconds", str(args.seconds),
+             "--request-timeout", str(args.request_timeout)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Shared helpers for the scripts/bench_*.py micro-benchmarks.
+
+Each benchmark points the app at a throwaway SQLite file *before* importing
+``app`` (settings are read at import time), seeds it, then drives requests
+in-process through ``TestClient``.
+"""
+import os
+import resource
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def add_repo_to_path() -> None:
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+
+def use_temp_database(name: str) -> str:
+    """Point DATABASE_URL at a fresh SQLite file and make ``app`` importable."""
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-"), f"{name}.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["RATE_LIMIT_ENABLED"] = "0"
+    add_repo_to_path()
+    return path
+
+
+def create_schema() -> None:
+    from app.core.db import engine
+    from app.models import Base
+
+    Base.metadata.create_all(bind=engine)
+
+
+def seed_events(count: int, description_len: int = 1000) -> None:
+    """Bulk-insert ``count`` events with long descriptions."""
+    from app.core.db import SessionLocal
+    from app.models import Event
+
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    db = SessionLocal()
+    try:
+        db.add_all(
+            Event(
+                title=f"Bench Event {i}",
+                description=("x" * description_len),
+                location=f"Venue {i % 50}",
+                start_time=start + timedelta(minutes=i),
+                end_time=start + timedelta(minutes=i, hours=2),
+                capacity=100 + i % 400,
+            )
+            for i in range(count)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def seed_rsvps(event_id: int, count: int) -> None:
+    """Bulk-insert ``count`` attendees, each with an RSVP to ``event_id``."""
+    from sqlalchemy import insert
+
+    from app.core.db import SessionLocal
+    from app.models import RSVP, Attendee
+
+    now = datetime.now(timezone.utc)
+    statuses = ("going", "maybe", "not_going")
+    db = SessionLocal()
+    try:
+        db.execute(insert(Attendee), [{"name": f"A{i}", "email": f"a{i}@bench.test"} for i in range(count)])
+        db.execute(
+            insert(RSVP),
+            [
+                {"event_id": event_id, "attendee_id": i + 1, "status": statuses[i % 3], "created_at": now + timedelta(seconds=i)}
+                for i in range(count)
+            ],
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB (Linux reports KiB)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarise(label: str, samples_s: list[float]) -> str:
+    ms = [s * 1000 for s in samples_s]
+    return (
+        f"{label:<12} n={len(ms):<6} p50={percentile(ms, 50):7.2f}ms "
+        f"p99={percentile(ms, 99):7.2f}ms peak_rss={peak_rss_mb():7.1f}MiB"
+    )
+
+
+def legacy_middleware():
+    """The original BaseHTTPMiddleware implementation, kept here only as a baseline."""
+    import hashlib
+    import time
+    import uuid
+
+    from fastapi import Request, Response
+    from starlette.middleware.base import BaseHTTPMiddleware
+    from starlette.responses import JSONResponse
+
+    from app.core.config import settings
+    from app.core.middleware import logger
+    from app.core.rate_limit import auth_limiter, global_limiter
+
+    class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next):
+            request_id = str(uuid.uuid4())
+            request.state.request_id = request_id
+            start_time = time.time()
+
+            if settings.RATE_LIMIT_ENABLED:
+                client_ip = request.client.host if request.client else "unknown"
+                limiter = auth_limiter if request.url.path.startswith("/auth/login") else global_limiter
+                if not limiter.is_allowed(client_ip, request.url.path):
+                    return JSONResponse(status_code=429, content={"detail": "Too Many Requests", "request_id": request_id})
+
+            response = await call_next(request)
+            if request.method == "GET" and response.status_code == 200 and request.url.path.startswith("/events"):
+                response_body = b""
+                async for chunk in response.body_iterator:
+                    response_body += chunk
+                etag = f'"{hashlib.sha256(response_body).hexdigest()}"'
+                if request.headers.get("If-None-Match") == etag:
+                    response = Response(status_code=304)
+                else:
+                    response = Response(
+                        content=response_body,
+                        status_code=200,
+                        headers=dict(response.headers),
+                        media_type=response.media_type,
+                    )
+                response.headers["ETag"] = etag
+                response.headers["Cache-Control"] = "no-cache"
+
+            process_time = time.time() - start_time
+            logger.info(f"ReqID={request_id} {request.method} {request.url.path} - {response.status_code} - {process_time:.4f}s")
+            response.headers["X-Request-ID"] = request_id
+            response.headers["X-Content-Type-Options"] = "nosniff"
+            response.headers["X-Frame-Options"] = "DENY"
+            response.headers["Referrer-Policy"] = "no-referrer"
+            response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+            response.headers["Cross-Origin-Resource-Policy"] = "same-site"
+            if "Cache-Control" not in response.headers:
+                response.headers["Cache-Control"] = "no-store"
+            return response
+
+    return LegacyRequestLoggingMiddleware
@@ -0,0 +1,77 @@
+"""Benchmark body-hash ETags on ``GET /events/1/rsvps``.
+
+Compares the legacy BaseHTTPMiddleware (``body += chunk`` then rebuild a
+Response) with the current streaming SHA-256 implementation. Each mode runs in its own
+subprocess so peak RSS is measured independently. ``GET /events`` itself is not
+used: it gets the data-version ETag and never reaches the body hash. The RSVP list
+of one event with ``--rsvps`` rows is, and its size grows with that flag.
+
+Usage:
+    python scripts/bench_etag.py                 # run both modes
+    python scripts/bench_etag.py --mode streaming --requests 500 --rsvps 5000
+"""
+import argparse
+import hashlib
+import subprocess  # nosec B404
+import sys
+import time
+
+from bench_common import create_schema, legacy_middleware, seed_events, seed_rsvps, summarise, use_temp_database
+
+PATH = "/events/1/rsvps"
+# Identity bodies: the legacy middleware has no compression, and this measures hashing
+HEADERS = {"Accept-Encoding": "identity"}
+
+
+def run_mode(mode: str, requests: int, rsvps: int) -> None:
+    use_temp_database(f"etag-{mode}")
+    create_schema()
+    seed_events(1)
+    seed_rsvps(1, rsvps)
+
+    from fastapi.testclient import TestClient
+    from starlette.middleware import Middleware
+
+    from app.core.middleware import RequestLoggingMiddleware
+    from app.main import app
+
+    if mode == "legacy":
+        legacy = legacy_middleware()
+        app.user_middleware = [
+            Middleware(legacy) if m.cls is RequestLoggingMiddleware else m for m in app.user_middleware
+        ]
+
+    client = TestClient(app)
+    r = client.get(PATH, headers=HEADERS)  # warm-up
+    # The ETag must be the hash of this body, i.e. the path under test ran
+    assert r.headers["ETag"] == f'"{hashlib.sha256(r.content).hexdigest()}"', r.headers
+
+    samples: list[float] = []
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        r = client.get(PATH, headers=HEADERS)
+        samples.append(time.perf_counter() - t0)
+        assert r.status_code == 200 and "ETag" in r.headers
+    print(summarise(mode, samples) + f" body={len(r.content) / 1024:.0f}KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["legacy", "streaming"])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--rsvps", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.requests, args.rsvps)
+        return
+
+    for mode in ("legacy", "streaming"):
+        subprocess.run(  # nosec B603
+            [sys.executable, __file__, "--mode", mode, "--requests", str(args.requests), "--rsvps", str(args.rsvps)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
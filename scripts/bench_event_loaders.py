@@ -0,0 +1,89 @@
+"""Event lookups on an event with many RSVPs: per-route loaders vs ``joinedload(Event.rsvps)``.
+
+Seeds one event with ``--rsvps`` RSVPs, then times the single-event routes
+in-process. "legacy" swaps the crud lookups back to the original
+``joinedload(Event.rsvps)`` query and the Python-side stats loop; "current"
+uses the scalar, id/owner and GROUP BY paths. The "exists" row times the
+lookup that POST/GET ``/events/{id}/rsvps`` and RSVP deletion run before
+doing their own work.
+
+Usage:
+    python scripts/bench_event_loaders.py
+    python scripts/bench_event_loaders.py --rsvps 50000 --iterations 50
+"""
+import argparse
+import time
+
+from bench_common import create_schema, seed_events, seed_rsvps, summarise, use_temp_database
+
+
+def use_legacy_loaders() -> None:
+    from sqlalchemy.orm import joinedload
+
+    from app import crud
+    from app.models import Event
+
+    def get_event(db, event_id):
+        return db.query(Event).options(joinedload(Event.rsvps)).filter(Event.id == event_id).first()
+
+    def get_event_stats(db, event):
+        counts = {"going": 0, "maybe": 0, "not_going": 0}
+        for rsvp in event.rsvps:
+            if rsvp.status in counts:
+                counts[rsvp.status] += 1
+        remaining = max(int(event.capacity) - counts["going"], 0)
+        return {"event_id": event.id, **counts, "remaining_capacity": remaining}
+
+    crud.get_event = get_event
+    crud.get_event_ref = get_event
+    crud.get_event_stats = get_event_stats
+
+
+def time_calls(fn, iterations: int) -> list[float]:
+    fn()  # warm up
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("legacy", "current"), default="current")
+    parser.add_argument("--rsvps", type=int, default=20000)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    use_temp_database(f"loaders-{args.mode}")
+    create_schema()
+    seed_events(1)
+    seed_rsvps(1, args.rsvps)
+    if args.mode == "legacy":
+        use_legacy_loaders()
+
+    from fastapi.testclient import TestClient
+
+    from app import crud
+    from app.core.db import SessionLocal
+    from app.main import app
+
+    client = TestClient(app)
+
+    def lookup_exists():
+        db = SessionLocal()
+        try:
+            assert crud.get_event_ref(db, 1)
+        finally:
+            db.close()
+
+    print(f"mode={args.mode} rsvps={args.rsvps}")
+    for label, path in (("detail", "/events/1"), ("provenance", "/events/1/provenance"), ("stats", "/events/1/stats")):
+        # Skip the ETag short-circuit so every call reaches the database
+        print(summarise(label, time_calls(lambda p=path: client.get(p, headers={"If-None-Match": '"x"'}), args.iterations)))
+    print(summarise("exists", time_calls(lookup_exists, args.iterations)))
+
+
+if __name__ == "__main__":
+    main()
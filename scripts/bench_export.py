@@ -0,0 +1,69 @@
+"""Pulling the whole catalogue: paging ``/events?limit=100`` vs one ``/events/export`` stream.
+
+"paged" follows ``next_cursor`` at the maximum page size (one request, and one
+COUNT, per page), as clients had to before the export. "export" makes a single
+NDJSON or CSV request. "memory" drains the export generator in-process under
+tracemalloc to show that its peak stays at about one fetch batch, however many
+events there are.
+
+Usage:
+    python scripts/bench_export.py
+    python scripts/bench_export.py --events 100000 --batch-size 2000
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from bench_common import create_schema, seed_events, use_temp_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    use_temp_database("export")
+    os.environ["EXPORT_BATCH_SIZE"] = str(args.batch_size)
+    create_schema()
+    seed_events(args.events)
+
+    from fastapi.testclient import TestClient
+
+    from app import crud
+    from app.core.db import SessionLocal
+    from app.core.export import export_chunks
+    from app.main import app
+
+    client = TestClient(app)
+    print(f"events={args.events} batch_size={args.batch_size}")
+
+    t0 = time.perf_counter()
+    requests, rows, url = 0, 0, "/events?limit=100"
+    while url:
+        data = client.get(url).json()
+        requests += 1
+        rows += len(data["items"])
+        url = f"/events?limit=100&cursor={data['next_cursor']}" if data["next_cursor"] else ""
+    print(f"paged        rows={rows:<7} requests={requests:<5} {time.perf_counter() - t0:7.2f}s")
+
+    for fmt in ("ndjson", "csv"):
+        t0 = time.perf_counter()
+        resp = client.get(f"/events/export?format={fmt}")
+        lines = resp.text.count("\n") - (fmt == "csv")
+        print(f"export {fmt:<6} rows={lines:<7} requests=1     {time.perf_counter() - t0:7.2f}s {len(resp.content) / 1e6:7.1f}MB")
+
+    db = SessionLocal()
+    try:
+        tracemalloc.start()
+        size = sum(len(chunk) for chunk in export_chunks("ndjson", crud.export_columns(), crud.export_events(db)))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        db.close()
+    print(f"memory       streamed={size / 1e6:.1f}MB peak_alloc={peak / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
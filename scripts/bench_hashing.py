@@ -0,0 +1,102 @@
+"""/events latency while a login storm runs, with inline vs pooled password hashing.
+
+A handful of clients hammer ``POST /auth/login`` while a single client times
+``GET /events?limit=20`` back to back. With inline hashing the pbkdf2 work
+holds the GIL in the request threads and the /events tail grows with it; with
+the process pool it runs outside this interpreter.
+
+Usage:
+    python scripts/bench_hashing.py                       # both modes
+    python scripts/bench_hashing.py --mode pool --seconds 5 --storm 16
+"""
+import argparse
+import asyncio
+import logging
+import os
+import subprocess  # nosec B404
+import sys
+import time
+
+from bench_common import create_schema, percentile, seed_events, use_temp_database
+
+CREDENTIALS = {"username": "benchuser", "email": "bench@example.com", "password": "password123"}
+
+
+async def _drive(app, seconds: float, storm: int) -> tuple[list[float], int, int]:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    logins = 0
+    rejected = 0
+    deadline = time.perf_counter() + seconds
+    form = {"username": CREDENTIALS["username"], "password": CREDENTIALS["password"]}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json=CREDENTIALS)
+        await client.post("/auth/login", data=form)  # warm-up (starts the pool)
+        await client.get("/events?limit=20")
+
+        async def login_worker() -> None:
+            nonlocal logins, rejected
+            while time.perf_counter() < deadline:
+                r = await client.post("/auth/login", data=form)
+                if r.status_code == 200:
+                    logins += 1
+                else:
+                    rejected += 1
+
+        async def sampler() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/events?limit=20")
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(sampler(), *(login_worker() for _ in range(storm)))
+    return latencies, logins, rejected
+
+
+def run_mode(mode: str, seconds: float, storm: int) -> None:
+    use_temp_database(f"hashing-{mode}")
+    os.environ["PASSWORD_HASH_WORKERS"] = "0" if mode == "inline" else str(os.cpu_count() or 2)
+    os.environ["LIST_CACHE_MAX_ENTRIES"] = "0"  # measure a real query, not a cache hit
+    create_schema()
+    seed_events(200, description_len=200)
+
+    from app.main import app
+
+    logging.getLogger("app").setLevel(logging.ERROR)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    latencies, logins, rejected = asyncio.run(_drive(app, seconds, storm))
+    ms = [s * 1000 for s in latencies]
+    print(
+        f"{mode:<7} /events n={len(ms):<5} p50={percentile(ms, 50):7.2f}ms p99={percentile(ms, 99):8.2f}ms"
+        f"  logins={logins / seconds:6.1f}/s rejected={rejected}"
+    )
+
+    from app.core.hashing import password_hasher
+
+    password_hasher.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["inline", "pool"])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--storm", type=int, default=8, help="concurrent login clients")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.seconds, args.storm)
+        return
+
+    for mode in ("inline", "pool"):
+        subprocess.run(  # nosec B603
+            [sys.executable, __file__, "--mode", mode, "--seconds", str(args.seconds), "--storm", str(args.storm)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Requests/sec through the old BaseHTTPMiddleware and the pure ASGI middleware.
+
+Drives the app in-process over ``httpx.ASGITransport`` (no sockets) with a
+fixed number of concurrent clients, so the number reflects framework and
+middleware overhead rather than network I/O.
+
+Usage:
+    python scripts/bench_middleware.py                  # both implementations
+    python scripts/bench_middleware.py --impl asgi --seconds 5 --concurrency 32
+"""
+import argparse
+import asyncio
+import logging
+import subprocess  # nosec B404
+import sys
+import time
+
+from bench_common import create_schema, legacy_middleware, seed_events, use_temp_database
+
+PATHS = ("/health", "/events?limit=20")
+
+
+async def _drive(app, path: str, seconds: float, concurrency: int) -> tuple[int, int]:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    done = 0
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # warm-up
+
+        async def worker() -> None:
+            nonlocal done, errors
+            while time.perf_counter() < deadline:
+                r = await client.get(path)
+                done += 1
+                if r.status_code != 200:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return done, errors
+
+
+def run_impl(impl: str, seconds: float, concurrency: int) -> None:
+    use_temp_database(f"middleware-{impl}")
+    create_schema()
+    seed_events(200, description_len=200)
+
+    from starlette.middleware import Middleware
+
+    from app.core.middleware import RequestLoggingMiddleware
+    from app.main import app
+
+    # Access-log output is identical for both and would dominate the measurement
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    if impl == "basehttp":
+        legacy = legacy_middleware()
+        app.user_middleware = [
+            Middleware(legacy) if m.cls is RequestLoggingMiddleware else m for m in app.user_middleware
+        ]
+
+    for path in PATHS:
+        done, errors = asyncio.run(_drive(app, path, seconds, concurrency))
+        print(f"{impl:<9} {path:<18} {done / seconds:9.1f} req/s  (errors={errors})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--impl", choices=["basehttp", "asgi"])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.impl:
+        run_impl(args.impl, args.seconds, args.concurrency)
+        return
+
+    for impl in ("basehttp", "asgi"):
+        subprocess.run(  # nosec B603
+            [sys.executable, __file__, "--impl", impl, "--seconds", str(args.seconds),
+             "--concurrency", str(args.concurrency)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
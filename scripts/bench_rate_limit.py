@@ -0,0 +1,94 @@
+"""Benchmark the rate limiter with many distinct clients.
+
+Compares the original per-key timestamp-list limiter with the sliding-window
+counter in app/core/rate_limit.py: throughput (calls/sec) and memory retained
+by the limiter state after N distinct clients. Also reports the per-call cost
+of the cross-process SQLite backend.
+
+Usage:
+    python scripts/bench_rate_limit.py --clients 100000 --hits 5
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+from bench_common import add_repo_to_path
+
+
+class ListRateLimiter:
+    """The original implementation: a list of timestamps per key, never evicted."""
+
+    def __init__(self, requests_per_minute: int = 120):
+        self.requests_per_minute = requests_per_minute
+        self.window_size = 60
+        self.history: dict[str, list[float]] = defaultdict(list)
+
+    def is_allowed(self, client_ip: str, path_key: str) -> bool:
+        now = time.time()
+        key = f"{client_ip}:{path_key}"
+        self.history[key] = [t for t in self.history[key] if now - t < self.window_size]
+        if len(self.history[key]) >= self.requests_per_minute:
+            return False
+        self.history[key].append(now)
+        return True
+
+
+def _drive(limiter, clients: int, hits: int) -> int:
+    calls = 0
+    for h in range(hits):
+        for c in range(clients):
+            limiter.is_allowed(f"10.{c >> 16 & 255}.{c >> 8 & 255}.{c & 255}", f"/events/{h}")
+            calls += 1
+    # A single hot client hammering one key shows the per-call cost at the limit
+    for _ in range(50_000):
+        limiter.is_allowed("hot", "/events")
+        calls += 1
+    return calls
+
+
+def run(label: str, make_limiter, clients: int, hits: int) -> None:
+    limiter = make_limiter()
+    t0 = time.perf_counter()
+    calls = _drive(limiter, clients, hits)
+    elapsed = time.perf_counter() - t0
+
+    # Memory is measured on a second, identical run so tracing does not skew timing
+    tracemalloc.start()
+    limiter = make_limiter()
+    _drive(limiter, clients, hits)
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<16} calls={calls:<8} {calls / elapsed:11.0f} calls/s  "
+        f"keys={len(limiter.history):<8} retained={retained / (1024 * 1024):7.1f}MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--hits", type=int, default=3, help="distinct paths per client")
+    parser.add_argument("--max-keys", type=int, default=100_000)
+    args = parser.parse_args()
+
+    add_repo_to_path()
+    from app.core.rate_limit import RateLimiter, SQLiteBackend
+
+    run("timestamp-list", lambda: ListRateLimiter(120), args.clients, args.hits)
+    run("sliding-window", lambda: RateLimiter(120, max_keys=args.max_keys), args.clients, args.hits)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "ratelimit.db")
+    limiter = RateLimiter(120, backend=SQLiteBackend(path, namespace="global"))
+    n = min(args.clients, 50_000)
+    t0 = time.perf_counter()
+    for c in range(n):
+        limiter.is_allowed(f"10.{c >> 16 & 255}.{c >> 8 & 255}.{c & 255}", "/events")
+    elapsed = time.perf_counter() - t0
+    print(f"{'sqlite-shared':<16} calls={n:<8} {n / elapsed:11.0f} calls/s  {elapsed / n * 1e6:.1f}us/call")
+
+
+if __name__ == "__main__":
+    main()
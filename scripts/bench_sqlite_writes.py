@@ -0,0 +1,114 @@
+"""Concurrent RSVP writes against file SQLite: default connection vs the pragma profile.
+
+Writer threads each register an attendee and RSVP them to a random event
+(two commits per iteration) while reader threads page through ``list_events``.
+"legacy" runs with ``SQLITE_PRAGMAS`` empty and the old 5 + 10 pool, which is
+how ``create_engine`` behaved before the profile, with readers on the same pool;
+"profile" uses the defaults from ``Settings``: a small SQLite write pool and
+readers on the separate read pool.
+
+Usage:
+    python scripts/bench_sqlite_writes.py                        # both modes
+    python scripts/bench_sqlite_writes.py --mode profile --writers 16 --readers 8
+"""
+import argparse
+import os
+import random
+import subprocess  # nosec B404
+import sys
+import threading
+import time
+
+from bench_common import create_schema, seed_events, use_temp_database
+
+
+def run_mode(mode: str, writers: int, readers: int, seconds: float) -> None:
+    use_temp_database(f"writes-{mode}")
+    os.environ["LIST_CACHE_MAX_ENTRIES"] = "0"
+    if mode == "legacy":
+        os.environ["SQLITE_PRAGMAS"] = ""
+        os.environ["SQLITE_POOL_SIZE"] = "5"
+        os.environ["SQLITE_MAX_OVERFLOW"] = "10"
+        os.environ["DB_POOL_TIMEOUT"] = "30"
+    create_schema()
+    seed_events(200, description_len=200)
+
+    from sqlalchemy.exc import OperationalError
+
+    from app import crud
+    from app.core.db import ReadSessionLocal, SessionLocal
+    from app.schemas import AttendeeCreate, RSVPCreate
+
+    # Readers go through the read engine (get_read_db); legacy had only the one pool
+    read_session = SessionLocal if mode == "legacy" else ReadSessionLocal
+    counts = {"writes": 0, "reads": 0, "locked": 0, "other_errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def bump(key: str) -> None:
+        with lock:
+            counts[key] += 1
+
+    def writer(n: int) -> None:
+        rng = random.Random(n)  # nosec B311
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            db = SessionLocal()
+            try:
+                attendee = crud.create_attendee(db, AttendeeCreate(name=f"W{n}", email=f"w{n}-{i}@bench.test"))
+                crud.create_rsvp(db, rng.randint(1, 200), RSVPCreate(attendee_id=attendee.id, status="going"))
+                bump("writes")
+            except OperationalError as exc:
+                db.rollback()
+                bump("locked" if "locked" in str(exc) else "other_errors")
+            finally:
+                db.close()
+
+    def reader(n: int) -> None:
+        rng = random.Random(1000 + n)  # nosec B311
+        while time.perf_counter() < deadline:
+            db = read_session()
+            try:
+                crud.list_events(db, limit=20, offset=rng.randint(0, 180))
+                bump("reads")
+            except OperationalError as exc:
+                bump("locked" if "locked" in str(exc) else "other_errors")
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(
+        f"{mode:<8} writers={writers} readers={readers}  rsvp writes={counts['writes'] / seconds:7.1f}/s  "
+        f"reads={counts['reads'] / seconds:7.1f}/s  locked={counts['locked']} other_errors={counts['other_errors']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["legacy", "profile"])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.writers, args.readers, args.seconds)
+        return
+
+    for mode in ("legacy", "profile"):
+        subprocess.run(  # nosec B603
+            [sys.executable, __file__, "--mode", mode, "--writers", str(args.writers),
+             "--readers", str(args.readers), "--seconds", str(args.seconds)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
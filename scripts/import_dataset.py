@@ -11,6 +11,7 @@ import requests
 from sqlalchemy.orm import Session
 
 from app.core.db import SessionLocal
+from app.crud import mark_events_changed
 from app.models import DataSource, Event, ImportRun
 
 # Configure logging
@@ -77,6 +78,9 @@ def import_dataset(
         rows_read = 0
         rows_inserted = 0
         rows_updated = 0
+        # Rows added in this run are not flushed yet, so repeats of the same record
+        # in one file must be matched here (events.source_id + source_record_id is unique)
+        added: dict[str, Event] = {}
         errors: list[dict] = []
 
         # 3. Fetch Data
@@ -113,7 +117,7 @@ def import_dataset(
                     start_dt = parse_xml_date(start_d, start_t) or datetime.now(timezone.utc)
                     end_dt = parse_xml_date(end_d, end_t) or (start_dt + timedelta(hours=4))
 
-                    existing = (
+                    existing = added.get(record_id) or (
                         db.query(Event)
                         .filter(Event.source_id == source.id, Event.source_record_id == record_id)
                         .first()
@@ -136,7 +140,8 @@ def import_dataset(
                             setattr(existing, k, v)
                         rows_updated += 1
                     else:
-                        db.add(Event(**event_data))
+                        added[record_id] = Event(**event_data)
+                        db.add(added[record_id])
                         rows_inserted += 1
 
                 except Exception as row_err:
@@ -174,7 +179,7 @@ def import_dataset(
                         except ValueError:
                             continue
 
-                        existing = (
+                        existing = added.get(record_id) or (
                             db.query(Event)
                             .filter(
                                 Event.source_id == source.id,
@@ -200,7 +205,8 @@ def import_dataset(
                                 setattr(existing, k, v)
                             rows_updated += 1
                         else:
-                            db.add(Event(**event_data))
+                            added[record_id] = Event(**event_data)
+                            db.add(added[record_id])
                             rows_inserted += 1
 
                     except Exception as row_err:
@@ -217,6 +223,7 @@ def import_dataset(
             run.errors_json = {"errors": errors[:50]}
 
         db.commit()
+        mark_events_changed()
         logger.info(
             "Import Finished. Duration: %dms. Read: %d, Inserted: %d, Updated: %d",
             run.duration_ms, rows_read, rows_inserted, rows_updated,
@@ -236,6 +243,8 @@ def import_dataset(
             run.finished_at = datetime.now(timezone.utc)
             run.errors_json = {"fatal": str(e)}
             db.commit()
+            # Rows flushed before the failure are committed alongside the run
+            mark_events_changed()
         return {"status": "failed", "error": str(e)}
     finally:
         if should_close:
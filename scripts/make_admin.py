@@ -2,6 +2,7 @@ import sys
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.db import SessionLocal
 from app.models import User
 
@@ -18,6 +19,11 @@ def make_admin(username: str):
         db.commit()
         db.refresh(user)
         print(f"Success: User '{username}' is now an admin.")
+        # This process cannot evict the running API's principal cache; its entry expires instead
+        print(
+            f"A running API applies the change within {settings.PRINCIPAL_CACHE_TTL_SECONDS:g}s "
+            "(PRINCIPAL_CACHE_TTL_SECONDS)."
+        )
     except Exception as e:
         print(f"Error: {e}")
         db.rollback()
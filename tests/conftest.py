@@ -4,7 +4,9 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.core.db import get_db
+from app.core import cache
+from app.core.db import get_db, get_read_db, get_versioned_read_db
+from app.core.locations import location_index
 from app.main import app
 from app.models import Base
 
@@ -22,6 +24,15 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Each test gets a fresh database, so in-process caches must not carry over
+    cache.clear_all()
+    location_index.clear()
+    yield
+    cache.clear_all()
+    location_index.clear()
+
 @pytest.fixture(scope="function")
 def db():
     Base.metadata.create_all(bind=engine)
@@ -40,6 +51,8 @@ def client(db):
         finally:
             pass
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_versioned_read_db] = override_get_db
     yield TestClient(app)
     app.dependency_overrides.clear()
 
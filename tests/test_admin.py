@@ -69,3 +69,30 @@ def test_import_quality_empty_state(client, db):
     assert data["failed_runs"] == 0
     assert data["success_rate"] == 0.0
     assert data["runs"] == []
+
+
+def test_slow_query_log_captures_plan(client, db, monkeypatch):
+    from app.core.config import settings
+    from app.core.slow_queries import slow_query_log
+
+    headers = _make_admin_headers(client, db, "slowadmin", "slowadmin@example.com")
+    slow_query_log.clear()
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 1e-6)  # everything counts as slow
+    client.get("/events", params={"location": "Leeds"})
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+
+    resp = client.get("/admin/slow-queries", headers=headers)
+    assert resp.status_code == 200
+    entries = resp.json()["entries"]
+    count = next(e for e in entries if e["statement"].startswith("SELECT count(*)"))
+    assert count["route"] == "/events"
+    assert count["method"] == "GET"
+    assert count["parameters"] == ["str"]  # shape only, never the value
+    assert count["plan"] and any("events" in step for step in count["plan"])
+
+    assert client.delete("/admin/slow-queries", headers=headers).status_code == 204
+    assert client.get("/admin/slow-queries", headers=headers).json()["entries"] == []
+
+
+def test_slow_query_log_requires_admin(client, auth_headers):
+    assert client.get("/admin/slow-queries", headers=auth_headers).status_code == 403
@@ -0,0 +1,117 @@
+"""AsyncSession read path (DATABASE_ASYNC=1)."""
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.api.async_routes import router as async_router
+from app.core.db import QueryStats, async_database_url, get_async_db, request_query_stats
+from app.models import Base, Event
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def async_db_url(tmp_path):
+    # In-memory databases are per connection, so the sync seeder and the
+    # aiosqlite engine need a shared file
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    start = datetime(2030, 1, 1, 10, 0)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(
+            Event(title=f"Async {i}", location="Leeds" if i % 2 else "York", start_time=start + timedelta(days=i),
+                  end_time=start + timedelta(days=i, hours=2), capacity=10 + i)
+            for i in range(5)
+        )
+        db.commit()
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def async_client(async_db_url):
+    engine = create_async_engine(async_database_url(async_db_url))
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_router)
+    app.dependency_overrides[get_async_db] = override
+    with TestClient(app) as client:
+        yield client
+    asyncio.run(engine.dispose())
+
+
+def test_async_database_url_mapping():
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert async_database_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u:p@h/db")
+
+
+def test_async_list_and_get(async_client):
+    resp = async_client.get("/events", params={"location": "Leeds", "sort": "-capacity"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 2
+    assert [e["title"] for e in data["items"]] == ["Async 3", "Async 1"]
+
+    event_id = data["items"][0]["id"]
+    assert async_client.get(f"/events/{event_id}").json()["title"] == "Async 3"
+    assert async_client.get("/events/9999").status_code == 404
+
+    first = async_client.get("/events", params={"location": "Leeds", "limit": 1, "sort": "-capacity"}).json()
+    second = async_client.get("/events", params={"location": "Leeds", "limit": 1, "sort": "-capacity", "cursor": first["next_cursor"]})
+    assert [e["title"] for e in second.json()["items"]] == ["Async 1"]
+    assert async_client.get("/events", params={"cursor": "bogus"}).status_code == 400
+
+
+def test_async_export(async_client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    resp = async_client.get("/events/export", params={"sort": "-capacity"})
+    assert resp.status_code == 200
+    titles = [json.loads(line)["title"] for line in resp.text.splitlines()]
+    assert titles == [f"Async {i}" for i in range(4, -1, -1)]
+    assert async_client.get("/events/export", params={"format": "csv"}).text.splitlines()[0].startswith("id,title")
+
+
+def test_async_list_matches_sync(async_db_url):
+    sync_engine = create_engine(async_db_url)
+    async_engine = create_async_engine(async_database_url(async_db_url))
+    filters: dict[str, Any] = {"q": "async", "status": "upcoming", "limit": 2, "offset": 1}
+
+    async def run_async():
+        stats = QueryStats()
+        token = request_query_stats.set(stats)
+        try:
+            async with async_sessionmaker(async_engine)() as db:
+                return await crud.list_events_async(db, **filters), stats.count
+        finally:
+            request_query_stats.reset(token)
+            await async_engine.dispose()
+
+    async_result, statements = asyncio.run(run_async())
+    crud.list_events_cache.clear()
+    with sessionmaker(bind=sync_engine)() as db:
+        sync_result = crud.list_events(db, **filters)
+    sync_engine.dispose()
+
+    assert async_result == sync_result
+    # Statements on the async engine are attributed to the caller's QueryStats
+    # (page, count, and the one-off check for this database's search index)
+    assert statements == 3
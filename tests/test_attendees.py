@@ -60,3 +60,20 @@ def test_attendee_events_empty(client: TestClient):
 def test_attendee_events_not_found(client: TestClient):
     resp = client.get("/attendees/99999/events")
     assert resp.status_code == 404
+
+
+def test_attendee_events_sparse_fields(client: TestClient):
+    token = create_user_and_get_token(client, username="attevtfields")
+    headers = {"Authorization": f"Bearer {token}"}
+    att_id = client.post("/attendees", json={"name": "Fields", "email": "fields@example.com"}, headers=headers).json()["id"]
+
+    event = client.post("/events", json={
+        "title": "Fields Event", "location": "Test", "start_time": "2026-05-01T10:00:00",
+        "end_time": "2026-05-01T12:00:00", "capacity": 10,
+    }, headers=headers).json()
+    client.post(f"/events/{event['id']}/rsvps", json={"attendee_id": att_id, "status": "going"}, headers=headers)
+
+    resp = client.get(f"/attendees/{att_id}/events?fields=title")
+    assert resp.status_code == 200
+    assert resp.json() == [{"id": event["id"], "title": "Fields Event"}]
+    assert client.get(f"/attendees/{att_id}/events?fields=nope").status_code == 400
@@ -97,3 +97,88 @@ def test_expired_jwt_token(client: TestClient, db):
         headers={"Authorization": f"Bearer {token}"},
     )
     assert resp.status_code == 401
+
+
+def _count_user_lookups(monkeypatch):
+    from app import crud
+
+    calls = []
+    real = crud.get_user_by_username
+
+    def counting(db, username):
+        calls.append(username)
+        return real(db, username=username)
+
+    monkeypatch.setattr(crud, "get_user_by_username", counting)
+    return calls
+
+
+def test_principal_cached_across_requests(client: TestClient, auth_headers, monkeypatch):
+    calls = _count_user_lookups(monkeypatch)
+    for _ in range(3):
+        resp = client.get("/events/recommendations", headers=auth_headers)
+        assert resp.status_code == 200
+    assert calls == ["authtest"]
+
+
+def test_principal_cache_still_rejects_expired_token(client: TestClient, auth_headers):
+    from datetime import timedelta
+
+    from app.core.auth import create_access_token
+
+    assert client.get("/events/recommendations", headers=auth_headers).status_code == 200
+    expired = create_access_token(data={"sub": "authtest"}, expires_delta=timedelta(seconds=-10))
+    resp = client.get("/events/recommendations", headers={"Authorization": f"Bearer {expired}"})
+    assert resp.status_code == 401
+
+
+def test_user_update_invalidates_principal(client: TestClient, db, auth_headers):
+    from app.models import User
+
+    assert client.get("/admin/imports/quality", headers=auth_headers).status_code == 403
+    user = db.query(User).filter(User.username == "authtest").first()
+    user.is_admin = True
+    db.commit()
+    assert client.get("/admin/imports/quality", headers=auth_headers).status_code == 200
+
+
+def test_password_pool_roundtrip_and_bounds():
+    import pytest
+
+    from app.core.hashing import HashingUnavailable, PasswordHasher
+
+    hasher = PasswordHasher(workers=1, max_pending=1, timeout_seconds=30)
+    try:
+        hashed = hasher.hash("s3cret")
+        assert hasher.verify("s3cret", hashed)
+        assert not hasher.verify("wrong", hashed)
+        assert hasher.pending == 0
+
+        hasher._slots.acquire()  # occupy the only slot
+        with pytest.raises(HashingUnavailable) as busy:
+            hasher.hash("s3cret")
+        assert busy.value.reason == "busy"
+        hasher._slots.release()
+
+        hasher.timeout_seconds = 0
+        with pytest.raises(HashingUnavailable) as slow:
+            hasher.hash("s3cret" * 1000)
+        assert slow.value.reason == "timeout"
+    finally:
+        hasher.shutdown()
+
+
+def test_login_returns_503_when_hashing_saturated(client: TestClient, monkeypatch):
+    from app.core import auth
+    from app.core.hashing import HashingUnavailable
+
+    client.post("/auth/register", json={"username": "busy", "email": "busy@example.com", "password": "password123"})
+
+    class Saturated:
+        def verify(self, password, hashed):
+            raise HashingUnavailable("busy")
+
+    monkeypatch.setattr(auth, "password_hasher", Saturated())
+    resp = client.post("/auth/login", data={"username": "busy", "password": "password123"})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
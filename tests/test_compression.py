@@ -0,0 +1,74 @@
+import gzip
+
+from app.core import compression
+
+
+def _create_event(client, headers, title="Compressed Event"):
+    payload = {
+        "title": title,
+        "description": "d" * 1000,
+        "location": "Leeds",
+        "start_time": "2026-01-01T10:00:00",
+        "end_time": "2026-01-01T12:00:00",
+        "capacity": 100,
+    }
+    resp = client.post("/events", json=payload, headers=headers)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def test_choose_encoding():
+    assert compression.choose_encoding("gzip, deflate") == "gzip"
+    assert compression.choose_encoding("gzip;q=0, identity") is None
+    assert compression.choose_encoding("*") == compression.available_encodings()[0]
+    assert compression.choose_encoding(None) is None
+
+
+def test_etag_suffix_round_trip():
+    assert compression.encoded_etag('"abc"', "gzip") == '"abc-gzip"'
+    assert compression.strip_encoding_suffix('"abc-gzip"') == '"abc"'
+    assert compression.strip_encoding_suffix('"abc"') == '"abc"'
+
+
+def test_large_list_is_gzipped_with_per_encoding_etag(client, auth_headers):
+    for i in range(3):
+        _create_event(client, auth_headers, f"Event {i}")
+
+    r = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert r.headers["ETag"].endswith('-gzip"')
+    assert len(r.json()["items"]) == 3
+
+    # Revalidating the compressed copy yields 304 with the same validator
+    r2 = client.get("/events", headers={"Accept-Encoding": "gzip", "If-None-Match": r.headers["ETag"]})
+    assert r2.status_code == 304
+    assert r2.headers["ETag"] == r.headers["ETag"]
+
+    # Identity representation has its own ETag
+    r3 = client.get("/events", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in r3.headers
+    assert r3.headers["ETag"] == compression.strip_encoding_suffix(r.headers["ETag"])
+
+
+def test_small_responses_not_compressed(client):
+    r = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert "Content-Encoding" not in r.headers
+
+
+def test_compressed_bytes_cached_per_etag(client, auth_headers):
+    event_id = _create_event(client, auth_headers)
+    hits = compression.compressed_cache.hits
+
+    first = client.get(f"/events/{event_id}", headers={"Accept-Encoding": "gzip"})
+    second = client.get(f"/events/{event_id}", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert compression.compressed_cache.hits == hits + 1
+
+    etag = compression.strip_encoding_suffix(first.headers["ETag"])
+    cached = compression.compressed_cache.get((etag, "gzip"))
+    assert cached is not None
+    assert gzip.decompress(cached) == first.content
@@ -49,3 +49,56 @@ def test_etag_event_detail(client, auth_headers):
     assert r2.status_code == 304
     assert not r2.content
     assert r2.headers["ETag"] == etag
+
+def test_etag_if_none_match_list(client):
+    # A comma-separated If-None-Match list containing the current ETag -> 304
+    etag = client.get("/events").headers["ETag"]
+    r = client.get("/events", headers={"If-None-Match": f'"stale", {etag}'})
+    assert r.status_code == 304
+    assert not r.content
+
+    # Non-matching validator -> full body, same ETag
+    r2 = client.get("/events", headers={"If-None-Match": '"stale"'})
+    assert r2.status_code == 200
+    assert r2.headers["ETag"] == etag
+    assert r2.json()["items"] == []
+
+
+def test_etag_events_list_answered_without_query(client):
+    """A matching data-version ETag short-circuits before crud.list_events runs."""
+    from unittest.mock import patch
+
+    etag = client.get("/events?limit=5").headers["ETag"]
+
+    with patch("app.api.routes.crud.list_events", side_effect=AssertionError("query ran")):
+        r = client.get("/events?limit=5", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["ETag"] == etag
+    assert "X-Request-ID" in r.headers
+
+
+def test_etag_events_list_normalized_query(client):
+    # Parameter order does not matter, parameter values do
+    a = client.get("/events?limit=5&offset=0").headers["ETag"]
+    b = client.get("/events?offset=0&limit=5").headers["ETag"]
+    c = client.get("/events?offset=0&limit=6").headers["ETag"]
+    assert a == b
+    assert a != c
+
+
+def test_etag_events_list_changes_after_write(client, auth_headers):
+    etag = client.get("/events").headers["ETag"]
+
+    payload = {
+        "title": "Version Bump",
+        "location": "Leeds",
+        "start_time": "2026-01-01T10:00:00",
+        "end_time": "2026-01-01T12:00:00",
+        "capacity": 10,
+    }
+    assert client.post("/events", json=payload, headers=auth_headers).status_code == 201
+
+    r = client.get("/events", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+    assert r.json()["total"] == 1
@@ -159,3 +159,99 @@ def test_list_events_status_filter(client: TestClient):
 
     resp = client.get("/events?status=upcoming")
     assert resp.status_code == 200
+
+def _walk(client: TestClient, query: str) -> list[int]:
+    ids: list[int] = []
+    url = f"/events?{query}"
+    while True:
+        data = client.get(url).json()
+        ids += [e["id"] for e in data["items"]]
+        if not data["next_cursor"]:
+            return ids
+        url = f"/events?{query}&cursor={data['next_cursor']}"
+
+def test_list_events_cursor_pagination(client: TestClient):
+    token = create_user_and_get_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    start = datetime.utcnow() + timedelta(days=1)
+    for i in range(7):
+        # Repeated sort values, so the id tiebreak decides the order within a group
+        client.post("/events", json={
+            "title": f"Event {i % 3}",
+            "location": "Test",
+            "start_time": (start + timedelta(days=i % 2)).isoformat(),
+            "end_time": (start + timedelta(days=2, hours=i)).isoformat(),
+            "capacity": 10 + i % 2,
+        }, headers=headers)
+
+    for sort in ("start_time", "-start_time", "end_time", "-end_time", "created_at", "-created_at",
+                 "title", "-title", "capacity", "-capacity"):
+        expected = [e["id"] for e in client.get(f"/events?limit=100&sort={sort}").json()["items"]]
+        assert _walk(client, f"limit=2&sort={sort}") == expected, sort
+
+    first = client.get("/events?limit=3").json()
+    assert first["next_cursor"]
+    # Rows inserted before the cursor position do not shift the next page
+    client.post("/events", json={
+        "title": "Early", "location": "Test", "start_time": (start - timedelta(days=5)).isoformat(),
+        "end_time": start.isoformat(), "capacity": 10,
+    }, headers=headers)
+    second = client.get(f"/events?limit=3&cursor={first['next_cursor']}").json()
+    assert [e["id"] for e in second["items"]] == _walk(client, "limit=100")[4:7]
+
+def test_list_events_invalid_cursor(client: TestClient):
+    token = create_user_and_get_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    start = datetime.utcnow() + timedelta(days=1)
+    for i in range(3):
+        client.post("/events", json={
+            "title": f"Event {i}", "location": "Test", "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=1)).isoformat(), "capacity": 10,
+        }, headers=headers)
+    cursor = client.get("/events?limit=1").json()["next_cursor"]
+
+    assert client.get("/events?cursor=not-a-cursor").status_code == 400
+    assert client.get(f"/events?cursor={cursor}&sort=-title").status_code == 400
+    assert client.get(f"/events?cursor={cursor}&offset=1").status_code == 400
+    assert client.get("/events?limit=5").json()["next_cursor"] is None
+
+def test_list_events_sparse_fields(client: TestClient):
+    token = create_user_and_get_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    start = datetime.utcnow() + timedelta(days=1)
+    for i in range(5):
+        client.post("/events", json={
+            "title": f"Event {i}", "description": "x" * 500, "location": "Test",
+            "start_time": (start + timedelta(hours=i)).isoformat(),
+            "end_time": (start + timedelta(days=1)).isoformat(), "capacity": 10,
+        }, headers=headers)
+
+    data = client.get("/events?fields=title,start_time&limit=2").json()
+    # id is always included; keys follow EventOut order whatever the request order
+    assert [list(item) for item in data["items"]] == [["id", "title", "start_time"]] * 2
+    assert data["total"] == 5
+    assert data["next_cursor"]
+
+    # The sort key (end_time here) is not requested, but cursors still work
+    full = _walk(client, "limit=100&sort=-end_time")
+    assert _walk(client, "limit=2&sort=-end_time&fields=title") == full
+
+    resp = client.get("/events?fields=title,secret")
+    assert resp.status_code == 400
+    assert "secret" in resp.json()["detail"]
+
+def test_list_events_sparse_fields_projection():
+    from app import crud
+
+    stmt = crud._list_events_stmt(None, None, None, None, None, None, "-capacity", fields=("id", "title"))
+    columns = str(stmt).split("FROM")[0]
+    assert "events.title" in columns and "events.capacity" in columns
+    assert "events.description" not in columns and "events.location" not in columns
+
+def test_list_events_sparse_fields_etag(client: TestClient):
+    a = client.get("/events?fields=title,location").headers["ETag"]
+    b = client.get("/events?fields=location,title").headers["ETag"]
+    c = client.get("/events?fields=title").headers["ETag"]
+    d = client.get("/events").headers["ETag"]
+    assert a == b
+    assert len({a, c, d}) == 3
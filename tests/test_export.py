@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from app import crud
+from app.core.config import settings
+from app.models import DataSource, Event
+from tests.test_admin import _make_admin_headers
+
+
+def _seed(client, auth_headers, n=5):
+    for i in range(n):
+        client.post("/events", json={
+            "title": f"=Export {i}" if i == 0 else f"Export {i}", "description": "d", "location": "Leeds" if i % 2 else "York",
+            "start_time": f"2026-05-0{i + 1}T10:00:00", "end_time": f"2026-05-0{i + 1}T12:00:00", "capacity": 10 + i,
+        }, headers=auth_headers)
+
+
+def test_export_ndjson_matches_list(client, auth_headers, monkeypatch):
+    _seed(client, auth_headers)
+    # Several fetch batches, so the response keeps streaming after the first chunk
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+
+    resp = client.get("/events/export?sort=-capacity")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="events.ndjson"' in resp.headers["content-disposition"]
+    assert "ETag" not in resp.headers
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert rows == client.get("/events?sort=-capacity&limit=100").json()["items"]
+
+    leeds = [json.loads(line) for line in client.get("/events/export?location=leeds&location_match=exact").text.splitlines()]
+    assert [row["title"] for row in leeds] == ["Export 1", "Export 3"]
+    # Search results come out in relevance order, as in the list
+    searched = client.get("/events/export?q=export").text.splitlines()
+    assert [json.loads(line)["id"] for line in searched] == [e["id"] for e in client.get("/events?q=export").json()["items"]]
+    assert client.get("/events/export?format=xml").status_code == 422
+
+
+def test_export_padded_filters_match_list(client, db, auth_headers):
+    _seed(client, auth_headers)
+    for params in ({"location": " Leeds "}, {"q": " Export 3 "}, {"location": " leeds ", "location_match": "prefix"}):
+        listed = client.get("/events", params={**params, "limit": 100}).json()
+        assert listed["total"] > 0, params
+        exported = client.get("/events/export", params=params).text.splitlines()
+        assert [json.loads(line)["id"] for line in exported] == [e["id"] for e in listed["items"]], params
+        # The sync path (routes.py) strips the same way
+        batches = crud.export_events(db, q=params.get("q"), location=params.get("location"),
+                                     location_match=params.get("location_match", "contains"))
+        assert [row.id for batch in batches for row in batch] == [e["id"] for e in listed["items"]], params
+
+
+def test_export_csv(client, auth_headers):
+    _seed(client, auth_headers, n=2)
+    resp = client.get("/events/export?format=csv")
+    assert resp.headers["content-type"].startswith("text/csv")
+    header, *rows = list(csv.reader(io.StringIO(resp.text)))
+    assert header == ["id", "title", "description", "location", "start_time", "end_time", "capacity", "created_at"]
+    assert len(rows) == 2
+    # Cells that a spreadsheet would evaluate as formulas are quoted
+    assert rows[0][1] == "'=Export 0"
+    assert rows[0][4].startswith("2026-05-01T10:00:00")
+
+
+def test_admin_export_includes_provenance(client, db, auth_headers):
+    _seed(client, auth_headers, n=1)
+    source = DataSource(name="Leeds Open Data", url="https://example.com/feed.xml")
+    db.add(source)
+    db.flush()
+    db.add(Event(title="Imported", location="Leeds", start_time=datetime(2026, 6, 1),
+                 end_time=datetime(2026, 6, 2), capacity=5,
+                 source_id=source.id, source_record_id="REC-1", is_seeded=True))
+    db.commit()
+
+    assert client.get("/admin/events/export", headers=auth_headers).status_code == 403
+    headers = _make_admin_headers(client, db, "exportadmin", "exportadmin@example.com")
+    rows = [json.loads(line) for line in client.get("/admin/events/export", headers=headers).text.splitlines()]
+    imported = next(row for row in rows if row["title"] == "Imported")
+    assert imported["source_name"] == "Leeds Open Data"
+    assert imported["source_record_id"] == "REC-1"
+    assert imported["is_seeded"] is True
+    user_created = next(row for row in rows if row["title"] != "Imported")
+    assert user_created["source_id"] is None and user_created["created_by_user_id"] is not None
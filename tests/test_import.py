@@ -1,6 +1,9 @@
 
 from datetime import datetime
 
+import pytest
+from sqlalchemy.exc import IntegrityError
+
 from app.models import DataSource, Event
 
 
@@ -24,3 +27,31 @@ def test_data_model_constraints(db):
 
     assert ev.source_id == src.id
     assert ev.is_seeded is True
+
+
+def test_source_record_is_unique(db):
+    src = DataSource(name="Unique Source")
+    db.add(src)
+    db.commit()
+    for _ in range(2):
+        db.add(Event(title="Dup", location="Loc", start_time=datetime.utcnow(), end_time=datetime.utcnow(),
+                     capacity=10, source_id=src.id, source_record_id="REC_DUP"))
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
+
+
+def test_import_repeated_record_in_one_file(db, tmp_path):
+    from scripts.import_dataset import import_dataset
+
+    csv_file = tmp_path / "dups.csv"
+    csv_file.write_text(
+        "EventId,EventTitle,Description,Venue,StartDate,EndDate,Capacity\n"
+        "DUP_1,First,Desc,Venue,2026-06-01T10:00:00,2026-06-01T12:00:00,50\n"
+        "DUP_1,Second,Desc,Venue,2026-06-01T10:00:00,2026-06-01T12:00:00,50\n",
+        encoding="utf-8",
+    )
+    import_dataset(source_type="csv", source_url=str(csv_file), db=db)
+
+    events = db.query(Event).filter(Event.source_record_id == "DUP_1").all()
+    assert [e.title for e in events] == ["Second"]
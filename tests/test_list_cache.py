@@ -0,0 +1,176 @@
+import inspect
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.event import listen
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.cache import LRUCache
+from app.core.db import QueryStats, request_query_stats
+from app.models import Base
+from app.schemas import EventCreate
+from tests.test_admin import _make_admin_headers
+
+
+def _event(title: str = "Cached Event") -> EventCreate:
+    start = datetime.utcnow() + timedelta(days=1)
+    return EventCreate(title=title, location="Leeds", start_time=start, end_time=start + timedelta(hours=2), capacity=10)
+
+
+def test_lru_cache_eviction_and_ttl():
+    cache = LRUCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # 'a' is now most recently used
+    cache.set("c", 3)  # evicts 'b'
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+    with patch("app.core.cache.time.monotonic", return_value=10**9):
+        assert cache.get("a") is None
+    assert cache.expirations == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["size"] == 1
+
+
+def test_list_events_served_from_cache(db):
+    crud.create_event(db, _event())
+    first = crud.list_events(db, location="Leeds", status="upcoming")
+    assert first["total"] == 1
+    hits = crud.list_events_cache.hits
+
+    with patch.object(db, "execute", side_effect=AssertionError("query ran")):
+        # A blank q and an unknown status are no filter at all, so they share the key
+        again = crud.list_events(db, location="Leeds", status="upcoming", q="")
+    assert [e.id for e in again["items"]] == [e.id for e in first["items"]]
+    assert crud.list_events_cache.hits == hits + 1
+
+
+def test_cached_search_checks_out_no_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cached.db'}")
+    Base.metadata.create_all(engine)
+    checkouts: list[object] = []
+    listen(engine, "checkout", lambda *args: checkouts.append(args))
+    try:
+        with Session(engine) as session:
+            crud.create_event(session, _event("Cached Search"))
+        with Session(engine) as session:
+            assert crud.list_events(session, q="cached")["total"] == 1
+        checkouts.clear()
+        with Session(engine) as session:
+            assert crud.list_events(session, q="cached")["total"] == 1
+        assert checkouts == []
+    finally:
+        engine.dispose()
+
+
+def test_list_events_padded_text_filters_match_their_key(db):
+    crud.create_event(db, _event())
+    crud.create_event(db, _event("Hub").model_copy(update={"location": "North Leeds Hub"}))
+
+    # The padded value used to be keyed as "Leeds" but filtered as ILIKE '% Leeds %'
+    for first, second in ((" Leeds ", "Leeds"), ("Leeds", " Leeds ")):
+        crud.list_events_cache.clear()
+        crud.list_counts_cache.clear()
+        assert crud.list_events(db, location=first)["total"] == 2
+        assert len(crud.list_events(db, location=second)["items"]) == 2
+    crud.list_events_cache.clear()
+    assert crud.list_events(db, q=" Hub ")["total"] == crud.list_events(db, q="Hub")["total"] == 1
+
+
+def test_list_events_cache_invalidated_by_writes(db):
+    event = crud.create_event(db, _event("Before"))
+    assert crud.list_events(db)["items"][0].title == "Before"
+
+    crud.update_event(db, event, crud.EventUpdate(title="After"))
+    assert crud.list_events(db)["items"][0].title == "After"
+
+    crud.delete_event(db, event)
+    assert crud.list_events(db)["total"] == 0
+
+
+def test_cache_stats_endpoint(client, db):
+    client.get("/events")
+    client.get("/events")
+    headers = _make_admin_headers(client, db, "cacheadmin", "cacheadmin@example.com")
+    resp = client.get("/admin/cache/stats", headers=headers)
+    assert resp.status_code == 200
+    stats = resp.json()["list_events"]
+    assert stats["misses"] >= 1
+    assert {"hits", "evictions", "size", "maxsize"} <= stats.keys()
+
+
+def _count_statements(db, fn):
+    stats = QueryStats()
+    token = request_query_stats.set(stats)
+    try:
+        return fn(), sum(n for sql, n in stats.statements.items() if "count(" in sql.lower())
+    finally:
+        request_query_stats.reset(token)
+
+
+def test_list_events_total_modes(db):
+    for i in range(3):
+        crud.create_event(db, _event(f"Counted {i}"))
+
+    result, counts = _count_statements(db, lambda: crud.list_events(db, limit=1, total_mode="none"))
+    assert result["total"] is None and counts == 0
+
+    # Later pages of the same filters reuse the cached total
+    first, counts = _count_statements(db, lambda: crud.list_events(db, limit=1))
+    assert first["total"] == 3 and counts == 1
+    second, counts = _count_statements(db, lambda: crud.list_events(db, limit=1, cursor=first["next_cursor"]))
+    assert second["total"] == 3 and counts == 0
+
+    # Estimates come from table statistics, which lag behind writes until re-analyzed
+    db.execute(text("ANALYZE"))
+    crud.create_event(db, _event("After analyze"))
+    assert crud.list_events(db, total_mode="estimated")["total"] == 3
+    assert crud.list_events(db)["total"] == 4
+    # Filtered lists have no per-filter statistics; they get the exact count
+    assert crud.list_events(db, q="after", total_mode="estimated")["total"] == 1
+
+
+def test_list_events_window_count(db, monkeypatch):
+    monkeypatch.setattr(crud, "WINDOW_COUNT_DIALECTS", frozenset({"sqlite"}))
+    for i in range(3):
+        crud.create_event(db, _event(f"Window {i}"))
+
+    result, counts = _count_statements(db, lambda: crud.list_events(db, limit=2))
+    assert result["total"] == 3 and len(result["items"]) == 2
+    assert counts == 1  # the page query itself, with COUNT(*) OVER ()
+    # An offset past the end returns no rows to read the window from
+    assert crud.list_events(db, offset=10, location="Leeds")["total"] == 3
+
+
+def test_list_events_total_param(client):
+    assert client.get("/events?total=none").json()["total"] is None
+    assert client.get("/events?total=estimated").json()["total"] == 0
+    assert client.get("/events?total=sometimes").status_code == 422
+
+
+def test_versioned_list_reads_skip_the_replica(monkeypatch):
+    from app.api.routes import list_events
+    from app.core import db as core_db
+    from app.core.config import settings
+
+    def bind_of_session() -> object:
+        sessions = core_db.get_versioned_read_db()
+        session = next(sessions)
+        try:
+            return session.get_bind()
+        finally:
+            sessions.close()
+
+    # No replica: the usual read engine
+    assert bind_of_session() is core_db.read_engine
+    # Replica configured: the list (cached and ETagged by data version) reads the primary
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", "sqlite:///replica.db")
+    assert bind_of_session() is core_db.engine
+    assert inspect.signature(list_events).parameters["db"].default.dependency is core_db.get_versioned_read_db
@@ -0,0 +1,121 @@
+"""Normalized location keys: exact/prefix filters, /locations autocomplete and seasonality grouping."""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app import crud
+from app.core.locations import location_index, normalize_location, prefix_upper_bound
+from app.models import Event
+from app.schemas import EventCreate, EventUpdate
+from scripts.import_dataset import import_dataset
+from tests.test_query_plans import _plan
+
+START = datetime.utcnow() + timedelta(days=1)
+
+
+def _event(db, location: str, title: str = "Event") -> Event:
+    return crud.create_event(db, EventCreate(
+        title=title, location=location, start_time=START, end_time=START + timedelta(hours=2), capacity=10,
+    ))
+
+
+def test_normalize_location():
+    assert normalize_location("  Leeds   Town\tHall ") == "leeds town hall"
+    assert normalize_location("STRASSE") == normalize_location("straße")
+    assert prefix_upper_bound("leeds") == "leedt"
+    assert prefix_upper_bound("") is None
+
+
+def test_location_key_set_on_write(db, tmp_path):
+    event = _event(db, "Leeds  Arena")
+    assert event.location_key == "leeds arena"
+    crud.update_event(db, event, EventUpdate(location="Town Hall"))
+    assert event.location_key == "town hall"
+
+    csv_file = tmp_path / "venues.csv"
+    csv_file.write_text(
+        "EventId,EventTitle,Description,Venue,StartDate,EndDate,Capacity\n"
+        "LOC_1,Gig,Desc,  CITY   Varieties ,2026-06-01T10:00:00,2026-06-01T12:00:00,50\n",
+        encoding="utf-8",
+    )
+    import_dataset(source_type="csv", source_url=str(csv_file), db=db)
+    assert db.query(Event).filter(Event.source_record_id == "LOC_1").one().location_key == "city varieties"
+
+
+def test_location_match_modes(client, db):
+    for location in ("Leeds Arena", "leeds  arena", "Leeds Town Hall", "Bradford Leeds Road"):
+        _event(db, location)
+
+    def locations(**params) -> list[str]:
+        resp = client.get("/events", params={"limit": 100, **params})
+        assert resp.status_code == 200
+        return sorted(e["location"] for e in resp.json()["items"])
+
+    assert locations(location="leeds") == ["Bradford Leeds Road", "Leeds Arena", "Leeds Town Hall", "leeds  arena"]
+    assert locations(location="LEEDS ARENA ", location_match="exact") == ["Leeds Arena", "leeds  arena"]
+    assert locations(location="leeds", location_match="prefix") == ["Leeds Arena", "Leeds Town Hall", "leeds  arena"]
+    assert client.get("/events", params={"location": "x", "location_match": "fuzzy"}).status_code == 422
+
+
+def test_prefix_filter_is_an_index_range(db):
+    stmt = crud._list_events_stmt(None, "leeds", None, None, None, None, None, location_match="prefix")
+    plan = _plan(db, stmt.limit(10))
+    # Matching rows still need sorting by start_time, but they are found by range, not a scan
+    assert plan[0].startswith("SEARCH events USING INDEX ix_events_location_key_start_time"), plan
+
+
+def test_prefix_range_relies_on_code_point_order(db):
+    # A linguistic collation (e.g. en_US.UTF-8) ignores punctuation and accents at first
+    # pass, so it would place some of these keys inside "leeds" <= key < "leedt" or outside it
+    keys = ["leed", "leeda", "leeds", "leeds arena", "leeds-arena", "leedsé", "leeds\U0001f3b8", "leedt", "lééds", "leedş"]
+    for key in keys:
+        _event(db, key)
+    ordered = db.execute(select(Event.location_key).order_by(Event.location_key)).scalars().all()
+    assert ordered == sorted(keys)
+
+    stmt = crud._list_events_stmt(None, "leeds", None, None, None, None, None, location_match="prefix")
+    matched = [event.location_key for event in db.execute(stmt).scalars()]
+    assert sorted(matched) == sorted(key for key in keys if key.startswith("leeds"))
+    # Postgres gets the same order from the column's "C" collation, which its index inherits
+    ddl = str(CreateTable(Event.metadata.tables["events"]).compile(dialect=postgresql.dialect()))
+    assert 'location_key VARCHAR(200) COLLATE "C"' in ddl
+
+
+def test_locations_autocomplete_updates_incrementally(client, db):
+    _event(db, "Leeds Arena")
+    _event(db, "leeds arena")
+    _event(db, "Town Hall")
+
+    resp = client.get("/locations", params={"prefix": "LEE"})
+    assert resp.status_code == 200
+    assert [(r["key"], r["count"]) for r in resp.json()] == [("leeds arena", 2)]
+
+    # Committed writes are applied to the loaded index without reloading it
+    loaded_at = location_index._loaded_at
+    event = _event(db, "Leeds Town Hall")
+    assert [r["key"] for r in client.get("/locations?prefix=leeds").json()] == ["leeds arena", "leeds town hall"]
+    crud.update_event(db, event, EventUpdate(location="Harrogate"))
+    crud.delete_event(db, db.query(Event).filter(Event.location == "Town Hall").one())
+    assert [r["key"] for r in client.get("/locations").json()] == ["harrogate", "leeds arena"]
+    assert location_index._loaded_at == loaded_at
+
+    # Rolled-back writes never reach the index
+    db.add(Event(title="X", location="Leeds Rolled Back", start_time=START, end_time=START, capacity=1))
+    db.flush()
+    db.rollback()
+    assert [r["key"] for r in client.get("/locations?prefix=leeds").json()] == ["leeds arena"]
+    assert len(client.get("/locations?limit=1").json()) == 1
+
+
+def test_seasonality_groups_by_location_key(client, db):
+    for loc in ["Leeds Arena", "LEEDS ARENA", "leeds  arena", "Town Hall", "Town Hall"]:
+        db.add(Event(
+            title="Evt", location=loc, capacity=5,
+            start_time=datetime(2026, 5, 10, tzinfo=timezone.utc), end_time=datetime(2026, 5, 10, 2, tzinfo=timezone.utc),
+        ))
+    db.commit()
+    may = [i for i in client.get("/analytics/events/seasonality").json()["items"] if i["month"] == "2026-05"][0]
+    assert len(may["top_locations"]) == 2
+    assert normalize_location(may["top_locations"][0]) == "leeds arena"
@@ -0,0 +1,80 @@
+import io
+import json
+import logging
+import queue
+
+from app.core import logging_config
+from app.core.config import settings
+
+
+def _access_records(caplog):
+    return [r.access for r in caplog.records if r.name == logging_config.ACCESS_LOGGER_NAME]
+
+
+def test_dropping_queue_handler_counts_overflow():
+    handler = logging_config.DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("t", logging.INFO, __file__, 1, "msg", None, None)
+    handler.emit(record)
+    handler.emit(record)
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_json_formatter_access_record():
+    record = logging.LogRecord("app.access", logging.INFO, __file__, 1, "access", None, None)
+    record.access = {"request_id": "abc", "status": 200}
+    line = json.loads(logging_config.JsonFormatter().format(record))
+    assert line["request_id"] == "abc"
+    assert line["status"] == 200
+    assert line["logger"] == "app.access"
+
+
+def test_pipeline_writes_from_background_thread(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_FORMAT", "json")
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    stream = io.StringIO()
+    try:
+        logging_config.setup_logging(stream=stream)
+        logging.getLogger("app.test").warning("hello %s", "queue")
+        logging_config.shutdown_logging()
+    finally:
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert any(line.get("message") == "hello queue" for line in lines)
+
+
+def test_access_record_fields(client, caplog, auth_headers):
+    payload = {
+        "title": "Logged Event",
+        "location": "Leeds",
+        "start_time": "2026-01-01T10:00:00",
+        "end_time": "2026-01-01T12:00:00",
+        "capacity": 10,
+    }
+    event_id = client.post("/events", json=payload, headers=auth_headers).json()["id"]
+
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger=logging_config.ACCESS_LOGGER_NAME):
+        resp = client.get(f"/events/{event_id}")
+
+    (record,) = _access_records(caplog)
+    assert record["request_id"] == resp.headers["X-Request-ID"]
+    assert record["route"] == "/events/{event_id}"
+    assert record["path"] == f"/events/{event_id}"
+    assert record["status"] == 200
+    assert record["db_queries"] >= 1
+    assert record["db_time_ms"] >= 0
+    assert record["bytes_out"] == len(resp.content)
+
+
+def test_access_log_sampling_skips_2xx_only(client, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+    with caplog.at_level(logging.INFO, logger=logging_config.ACCESS_LOGGER_NAME):
+        client.get("/health")
+        client.get("/events/424242")
+
+    records = _access_records(caplog)
+    assert [r["status"] for r in records] == [404]
@@ -0,0 +1,119 @@
+from app import crud
+from app.core import metrics, rate_limit
+from app.core.config import settings
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = metrics.Histogram("t_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        hist.observe(value, "/x")
+    lines = list(hist.render())
+    assert 't_seconds_bucket{route="/x",le="0.1"} 2' in lines
+    assert 't_seconds_bucket{route="/x",le="1"} 3' in lines
+    assert 't_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 't_seconds_count{route="/x"} 4' in lines
+    assert hist.count("/x") == 4
+
+
+def test_label_values_escaped():
+    counter = metrics.Counter("t_total", "test", ("path",))
+    counter.inc('a"b')
+    assert 't_total{path="a\\"b"} 1' in list(counter.render())
+
+
+def test_metrics_endpoint_uses_route_templates(client, auth_headers):
+    payload = {
+        "title": "Metric Event",
+        "location": "Leeds",
+        "start_time": "2026-01-01T10:00:00",
+        "end_time": "2026-01-01T12:00:00",
+        "capacity": 10,
+    }
+    event_id = client.post("/events", json=payload, headers=auth_headers).json()["id"]
+    before = metrics.REQUESTS_TOTAL.value("/events/{event_id}", "GET", "200")
+    client.get(f"/events/{event_id}")
+    assert metrics.REQUESTS_TOTAL.value("/events/{event_id}", "GET", "200") == before + 1
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'http_request_duration_seconds_bucket{route="/events/{event_id}",method="GET",status="200",le="+Inf"}' in body
+    assert f'route="/events/{event_id}"' not in body
+    assert "# TYPE http_request_db_seconds histogram" in body
+    assert 'db_pool_checked_out{engine="primary"}' in body
+    assert "http_requests_in_flight 1" in body  # the scrape itself
+
+
+def test_rate_limit_rejections_counted(client):
+    original = settings.RATE_LIMIT_ENABLED
+    settings.RATE_LIMIT_ENABLED = True
+    rate_limit.auth_limiter.history.clear()
+    before = metrics.RATE_LIMIT_REJECTIONS.value("auth")
+    try:
+        for _ in range(11):
+            client.post("/auth/login", data={"username": "x", "password": "x"})
+    finally:
+        settings.RATE_LIMIT_ENABLED = original
+        rate_limit.auth_limiter.history.clear()
+    assert metrics.RATE_LIMIT_REJECTIONS.value("auth") == before + 1
+
+
+def test_query_stats_fold_in_lists():
+    from app.core.db import QueryStats
+
+    stats = QueryStats()
+    stats.statements = {
+        "SELECT * FROM events WHERE id = ?": 12,
+        "SELECT * FROM rsvps WHERE event_id IN (?, ?)": 3,
+        "SELECT * FROM rsvps WHERE event_id IN (?, ?, ?)": 3,
+        "SELECT 1": 1,
+    }
+    assert stats.repeated(5) == [
+        ("SELECT * FROM events WHERE id = ?", 12),
+        ("SELECT * FROM rsvps WHERE event_id IN (...)", 6),
+    ]
+
+
+def test_db_stats_headers(client, auth_headers):
+    resp = client.get("/events")
+    assert int(resp.headers["X-DB-Queries"]) >= 1
+    assert float(resp.headers["X-DB-Time"]) >= 0
+
+
+def test_repeated_statement_flagged(client, auth_headers, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 5)
+    attendee = client.post(
+        "/attendees", json={"name": "Auth Test", "email": "authtest@example.com"}, headers=auth_headers
+    ).json()
+    for i in range(8):
+        event = client.post(
+            "/events",
+            json={"title": f"Past {i}", "location": f"Venue {i}", "start_time": "2026-01-01T10:00:00",
+                  "end_time": "2026-01-01T12:00:00", "capacity": 10},
+            headers=auth_headers,
+        ).json()
+        client.post(f"/events/{event['id']}/rsvps", json={"attendee_id": attendee["id"], "status": "going"},
+                    headers=auth_headers)
+
+    def lazy_attendee_events(db, attendee_id, fields=None):
+        # The classic N+1: one lazy SELECT of the event per RSVP
+        found = crud.get_attendee(db, attendee_id)
+        assert found is not None
+        return [rsvp.event for rsvp in found.rsvps]
+
+    route = "/attendees/{attendee_id}/events"
+    before = metrics.REPEATED_STATEMENTS.value(route)
+    caplog.clear()
+    monkeypatch.setattr(crud, "get_attendee_events", lazy_attendee_events)
+    resp = client.get(f"/attendees/{attendee['id']}/events")
+    assert resp.status_code == 200
+    assert len(resp.json()) == 8
+    assert metrics.REPEATED_STATEMENTS.value(route) == before + 1
+    assert any("Possible N+1" in r.getMessage() for r in caplog.records)
+
+    # Recommendations read the attendee's events in one query
+    route = "/events/recommendations"
+    before = metrics.REPEATED_STATEMENTS.value(route)
+    assert client.get(route, headers=auth_headers).status_code == 200
+    assert metrics.REPEATED_STATEMENTS.value(route) == before
@@ -77,3 +77,30 @@ def test_429_includes_security_headers(client: TestClient):
             assert resp.headers["X-Content-Type-Options"] == "nosniff"
     finally:
         settings.RATE_LIMIT_ENABLED = original_setting
+
+
+def test_middleware_is_pure_asgi():
+    """RequestLoggingMiddleware must not go through BaseHTTPMiddleware."""
+    from starlette.middleware.base import BaseHTTPMiddleware
+
+    from app.core.middleware import RequestLoggingMiddleware
+
+    assert not issubclass(RequestLoggingMiddleware, BaseHTTPMiddleware)
+
+
+def test_500_request_id_matches_header(client: TestClient):
+    from unittest.mock import patch
+
+    with patch("app.api.routes.crud.list_events", side_effect=RuntimeError("boom")):
+        resp = client.get("/events")
+    assert resp.status_code == 500
+    assert resp.json()["request_id"] == resp.headers["X-Request-ID"]
+    assert resp.headers["Cache-Control"] == "no-store"
+
+
+def test_security_headers_on_error_responses(client: TestClient):
+    resp = client.get("/events/999999")
+    assert resp.status_code == 404
+    assert resp.headers["X-Frame-Options"] == "DENY"
+    assert resp.headers["Referrer-Policy"] == "no-referrer"
+    assert "ETag" not in resp.headers
@@ -0,0 +1,76 @@
+"""Data steps in alembic migrations, run against a throwaway SQLite file."""
+from pathlib import Path
+
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+from alembic import command
+from app.core.config import settings
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _alembic_config() -> Config:
+    # No ini file, so env.py leaves the test run's logging configuration alone
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    return config
+
+
+def test_hot_query_indexes_merge_duplicate_source_records(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    config = _alembic_config()
+    command.upgrade(config, "b1f6d6cb5d7d")
+
+    engine = create_engine(url)
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO data_sources (id, name, retrieved_at) VALUES (1, 'feed', '2026-01-01')"))
+            event = (
+                "INSERT INTO events (id, title, location, start_time, end_time, capacity, created_at,"
+                " source_id, source_record_id) VALUES (:id, 'E', 'Leeds', '2026-02-01', '2026-02-01', 10,"
+                " '2026-01-01', :source_id, :record)"
+            )
+            conn.execute(
+                text(event),
+                [
+                    {"id": 1, "source_id": 1, "record": "r1"},
+                    {"id": 2, "source_id": 1, "record": "r1"},
+                    {"id": 3, "source_id": 1, "record": "r1"},
+                    {"id": 4, "source_id": 1, "record": "r2"},
+                    {"id": 5, "source_id": None, "record": None},
+                    {"id": 6, "source_id": None, "record": None},
+                ],
+            )
+            conn.execute(
+                text("INSERT INTO attendees (id, name, email) VALUES (:id, 'A', :email)"),
+                [{"id": i, "email": f"a{i}@example.com"} for i in (1, 2, 3)],
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO rsvps (id, event_id, attendee_id, status, created_at)"
+                    " VALUES (:id, :event_id, :attendee_id, :status, '2026-01-02')"
+                ),
+                [
+                    # Attendee 1 answered on the kept copy and on a duplicate
+                    {"id": 1, "event_id": 1, "attendee_id": 1, "status": "going"},
+                    {"id": 2, "event_id": 2, "attendee_id": 1, "status": "maybe"},
+                    # Attendee 2 answered on both duplicates but not the kept copy
+                    {"id": 3, "event_id": 2, "attendee_id": 2, "status": "going"},
+                    {"id": 4, "event_id": 3, "attendee_id": 2, "status": "not_going"},
+                    {"id": 5, "event_id": 3, "attendee_id": 3, "status": "maybe"},
+                    {"id": 6, "event_id": 4, "attendee_id": 1, "status": "going"},
+                ],
+            )
+
+        command.upgrade(config, "c4e1f2a9d7b3")
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT id FROM events ORDER BY id")).scalars().all() == [1, 4, 5, 6]
+            rsvps = conn.execute(text("SELECT id, event_id, attendee_id FROM rsvps ORDER BY id")).all()
+            assert [tuple(row) for row in rsvps] == [(1, 1, 1), (3, 1, 2), (5, 1, 3), (6, 4, 1)]
+            indexes = conn.execute(text("PRAGMA index_list('events')")).all()
+            assert any(row.name == "uq_events_source_record" and row.unique for row in indexes)
+    finally:
+        engine.dispose()
@@ -0,0 +1,64 @@
+"""EXPLAIN QUERY PLAN checks: every hot statement must be served by an index, not a full scan."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from app import crud
+from app.core.pagination import encode_cursor
+from app.models import RSVP, Attendee, Event, ImportRun
+
+NOW = datetime(2030, 1, 1)
+CURSOR_VALUES = {datetime: NOW, str: "M", int: 1}
+
+HOT_STATEMENTS = {
+    # crud.list_events: default ordering, and a start_time range
+    "list_events": crud._list_events_stmt(None, None, None, None, None, None, None).limit(10),
+    "list_events_range": crud._list_events_stmt(None, None, NOW, None, None, None, None).limit(10),
+    # crud.list_events exact location filter on the normalized key
+    "list_events_location_exact": crud._list_events_stmt(
+        None, "Leeds Arena", None, None, None, None, None, location_match="exact"
+    ).limit(10),
+    # crud.list_events keyset pages: a cursor seeks on (sort column, id) for every sort
+    **{
+        f"list_events_cursor_{sort}": crud._paginate(
+            crud._list_events_stmt(None, None, None, None, None, None, sort),
+            crud._event_sort(sort), 10, 0, encode_cursor(sort, CURSOR_VALUES[crud.EVENT_SORT_FIELDS[sort.lstrip("-")]], 1),
+        )
+        for sort in ("start_time", "-end_time", "created_at", "title", "-capacity")
+    },
+    # scripts/import_dataset.py: existing row per upstream record
+    "import_lookup": select(Event).where(Event.source_id == 1, Event.source_record_id == "REC-1"),
+    # crud.list_rsvps_for_event
+    "event_rsvps": select(RSVP).where(RSVP.event_id == 1).order_by(RSVP.created_at.asc()),
+    # crud.get_event_stats: per-status counts from the (event_id, status) index
+    "event_stats": select(RSVP.status, func.count()).where(RSVP.event_id == 1).group_by(RSVP.status),
+    # crud.get_attendee_events
+    "attendee_events": select(Event).join(RSVP).where(RSVP.attendee_id == 1),
+    # provenance / dataset metadata: latest run for a source
+    "latest_import_run": (
+        select(ImportRun).where(ImportRun.data_source_id == 1).order_by(ImportRun.started_at.desc()).limit(1)
+    ),
+    # analytics recommendations: attendee for the current user
+    "attendee_by_email": select(Attendee).where(Attendee.email == "a@example.com"),
+}
+
+
+def _plan(db, stmt) -> list[str]:
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup or ())
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize("name", sorted(HOT_STATEMENTS))
+def test_hot_statement_uses_index(db, name):
+    plan = _plan(db, HOT_STATEMENTS[name])
+    full_scans = [step for step in plan if step.startswith("SCAN") and "USING" not in step]
+    assert not full_scans, f"{name} falls back to a full scan: {plan}"
+    assert not any("TEMP B-TREE" in step for step in plan), f"{name} sorts without an index: {plan}"
+
+
+def test_event_stats_reads_only_the_index(db):
+    plan = _plan(db, HOT_STATEMENTS["event_stats"])
+    assert any("COVERING INDEX ix_rsvps_event_id_status" in step for step in plan), plan
@@ -0,0 +1,170 @@
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core.rate_limit import RateLimiter
+
+
+def _at(t: float):
+    return patch("app.core.rate_limit.time.time", return_value=t)
+
+
+def test_limit_enforced_within_window():
+    limiter = RateLimiter(requests_per_minute=3)
+    with _at(600.0):
+        assert [limiter.is_allowed("1.1.1.1", "/x") for _ in range(4)] == [True, True, True, False]
+        # Separate key has its own budget
+        assert limiter.is_allowed("2.2.2.2", "/x")
+
+
+def test_previous_window_weighted_by_overlap():
+    limiter = RateLimiter(requests_per_minute=10)
+    with _at(600.0):
+        for _ in range(10):
+            assert limiter.is_allowed("ip", "/x")
+    # 15s into the next window: 10 * 0.75 = 7.5 still counts, so 2 more fit
+    with _at(675.0):
+        assert [limiter.is_allowed("ip", "/x") for _ in range(4)] == [True, True, True, False]
+    # Two windows later the history no longer counts
+    with _at(780.0):
+        assert limiter.is_allowed("ip", "/x")
+
+
+def test_constant_state_per_key():
+    limiter = RateLimiter(requests_per_minute=1000)
+    with _at(600.0):
+        for _ in range(500):
+            limiter.is_allowed("ip", "/x")
+    assert limiter.history["ip:/x"] == [600.0, 0, 500]
+
+
+def test_idle_keys_evicted_and_key_cap():
+    limiter = RateLimiter(requests_per_minute=5, max_keys=3)
+    with _at(600.0):
+        for i in range(5):
+            limiter.is_allowed(f"10.0.0.{i}", "/x")
+    assert len(limiter.history) == 3
+    assert "10.0.0.0:/x" not in limiter.history
+
+    with _at(600.0 + 3 * 60):
+        limiter.is_allowed("fresh", "/x")
+        limiter.is_allowed("fresh", "/x")
+    assert list(limiter.history) == ["fresh:/x"]
+
+
+def test_sqlite_backend_matches_in_memory_semantics(tmp_path):
+    from app.core.rate_limit import SQLiteBackend
+
+    backend = SQLiteBackend(str(tmp_path / "rl.db"), namespace="global")
+    assert [backend.hit("ip:/x", 10, 60, 600.0) for _ in range(11)] == [True] * 10 + [False]
+    # 15s into the next window the previous 10 still weigh 7.5
+    assert [backend.hit("ip:/x", 10, 60, 675.0) for _ in range(4)] == [True, True, True, False]
+    assert backend.hit("ip:/x", 10, 60, 780.0)
+
+
+def test_sqlite_backend_shared_across_processes(tmp_path):
+    """Two backends on one file (as two workers would be) enforce one combined budget."""
+    from app.core.rate_limit import RateLimiter, SQLiteBackend
+
+    path = str(tmp_path / "rl.db")
+    worker_a = RateLimiter(requests_per_minute=4, backend=SQLiteBackend(path, namespace="global"))
+    worker_b = RateLimiter(requests_per_minute=4, backend=SQLiteBackend(path, namespace="global"))
+    other = RateLimiter(requests_per_minute=4, backend=SQLiteBackend(path, namespace="auth"))
+
+    with _at(600.0):
+        results = [limiter.is_allowed("ip", "/x") for limiter in (worker_a, worker_b) * 3]
+        assert results == [True, True, True, True, False, False]
+        # Namespaces (global vs auth limiter) do not share budgets
+        assert other.is_allowed("ip", "/x")
+
+        worker_a.reset()
+        assert worker_b.is_allowed("ip", "/x")
+
+
+def test_sqlite_backend_gives_up_quickly_on_a_locked_file(tmp_path):
+    from app.core.rate_limit import SQLiteBackend
+
+    path = str(tmp_path / "rl.db")
+    backend = SQLiteBackend(path, namespace="global", busy_timeout=0.05)
+    locker = sqlite3.connect(path, isolation_level=None)
+    locker.execute("BEGIN IMMEDIATE")  # another worker holding the write lock
+    try:
+        t0 = time.perf_counter()
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            backend.hit("ip:/x", 10, 60, 600.0)
+        assert time.perf_counter() - t0 < 1.0
+    finally:
+        locker.rollback()
+        locker.close()
+    assert backend.hit("ip:/x", 10, 60, 600.0)
+
+
+def test_backend_failure_fails_open(client, monkeypatch):
+    from app.core import metrics, rate_limit
+    from app.core.config import settings
+
+    class LockedBackend:
+        blocking = True
+
+        def hit(self, key, limit, window_size, now):
+            raise sqlite3.OperationalError("database is locked")
+
+        def reset(self):
+            pass
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit.global_limiter, "backend", LockedBackend())
+    before = metrics.RATE_LIMIT_ERRORS.value("global")
+
+    resp = client.get("/events")
+    assert resp.status_code == 200
+    assert resp.headers["X-Content-Type-Options"] == "nosniff"
+    assert metrics.RATE_LIMIT_ERRORS.value("global") == before + 1
+
+
+def test_quota_table_resolution():
+    from app.core.rate_limit import QuotaTable
+
+    table = QuotaTable("/analytics/*=30,/analytics/events/trending=5,/admin/imports/run=2", "anonymous=60,user=100", 120)
+    assert table.limit_for("/analytics/events/trending", "user") == 5
+    assert table.limit_for("/analytics/events/seasonality", "admin") == 30
+    assert table.limit_for("/admin/imports/run", "admin") == 2
+    assert table.limit_for("/events", "anonymous") == 60
+    assert table.limit_for("/events", "user") == 100
+    assert table.limit_for("/events", "admin") == 120  # no role entry -> default
+
+
+def test_route_template_keys_share_one_bucket(client, monkeypatch):
+    from app.core import middleware, rate_limit
+    from app.core.config import settings
+    from app.core.rate_limit import QuotaTable
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(middleware, "quotas", QuotaTable("/events/{event_id}=3", "", 120))
+    rate_limit.global_limiter.reset()
+    try:
+        statuses = [client.get(f"/events/{i}").status_code for i in range(1, 5)]
+        keys = list(rate_limit.global_limiter.history)
+    finally:
+        rate_limit.global_limiter.reset()
+
+    assert statuses == [404, 404, 404, 429]
+    assert keys == ["ip:testclient:/events/{event_id}"]
+
+
+def test_authenticated_requests_keyed_by_subject(client, auth_headers, monkeypatch):
+    from app.core import rate_limit
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    rate_limit.global_limiter.reset()
+    try:
+        client.get("/events/recommendations", headers=auth_headers)
+        client.get("/events/recommendations", headers={"Authorization": "Bearer not-a-token"})
+        keys = set(rate_limit.global_limiter.history)
+    finally:
+        rate_limit.global_limiter.reset()
+
+    assert keys == {"user:authtest:/events/recommendations", "ip:testclient:/events/recommendations"}
@@ -225,3 +225,37 @@ def test_non_owner_non_admin_cannot_delete_other_rsvp(client: TestClient):
     resp = client.delete(f"/events/{event_id}/rsvps/{rsvp_id}", headers=other_headers)
     assert resp.status_code == 403
     assert "Not authorised to delete this RSVP" in resp.json()["detail"]
+
+
+def test_event_routes_do_not_load_rsvps(client: TestClient, db):
+    from sqlalchemy import event as sa_event
+    from sqlalchemy import func, select
+    from sqlalchemy.engine import Engine
+
+    from app.models import RSVP
+
+    headers = get_auth_headers(client)
+    event_id, att_id = setup_event_and_attendee(client, headers)
+    client.post(f"/events/{event_id}/rsvps", json={"attendee_id": att_id, "status": "going"}, headers=headers)
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sa_event.listen(Engine, "before_cursor_execute", record)
+    try:
+        assert client.get(f"/events/{event_id}").status_code == 200
+        assert client.get(f"/events/{event_id}/provenance").status_code == 200
+        assert client.patch(f"/events/{event_id}", json={"capacity": 20}, headers=headers).status_code == 200
+        assert client.get(f"/events/{event_id}/stats").json()["remaining_capacity"] == 19
+    finally:
+        sa_event.remove(Engine, "before_cursor_execute", record)
+    # RSVPs are only counted (stats), never selected as rows
+    rsvp_reads = [s for s in statements if "rsvps" in s]
+    assert len(rsvp_reads) == 1 and "count(*)" in rsvp_reads[0]
+
+    # Deleting the event removes its RSVPs in one statement
+    assert client.delete(f"/events/{event_id}", headers=headers).status_code == 204
+    assert db.scalar(select(func.count()).select_from(RSVP).where(RSVP.event_id == event_id)) == 0
+    assert client.get(f"/events/{event_id}/rsvps").status_code == 404
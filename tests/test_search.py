@@ -0,0 +1,88 @@
+"""Full-text search for GET /events?q= (FTS5 on SQLite), its sync triggers, and the ILIKE fallback."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app import crud
+from app.models import Event
+from app.schemas import EventCreate, EventUpdate
+from tests.test_query_plans import _plan
+
+START = datetime.utcnow() + timedelta(days=1)
+
+
+def _event(db, title: str, description: str = "", location: str = "Leeds") -> Event:
+    return crud.create_event(db, EventCreate(
+        title=title, description=description or None, location=location,
+        start_time=START, end_time=START + timedelta(hours=2), capacity=10,
+    ))
+
+
+def _titles(db, q: str, **kwargs) -> list[str]:
+    return [e.title for e in crud.list_events(db, q=q, limit=100, **kwargs)["items"]]
+
+
+def test_search_covers_description_and_location_ranked(db):
+    _event(db, "Evening social", description="Bring your python questions")
+    _event(db, "Python Leeds", description="Monthly python meetup")
+    _event(db, "Board games", location="Pythonville Library")
+    _event(db, "Unrelated")
+
+    # Prefix match over all three columns; title hits rank above location, then description
+    assert _titles(db, "pyth") == ["Python Leeds", "Board games", "Evening social"]
+    # Every term must match
+    assert _titles(db, "python monthly") == ["Python Leeds"]
+    # An explicit sort still wins over relevance
+    assert len(_titles(db, "python", sort="-title")) == 3
+    assert _titles(db, "python", sort="-title")[0] == "Python Leeds"
+    assert crud.list_events(db, q="python")["total"] == 3
+
+
+def test_search_index_follows_writes(db):
+    event = _event(db, "Jazz night")
+    assert _titles(db, "jazz") == ["Jazz night"]
+
+    crud.update_event(db, event, EventUpdate(title="Blues night"))
+    assert _titles(db, "jazz") == []
+    assert _titles(db, "blues") == ["Blues night"]
+
+    # Rows written outside the ORM (e.g. bulk imports) are indexed by the triggers too
+    db.execute(text(
+        "INSERT INTO events (title, location, start_time, end_time, capacity, created_at, is_seeded) "
+        "VALUES ('Blues brunch', 'Leeds', '2030-01-01', '2030-01-02', 5, '2029-01-01', 0)"
+    ))
+    db.commit()
+    crud.mark_events_changed()
+    assert sorted(_titles(db, "blues")) == ["Blues brunch", "Blues night"]
+
+    crud.delete_event(db, event)
+    assert _titles(db, "blues") == ["Blues brunch"]
+
+
+def test_search_cursor_pages_in_relevance_order(db):
+    for i in range(5):
+        _event(db, f"Yoga {i}" if i % 2 else f"Class {i}", description="yoga " * (i + 1))
+    expected = _titles(db, "yoga")
+    walked, cursor = [], None
+    while True:
+        page = crud.list_events(db, q="yoga", limit=2, cursor=cursor)
+        walked += [e.title for e in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert walked == expected and len(walked) == 5
+
+
+def test_search_uses_fts_index(db):
+    stmt = crud._list_events_stmt("tech meetup", None, None, None, None, None, None, "sqlite")
+    plan = _plan(db, stmt.limit(10))
+    assert any("VIRTUAL TABLE INDEX" in step for step in plan), plan
+    assert any(step.startswith("SEARCH events USING INTEGER PRIMARY KEY") for step in plan), plan
+
+
+def test_search_falls_back_to_ilike(db, monkeypatch):
+    _event(db, "Meetup", description="tech")
+    monkeypatch.setattr(crud, "search_backend", lambda connection: None)
+    # Substring of the title only, as before the index existed
+    assert _titles(db, "eetu") == ["Meetup"]
+    assert _titles(db, "tech") == []
@@ -0,0 +1,79 @@
+"""SQLite connection profile (pragmas and pool sizing) applied by app.core.db."""
+from unittest import mock
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+
+from app.core.db import build_engine, engine_options, parse_sqlite_pragmas, read_only_engine
+
+
+def test_file_database_gets_pragma_profile(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    finally:
+        engine.dispose()
+
+
+def test_pool_sizing():
+    # File SQLite: a small write pool for the single writer
+    sqlite_options = engine_options("sqlite:///./app.db")
+    assert (sqlite_options["pool_size"], sqlite_options["max_overflow"]) == (4, 0)
+    assert "pool_size" not in engine_options("sqlite:///:memory:")
+    # Postgres keeps SQLAlchemy's defaults unless sized explicitly
+    pg_options = engine_options("postgresql://u:p@h/db")
+    assert "connect_args" not in pg_options
+    assert "pool_size" not in pg_options and "max_overflow" not in pg_options
+    assert engine_options("postgresql://u:p@h/db", pool_size=3)["pool_size"] == 3
+    # Reads: WAL readers run concurrently, so the SQLite read pool is larger
+    sqlite_read = engine_options("sqlite:///./app.db", read=True)
+    assert (sqlite_read["pool_size"], sqlite_read["max_overflow"]) == (20, 20)
+    assert "pool_size" not in engine_options("postgresql://u:p@h/db", read=True)
+
+
+def test_parse_sqlite_pragmas():
+    assert parse_sqlite_pragmas(" journal_mode=WAL, busy_timeout=100 ,") == [
+        ("journal_mode", "WAL"),
+        ("busy_timeout", "100"),
+    ]
+    assert parse_sqlite_pragmas("") == []
+    with pytest.raises(ValueError):
+        parse_sqlite_pragmas("writable_schema=1")
+    with pytest.raises(ValueError):
+        parse_sqlite_pragmas("cache_size=1; DROP TABLE events")
+
+
+def test_read_only_engine_rejects_writes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    writer = build_engine(url)
+    reader = build_engine(url, read_only=True, pool_size=2, max_overflow=0)
+    try:
+        with writer.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+        with reader.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                conn.execute(text("INSERT INTO t VALUES (2)"))
+        assert isinstance(reader.pool, QueuePool)
+        assert reader.pool.size() == 2
+    finally:
+        reader.dispose()
+        writer.dispose()
+
+
+def test_postgres_read_only_engine_shares_primary_pool():
+    primary = create_engine("postgresql+pg8000://u:p@h/db", module=mock.MagicMock())
+    reader = read_only_engine(primary)
+    assert reader.get_execution_options()["postgresql_readonly"] is True
+    assert reader.pool is primary.pool
+    assert "postgresql_readonly" not in primary.get_execution_options()
+    # SQLite enforces read-only per connection instead, so the engine is returned as is
+    sqlite_engine = create_engine("sqlite://")
+    assert read_only_engine(sqlite_engine) is sqlite_engine